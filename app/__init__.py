@@ -1,4 +1,6 @@
 """Flask application factory"""
+import os
+
 from flask import Flask
 from flask_cors import CORS
 
@@ -42,6 +44,9 @@ def create_app(config_name='production'):
     from app.routes.logs import logs_bp
     from app.routes.gpio import gpio_bp
     from app.routes.mqtt import mqtt_bp
+    from app.routes.batch import batch_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.alerts import alerts_bp
     
     app.register_blueprint(main_bp)
     app.register_blueprint(system_bp, url_prefix='/api/system')
@@ -50,6 +55,112 @@ def create_app(config_name='production'):
     app.register_blueprint(logs_bp, url_prefix='/api/logs')
     app.register_blueprint(gpio_bp, url_prefix='/api/gpio')
     app.register_blueprint(mqtt_bp, url_prefix='/api/mqtt')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(alerts_bp, url_prefix='/api/alerts')
+    
+    # In-memory metric history (fed by the sampler)
+    from app.modules.metric_history import init_history
+    history = init_history(
+        retention=app.config['METRICS_HISTORY_RETENTION'],
+        resolution=app.config['METRICS_SAMPLE_INTERVAL']
+    )
+    
+    # Persistent round-robin archive behind the in-memory history. With the dev
+    # reloader create_app also runs in the watcher process, which never serves
+    # requests - leave the single-writer lock to the serving child
+    reloader_watcher = app.config.get('USE_RELOADER') and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+    if app.config.get('METRICS_ARCHIVE_ENABLED') and not reloader_watcher:
+        from app.modules.metric_archive import init_archive
+        history.archive = init_archive(
+            path=app.config['METRICS_ARCHIVE_PATH'],
+            tiers=app.config['METRICS_ARCHIVE_TIERS'],
+            max_metrics=app.config['METRICS_ARCHIVE_MAX_METRICS'],
+            flush_interval=app.config['METRICS_ARCHIVE_FLUSH_INTERVAL']
+        )
+    
+    # Alert rules evaluated on every sample recorded into history
+    if app.config.get('ALERTS_ENABLED'):
+        from app.modules.alerts import init_alert_engine
+        history.alerts = init_alert_engine(app.config['ALERT_RULES_FILE'])
+    
+    # Rolling/EWMA/robust z-score anomaly detection (optional numpy)
+    if app.config.get('ANOMALY_DETECTION_ENABLED'):
+        from app.modules.anomaly import init_anomaly_detector
+        init_anomaly_detector(history, max_age=app.config['ANOMALY_CACHE_SECONDS'])
+    
+    # Per-service accounting from cgroup v2 files (no PID walking)
+    accounting = None
+    if app.config.get('CGROUP_ACCOUNTING_ENABLED'):
+        from app.modules.cgroup_accounting import init_cgroup_accounting
+        accounting = init_cgroup_accounting(app.config['CGROUP_UNITS'])
+    
+    # Start background metrics sampler
+    if app.config.get('METRICS_SAMPLER_ENABLED'):
+        from app.modules.metrics_sampler import init_sampler
+        sampler = init_sampler(
+            interval=app.config['METRICS_SAMPLE_INTERVAL'],
+            detailed_interval=app.config['METRICS_DETAILED_INTERVAL']
+        )
+        sampler.add_callback('stats', history.record_snapshot)
+        
+        # Per-interface throughput, sampled alongside quick stats
+        from app.modules.net_rates import get_net_rates
+        net_rates = get_net_rates()
+        net_rates.history = history
+        net_rates.history_resolution = app.config['METRICS_DEVICE_RESOLUTION']
+        sampler.add_callback('stats', net_rates.record_snapshot)
+        
+        # Block device throughput and latency from /proc/diskstats
+        from app.modules.disk_io import get_disk_io
+        disk_io = get_disk_io()
+        disk_io.history = history
+        disk_io.history_resolution = app.config['METRICS_DEVICE_RESOLUTION']
+        sampler.add_callback('stats', disk_io.record_snapshot)
+        
+        # Per-service CPU/memory/I/O rates into history
+        if accounting is not None:
+            accounting.history = history
+            accounting.history_resolution = app.config['METRICS_DEVICE_RESOLUTION']
+            sampler.add_callback('stats', accounting.record_snapshot)
+        
+        # Per-core utilization matrix for the CPU heatmap (optional numpy)
+        from app.modules.core_heatmap import init_core_heatmap
+        heatmap = init_core_heatmap(
+            retention=app.config['CORE_HEATMAP_RETENTION'],
+            resolution=app.config['METRICS_SAMPLE_INTERVAL']
+        )
+        if heatmap is not None:
+            sampler.add_callback('stats', heatmap.record_snapshot)
+        
+        # Push stats to /api/system/stream clients as they are sampled
+        from app.modules.stream_hub import init_stream_hub
+        hub = init_stream_hub(
+            max_clients=app.config['STREAM_MAX_CLIENTS'],
+            queue_size=app.config['STREAM_QUEUE_SIZE']
+        )
+        sampler.add_callback('stats', hub.publish_snapshot)
+        sampler.start()
+        app.logger.info('Metrics sampler started')
+    
+    # Record throttle/under-voltage transitions between page views
+    if app.config.get('THROTTLE_WATCH_ENABLED'):
+        from app.modules.throttle_watcher import init_throttle_watcher
+        init_throttle_watcher(
+            interval=app.config['THROTTLE_WATCH_INTERVAL'],
+            size=app.config['THROTTLE_EVENT_LOG_SIZE']
+        )
+    
+    # Shared outbound HTTP client refreshing weather and public IP
+    if app.config.get('HTTP_REFRESH_ENABLED'):
+        from app.modules.http_client import init_http_client
+        from app.modules.system_monitor import register_remote_resources
+        client = init_http_client(
+            cache_dir=app.config['HTTP_CACHE_DIR'],
+            pool_size=app.config['HTTP_POOL_SIZE']
+        )
+        register_remote_resources()
+        client.start()
     
     app.logger.info('Flask application initialized')
     
@@ -0,0 +1,75 @@
+"""Conditional GET support - strong ETags from cheap state versions
+
+Read-only endpoints declare where their state comes from (a change counter,
+a config file, or nothing at all for static data). The ETag is built from
+that version instead of hashing the body, so a matching If-None-Match is
+answered with 304 before the view runs. Change counters restart at 0 with
+each process and each object instance, so every tag also carries
+PROCESS_VERSION and counters are paired with the owning instance's id.
+"""
+import functools
+import os
+import time
+import zlib
+
+from flask import Response, make_response, request
+
+# Changes on every restart, so static responses are revalidated after a deploy
+PROCESS_VERSION = f'{os.getpid():x}.{int(time.time()):x}'
+
+
+def static_version(*args, **kwargs) -> str:
+    """Version for responses that only change when the app restarts"""
+    return 'static'
+
+
+def counter_version(owner) -> str:
+    """Version of an object with a change counter ("instance" id + "version")"""
+    return f'{owner.instance}.{owner.version}'
+
+
+def file_version(path: str) -> str:
+    """Version of a file from its mtime and size (one stat call)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 'missing'
+    return f'{st.st_mtime_ns:x}.{st.st_size:x}'
+
+
+def conditional(version_func):
+    """
+    Decorator adding ETag / If-None-Match handling to a GET view
+
+    Args:
+        version_func: Called with the view's arguments; returns a value that
+            changes whenever the response would (None skips conditional handling)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version = version_func(*args, **kwargs)
+            except Exception:
+                version = None
+            if version is None:
+                return view(*args, **kwargs)
+
+            # Query parameters and Accept (response encoding) change the body,
+            # so they are part of the tag; the process version keeps a tag
+            # from before a restart or worker recycle from matching
+            variant = request.query_string + b'|' + request.headers.get('Accept', '').encode()
+            etag = f'{request.endpoint}.{PROCESS_VERSION}.{version}.{zlib.crc32(variant):08x}'
+
+            # nginx weakens ETags when it gzips, so compare weakly (RFC 9110)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'  # always revalidate
+            return response
+        return wrapper
+    return decorator
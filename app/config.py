@@ -17,11 +17,70 @@ class Config:
     LOCAL_IP = None
     HOSTNAME = None
 
+    # run.py dev server: restart on code changes (create_app also runs in the watcher process)
+    USE_RELOADER = False
+
+    # Background metrics sampler - API requests read its latest snapshot
+    METRICS_SAMPLER_ENABLED = True
+    METRICS_SAMPLE_INTERVAL = 1  # seconds between quick stats samples
+    METRICS_DETAILED_INTERVAL = 30  # seconds between detailed samples (only while requested)
+    METRICS_HISTORY_RETENTION = 24 * 3600  # seconds of in-memory history (~690KB per metric at 1s)
+    METRICS_DEVICE_RESOLUTION = 10  # seconds per history sample of per-interface/disk/service metrics (~69KB each)
+    CORE_HEATMAP_RETENTION = 6 * 3600  # seconds of per-core utilization (~86KB per core at 1s, needs numpy)
+
+    # Persistent metric archive - fixed-size file, survives restarts
+    METRICS_ARCHIVE_ENABLED = True
+    METRICS_ARCHIVE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'metrics.rrd'
+    )
+    METRICS_ARCHIVE_TIERS = ((1, 3600), (60, 7 * 24 * 60), (900, 365 * 24 * 4))  # (step s, rows)
+    METRICS_ARCHIVE_MAX_METRICS = 64  # ~570KB per metric, file is sparse until written
+    METRICS_ARCHIVE_FLUSH_INTERVAL = 60  # seconds between batched writes to the SD card
+
+    # Live stats stream (/api/system/stream) - each open stream holds a worker thread
+    STREAM_MAX_CLIENTS = 4  # further browsers fall back to polling
+    STREAM_QUEUE_SIZE = 10  # events buffered per client before it is dropped
+    STREAM_HEARTBEAT = 15  # seconds between keepalive comments (below proxy_read_timeout)
+    STREAM_MAX_DURATION = 300  # seconds before a stream ends and the browser reconnects
+
+    # Outbound HTTP lookups (weather, public IP) - refreshed in the background,
+    # last good responses persisted so they are served instantly after a restart
+    HTTP_REFRESH_ENABLED = True
+    HTTP_CACHE_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'http'
+    )
+    HTTP_POOL_SIZE = 4  # connections kept open per host
+
+    # Throttle/under-voltage edge recorder (/api/system/throttle/events)
+    THROTTLE_WATCH_ENABLED = True
+    THROTTLE_WATCH_INTERVAL = 0.2  # seconds between throttle bit reads (one mailbox ioctl)
+    THROTTLE_EVENT_LOG_SIZE = 1000  # transitions kept in memory
+
+    # Alert rules evaluated on every recorded metric sample
+    ALERTS_ENABLED = True
+    ALERT_RULES_FILE = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'configs', 'alert_rules.json'
+    )
+
+    # Statistical anomaly detection over metric history (needs numpy)
+    ANOMALY_DETECTION_ENABLED = True
+    ANOMALY_CACHE_SECONDS = 60  # analysis reused for this long per window
+
+    # Per-service CPU, memory, I/O and pids from cgroup v2 files (service.<unit>.* history)
+    CGROUP_ACCOUNTING_ENABLED = True
+    CGROUP_UNITS = ('raspotify', 'shairport-sync', 'nginx', 'dashboard')  # systemd .service units
+
+    # Batched GET requests (/api/batch) - one round trip per page load
+    BATCH_MAX_REQUESTS = 16  # paths per batch
+    BATCH_MAX_WORKERS = 4  # paths dispatched concurrently
+    BATCH_TIMEOUT = 15  # seconds before unfinished paths are reported as timed out
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     TESTING = False
+    USE_RELOADER = True
 
 
 class ProductionConfig(Config):
@@ -42,6 +101,10 @@ class TestingConfig(Config):
     """Testing configuration"""
     DEBUG = True
     TESTING = True
+    METRICS_SAMPLER_ENABLED = False  # Collect inline so tests are deterministic
+    METRICS_ARCHIVE_ENABLED = False
+    HTTP_REFRESH_ENABLED = False  # No outbound requests unless a test makes them
+    THROTTLE_WATCH_ENABLED = False
 
 
 config = {
@@ -0,0 +1,66 @@
+"""Response encoding - JSON by default, MessagePack when the client asks for it
+
+Large responses (log listings, metric history, MQTT device lists) cost CPU to
+serialize on the Pi and bytes on WiFi. Clients sending
+`Accept: application/msgpack` get the same payload MessagePack-encoded;
+everyone else (browsers send */*) keeps getting JSON.
+
+msgpack is optional - without it every response is JSON.
+"""
+from flask import Response, jsonify, request
+
+# Try to import msgpack, but don't fail if not available
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+# Accepted spellings of the MessagePack media type
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack', 'application/vnd.msgpack')
+
+
+def negotiated_mimetype() -> str:
+    """Media type to answer the current request with"""
+    if not MSGPACK_AVAILABLE:
+        return JSON_MIMETYPE
+    # JSON is listed first so it wins ties (e.g. Accept: */*)
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES)
+    return MSGPACK_MIMETYPE if best in MSGPACK_MIMETYPES else JSON_MIMETYPE
+
+
+def negotiate(payload, status: int = 200) -> Response:
+    """
+    Encode a JSON-like payload in the format the client asked for
+
+    Args:
+        payload: dict/list of JSON-compatible values
+        status: HTTP status code
+
+    Returns:
+        Response with Vary: Accept so caches keep the encodings apart
+    """
+    if negotiated_mimetype() == MSGPACK_MIMETYPE:
+        response = Response(msgpack.packb(payload, use_bin_type=True),
+                            status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+    response.vary.add('Accept')
+    return response
+
+
+def decode(response):
+    """
+    Payload of a response built by negotiate() or jsonify()
+
+    Raises:
+        ValueError: If the response is neither JSON nor MessagePack
+    """
+    if response.is_json:
+        return response.get_json()
+    if MSGPACK_AVAILABLE and response.mimetype in MSGPACK_MIMETYPES:
+        return msgpack.unpackb(response.get_data(), raw=False)
+    raise ValueError('Response is not JSON')
@@ -0,0 +1,358 @@
+"""Alerts module - threshold and duration rules evaluated on every metric sample
+
+Rules are loaded from configs/alert_rules.json:
+
+    {"name": "cpu_temperature_high", "metric": "cpu.temperature",
+     "op": ">", "threshold": 75, "for": "5m", "severity": "warning"}
+
+MetricHistory hands every recorded sample to the engine, which updates each
+matching rule's state machine in constant time - no history is rescanned:
+
+    inactive --condition true--> pending --true for "for"--> firing
+    pending  --condition false-> inactive
+    firing   --condition false-> resolved (kept in the recent list)
+
+Metric names may use wildcards ("disk.*.utilization"); each matching metric
+gets its own alert. Firing and resolved transitions are sent to notifiers
+(log, MQTT publish, webhook) from a background thread so a slow broker or
+endpoint never delays the sampler.
+"""
+import fnmatch
+import json
+import logging
+import math
+import operator
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from app.modules.metric_history import parse_duration
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = {
+    '>': operator.gt, '>=': operator.ge,
+    '<': operator.lt, '<=': operator.le,
+    '==': operator.eq, '!=': operator.ne
+}
+
+INACTIVE, PENDING, FIRING, RESOLVED = 'inactive', 'pending', 'firing', 'resolved'
+
+
+class AlertRule:
+    """A threshold condition that must hold for a duration"""
+
+    def __init__(self, name: str, metric: str, op: str, threshold: float,
+                 duration: float = 0, severity: str = 'warning', description: str = ''):
+        """
+        Initialize a rule
+
+        Args:
+            name: Unique rule name
+            metric: Metric name, may contain * wildcards
+            op: Comparison operator (>, >=, <, <=, ==, !=)
+            threshold: Value compared against
+            duration: Seconds the condition must hold before firing (0 = immediately)
+            severity: Free-form severity label (info, warning, critical)
+            description: Human readable summary
+        """
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator in rule {name}: {op}")
+        self.name = name
+        self.metric = metric
+        self.op = op
+        self.compare = OPERATORS[op]
+        self.threshold = float(threshold)
+        self.duration = duration
+        self.severity = severity
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AlertRule':
+        """Build a rule from its JSON definition"""
+        duration = data.get('for', 0)
+        return cls(
+            name=data['name'],
+            metric=data['metric'],
+            op=data.get('op', '>'),
+            threshold=data['threshold'],
+            duration=parse_duration(duration) if duration not in (0, '0', '') else 0,
+            severity=data.get('severity', 'warning'),
+            description=data.get('description', '')
+        )
+
+    def matches(self, metric: str) -> bool:
+        return fnmatch.fnmatchcase(metric, self.metric)
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'metric': self.metric,
+            'op': self.op,
+            'threshold': self.threshold,
+            'for': self.duration,
+            'severity': self.severity,
+            'description': self.description
+        }
+
+
+class Alert:
+    """State of one rule for one metric"""
+
+    __slots__ = ('rule', 'metric', 'state', 'value', 'pending_since', 'fired_at', 'resolved_at')
+
+    def __init__(self, rule: AlertRule, metric: str):
+        self.rule = rule
+        self.metric = metric
+        self.state = INACTIVE
+        self.value = None
+        self.pending_since = None
+        self.fired_at = None
+        self.resolved_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            'rule': self.rule.name,
+            'metric': self.metric,
+            'state': self.state,
+            'severity': self.rule.severity,
+            'value': self.value,
+            'threshold': self.rule.threshold,
+            'op': self.rule.op,
+            'description': self.rule.description,
+            'pending_since': self.pending_since,
+            'fired_at': self.fired_at,
+            'resolved_at': self.resolved_at
+        }
+
+
+class LogNotifier:
+    """Writes alert transitions to the application log"""
+
+    def notify(self, event: dict):
+        level = logging.WARNING if event['state'] == FIRING else logging.INFO
+        logger.log(level, f"Alert {event['rule']} {event['state']}: "
+                          f"{event['metric']}={event['value']} ({event['op']} {event['threshold']})")
+
+
+class MQTTNotifier:
+    """Publishes alert transitions as JSON to an MQTT topic"""
+
+    def __init__(self, topic: str = 'dashboard/alerts', retain: bool = False):
+        self.topic = topic
+        self.retain = retain
+
+    def notify(self, event: dict):
+        from app.modules.mqtt_tasmota import get_mqtt_client
+        client = get_mqtt_client()
+        if client is None or not client.connected:
+            logger.warning(f"MQTT not connected - alert {event['rule']} not published")
+            return
+        client.publish(f"{self.topic}/{event['rule']}", json.dumps(event), retain=self.retain)
+
+
+class WebhookNotifier:
+    """POSTs alert transitions as JSON to a URL"""
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: Optional[dict] = None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def notify(self, event: dict):
+        import requests
+        from app.modules.http_client import get_http_client
+        client = get_http_client()
+        session = client.session if client is not None else requests
+        response = session.post(self.url, json=event, headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+
+
+# Notifier "type" values accepted in alert_rules.json
+NOTIFIER_TYPES = {
+    'log': LogNotifier,
+    'mqtt': MQTTNotifier,
+    'webhook': WebhookNotifier
+}
+
+
+class AlertEngine:
+    """Evaluates rules incrementally and dispatches notifications"""
+
+    def __init__(self, rules: List[AlertRule], notifiers: Optional[list] = None,
+                 recent_size: int = 50, queue_size: int = 100):
+        """
+        Initialize the engine
+
+        Args:
+            rules: Alert rules
+            notifiers: Objects with a notify(event) method
+            recent_size: Resolved alerts kept for /api/alerts
+            queue_size: Notifications buffered before new ones are dropped
+        """
+        self.rules = rules
+        self.notifiers = list(notifiers) if notifiers is not None else [LogNotifier()]
+        self.alerts: Dict[tuple, Alert] = {}  # (rule name, metric) -> Alert
+        self.routes: Dict[str, List[AlertRule]] = {}  # metric -> matching rules (memoized)
+        self.recent = deque(maxlen=recent_size)
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+
+    @classmethod
+    def from_config(cls, path: str) -> 'AlertEngine':
+        """Load rules and notifiers from a JSON file (missing file = no rules)"""
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No alert rules at {path}")
+            config = {}
+
+        rules = [AlertRule.from_dict(rule) for rule in config.get('rules', [])
+                 if rule.get('enabled', True)]
+        notifiers = []
+        for entry in config.get('notifiers', [{'type': 'log'}]):
+            entry = dict(entry)
+            if not entry.pop('enabled', True):
+                continue
+            notifier_type = entry.pop('type')
+            if notifier_type not in NOTIFIER_TYPES:
+                raise ValueError(f"Unknown notifier type: {notifier_type}")
+            notifiers.append(NOTIFIER_TYPES[notifier_type](**entry))
+        logger.info(f"Loaded {len(rules)} alert rules, {len(notifiers)} notifiers")
+        return cls(rules, notifiers)
+
+    def _rules_for(self, metric: str) -> List[AlertRule]:
+        """Rules matching a metric (pattern matching runs once per metric name)"""
+        rules = self.routes.get(metric)
+        if rules is None:
+            rules = self.routes[metric] = [rule for rule in self.rules if rule.matches(metric)]
+        return rules
+
+    def record(self, metrics: Dict[str, Optional[float]], timestamp: Optional[float] = None):
+        """Evaluate one sample of each metric (MetricHistory calls this on every record)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        events = []
+        with self.lock:
+            for metric, value in metrics.items():
+                if value is None or (isinstance(value, float) and math.isnan(value)):
+                    continue  # no data - keep the current state
+                for rule in self._rules_for(metric):
+                    event = self._evaluate(rule, metric, value, timestamp)
+                    if event is not None:
+                        events.append(event)
+        for event in events:
+            self._enqueue(event)
+
+    def _evaluate(self, rule: AlertRule, metric: str, value: float,
+                  timestamp: float) -> Optional[dict]:
+        """Advance one alert's state machine (caller holds the lock)"""
+        key = (rule.name, metric)
+        alert = self.alerts.get(key)
+        if alert is None:
+            alert = self.alerts[key] = Alert(rule, metric)
+        alert.value = value
+
+        if rule.compare(value, rule.threshold):
+            if alert.state == INACTIVE:
+                alert.state = PENDING
+                alert.pending_since = timestamp
+            if alert.state == PENDING and timestamp - alert.pending_since >= rule.duration:
+                alert.state = FIRING
+                alert.fired_at = timestamp
+                return alert.to_dict()
+            return None
+
+        if alert.state == FIRING:
+            alert.state = RESOLVED
+            alert.resolved_at = timestamp
+            event = alert.to_dict()
+            self.recent.appendleft(event)
+            del self.alerts[key]
+            return event
+        if alert.state == PENDING:
+            del self.alerts[key]
+        return None
+
+    def _enqueue(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            logger.error(f"Alert notification queue full - dropped {event['rule']} {event['state']}")
+
+    def _run(self):
+        """Notifier thread - deliver events in order"""
+        while True:
+            event = self.queue.get()
+            if event is None:
+                break
+            for notifier in self.notifiers:
+                try:
+                    notifier.notify(event)
+                except Exception as e:
+                    logger.error(f"Alert notifier {type(notifier).__name__} failed: {e}")
+
+    def start(self):
+        """Start the notifier thread"""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name='alert-notifier', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the notifier thread after pending notifications are sent"""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+        self.thread = None
+
+    def active(self) -> List[dict]:
+        """Pending and firing alerts, firing first"""
+        with self.lock:
+            alerts = [alert.to_dict() for alert in self.alerts.values() if alert.state != INACTIVE]
+        return sorted(alerts, key=lambda a: (a['state'] != FIRING, a['rule'], a['metric']))
+
+    def resolved(self) -> List[dict]:
+        """Recently resolved alerts, newest first"""
+        with self.lock:
+            return list(self.recent)
+
+
+# Global engine instance
+_engine: Optional[AlertEngine] = None
+
+
+def get_alert_engine() -> Optional[AlertEngine]:
+    """Get the global alert engine instance"""
+    return _engine
+
+
+def init_alert_engine(rules_file: str) -> AlertEngine:
+    """Initialize the global alert engine from a rules file and start notifications"""
+    global _engine
+
+    if _engine is not None:
+        logger.warning("Alert engine already initialized")
+        return _engine
+
+    try:
+        _engine = AlertEngine.from_config(rules_file)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        # A broken rules file must not take the whole app down with it
+        logger.error(f"Invalid alert rules in {rules_file} - alerting disabled: {e}")
+        _engine = AlertEngine([])
+    _engine.start()
+    return _engine
+
+
+def shutdown_alert_engine():
+    """Stop the global alert engine"""
+    global _engine
+
+    if _engine is not None:
+        _engine.stop()
+        _engine = None
@@ -0,0 +1,272 @@
+"""Anomaly detection module - vectorized statistics over metric history
+
+Fixed alert thresholds miss slow problems: librespot's memory creeping up, or
+temperatures drifting as a fan fails. This module analyzes each metric's
+stored history in one NumPy batch and flags:
+
+- spike: a sample more than z_threshold rolling standard deviations from the
+  rolling mean of the preceding `rolling` samples (cumulative-sum windows)
+- drift: the recent level (EWMA) has moved more than drift_threshold robust
+  units (1.4826 x MAD) away from the median of the older half of the window
+- outlier: the latest sample's robust z-score exceeds z_threshold
+
+The spike threshold defaults to 6 because a day holds 86400 samples per
+metric: at 4 standard deviations plain noise alone would flag a few a day.
+
+Each metric's report also carries its summary statistics, the most recent
+spikes and trend_per_hour, the least-squares slope of the window in metric
+units per hour. Reports are cached for max_age seconds, so polling the
+endpoint does not re-run the analysis.
+
+NumPy is optional - without it anomaly detection is disabled.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Try to import numpy, but don't fail if not available
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normally distributed data
+MAX_SPIKES = 10  # most recent spikes returned per metric
+EWMA_TAIL = 8  # spans of samples that contribute to the current EWMA level
+
+
+def ewma(values, alpha: float):
+    """
+    Exponentially weighted moving average without a per-sample Python loop
+
+    Uses the closed form y_k = d^(k+1) * y_-1 + alpha * d^k * sum(x_j * d^-j)
+    in blocks short enough that d^-j stays within float64 precision.
+    """
+    decay = 1.0 - alpha
+    if decay <= 0 or len(values) == 0:
+        return values.astype(np.float64)
+    out = np.empty(len(values), dtype=np.float64)
+    block = max(1, int(20 / -math.log(decay)))
+    powers = decay ** np.arange(min(block, len(values)) + 1)
+    level = float(values[0])
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        n = len(chunk)
+        scaled = np.cumsum(chunk / powers[:n])
+        out[start:start + n] = powers[1:n + 1] * level + alpha * powers[:n] * scaled
+        level = out[start + n - 1]
+    return out
+
+
+def rolling_zscores(values, window: int):
+    """
+    z-score of each sample against the mean/std of the preceding `window` samples
+
+    The first `window` samples get 0. The std is floored at 1% of the mean so
+    near-constant metrics (disk usage) do not turn rounding into spikes.
+    Operations are done in place - on a Pi the temporaries cost more than the math.
+    """
+    n = len(values)
+    z = np.zeros(n, dtype=np.float64)
+    if n <= window:
+        return z
+    offset = values.mean()
+    centered = values - offset  # keeps the cumulative sums small
+    sums = np.zeros(n + 1)
+    np.cumsum(centered, out=sums[1:])
+    squares = np.zeros(n + 1)
+    np.cumsum(np.square(centered), out=squares[1:])
+
+    mean = sums[window:n] - sums[:n - window]
+    mean /= window
+    std = squares[window:n] - squares[:n - window]
+    std /= window
+    std -= np.square(mean)
+    np.sqrt(np.maximum(std, 0, out=std), out=std)
+    floor = np.abs(mean + offset)
+    floor *= 0.01
+    np.maximum(std, np.maximum(floor, 1e-6, out=floor), out=std)
+
+    rolling = z[window:]
+    np.subtract(centered[window:], mean, out=rolling)
+    rolling /= std
+    return z
+
+
+def _median(values) -> float:
+    """Upper median via a single partition (np.median's NaN scan and two pivots cost ~8x)"""
+    middle = len(values) // 2
+    return float(np.partition(values, middle)[middle])
+
+
+def _robust(values):
+    """Median and MAD-based standard deviation (floored at 1% of the median)"""
+    median = _median(values)
+    mad = _median(np.abs(values - median))
+    return median, max(MAD_SCALE * mad, 0.01 * abs(median), 1e-6)
+
+
+def analyze_series(timestamps, values, rolling: int = 300, span: int = 600,
+                   z_threshold: float = 6.0, drift_threshold: float = 3.0) -> Optional[dict]:
+    """
+    Statistics and anomaly flags for one metric
+
+    Args:
+        timestamps: Epoch seconds (float64 array)
+        values: Samples (NaN = missing)
+        rolling: Samples in the rolling mean/std window
+        span: EWMA span in samples (alpha = 2 / (span + 1))
+        z_threshold: Rolling and robust z-score limit
+        drift_threshold: Robust units the EWMA may move from the baseline median
+
+    Returns:
+        Result dict, or None when there are too few samples
+    """
+    valid = ~np.isnan(values)
+    if not valid.all():
+        timestamps, values = timestamps[valid], values[valid]
+    values = values.astype(np.float64)
+    if len(values) < 10:
+        return None
+
+    median, scale = _robust(values)
+    # Baseline for drift: the older half, so a slow climb is not part of its own reference
+    baseline, baseline_scale = _robust(values[:len(values) // 2])
+
+    # Older samples weigh less than e^-16 in the final level - skip them
+    level = ewma(values[-EWMA_TAIL * span:], 2.0 / (span + 1))[-1]
+    drift = (level - baseline) / baseline_scale
+    latest_z = (values[-1] - median) / scale
+
+    z = rolling_zscores(values, rolling)
+    spike_index = np.flatnonzero(np.abs(z) > z_threshold)
+
+    # Least-squares slope (np.polyfit's lstsq is ~20x slower for one line)
+    elapsed = timestamps - timestamps.mean()
+    spread = np.dot(elapsed, elapsed)
+    slope = np.dot(elapsed, values - values.mean()) / spread * 3600 if spread > 0 else 0.0
+
+    flags = []
+    if len(spike_index):
+        flags.append('spike')
+    if abs(drift) > drift_threshold:
+        flags.append('drift')
+    if abs(latest_z) > z_threshold:
+        flags.append('outlier')
+
+    return {
+        'samples': int(len(values)),
+        'latest': round(float(values[-1]), 3),
+        'mean': round(float(values.mean()), 3),
+        'std': round(float(values.std()), 3),
+        'median': round(median, 3),
+        'baseline': round(baseline, 3),
+        'ewma': round(float(level), 3),
+        'drift': round(float(drift), 2),
+        'latest_zscore': round(float(latest_z), 2),
+        'trend_per_hour': round(float(slope), 4),
+        'spike_count': int(len(spike_index)),
+        'spikes': [
+            {'timestamp': round(float(timestamps[i]), 1), 'value': round(float(values[i]), 3),
+             'zscore': round(float(z[i]), 2)}
+            for i in spike_index[-MAX_SPIKES:][::-1]
+        ],
+        'flags': flags,
+        'anomalous': bool(flags)
+    }
+
+
+class AnomalyDetector:
+    """Runs analyze_series() over every metric in history, cached"""
+
+    def __init__(self, history, max_age: float = 60.0, **options):
+        """
+        Initialize the detector
+
+        Args:
+            history: MetricHistory to analyze
+            max_age: Seconds a result is reused for the same window
+            **options: Passed to analyze_series (rolling, span, z_threshold, drift_threshold)
+        """
+        self.history = history
+        self.max_age = max_age
+        self.options = options
+        self.lock = threading.Lock()
+        self.results: Dict[float, dict] = {}  # window -> result
+
+    def _series(self, name: str, window: float):
+        """A metric's samples over the window as NumPy arrays"""
+        buffer = self.history.buffers.get(name)
+        if buffer is None:
+            return None, None
+        with self.history.lock:
+            ticks, values = buffer.since(time.time() - window)
+        timestamps = buffer.base_time + np.frombuffer(ticks, dtype=np.uint32) / 10
+        return timestamps, np.frombuffer(values, dtype=np.float32)
+
+    def analyze(self, window: float = 86400, metrics: Optional[List[str]] = None) -> dict:
+        """
+        Analyze metrics over a window
+
+        Args:
+            window: Seconds of history to analyze
+            metrics: Metric names (all recorded metrics when None)
+        """
+        started = time.perf_counter()
+        results = {}
+        for name in metrics if metrics is not None else self.history.metrics():
+            timestamps, values = self._series(name, window)
+            if values is None:
+                continue
+            result = analyze_series(timestamps, values, **self.options)
+            if result is not None:
+                results[name] = result
+        return {
+            'window': window,
+            'computed_at': time.time(),
+            'duration': round(time.perf_counter() - started, 4),
+            'metrics': results,
+            'anomalous': sorted(name for name, result in results.items() if result['anomalous'])
+        }
+
+    def latest(self, window: float = 86400) -> dict:
+        """Cached analysis of all metrics (recomputed when older than max_age)"""
+        with self.lock:
+            cached = self.results.get(window)
+            if cached is not None and time.time() - cached['computed_at'] < self.max_age:
+                return cached
+            result = self.results[window] = self.analyze(window)
+            # Keep only a few windows
+            while len(self.results) > 4:
+                self.results.pop(next(iter(self.results)))
+            return result
+
+
+# Global detector instance
+_detector: Optional[AnomalyDetector] = None
+
+
+def get_anomaly_detector() -> Optional[AnomalyDetector]:
+    """Get the global anomaly detector instance"""
+    return _detector
+
+
+def init_anomaly_detector(history, max_age: float = 60.0) -> Optional[AnomalyDetector]:
+    """Initialize the global anomaly detector (None when numpy is missing)"""
+    global _detector
+
+    if not NUMPY_AVAILABLE:
+        logger.warning("numpy not available - anomaly detection disabled")
+        return None
+
+    if _detector is not None:
+        logger.warning("Anomaly detector already initialized")
+        return _detector
+
+    _detector = AnomalyDetector(history, max_age)
+    return _detector
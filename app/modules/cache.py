@@ -0,0 +1,196 @@
+"""Cache module - TTL cache with stale-while-revalidate for slow collectors
+
+Each entry has a TTL and an optional stale window. Within the TTL the cached
+value is returned; within the stale window the old value is still returned
+immediately while one background thread refreshes it. Only a missing or
+fully expired entry makes the caller wait for the loader.
+
+A loader returning None (e.g. a failed HTTP lookup) never replaces a good
+value, so the last good value keeps being served until the stale window ends.
+"""
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    """Cached value with its load time and lifetime"""
+
+    __slots__ = ('value', 'loaded_at', 'ttl', 'stale_ttl')
+
+    def __init__(self, value, ttl: float, stale_ttl: float):
+        self.value = value
+        self.loaded_at = time.monotonic()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def is_fresh(self) -> bool:
+        return self.age() < self.ttl
+
+    def is_usable(self) -> bool:
+        return self.age() < self.ttl + self.stale_ttl
+
+
+class TTLCache:
+    """Bounded LRU cache with per-key TTL and background revalidation"""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.load_locks = {}  # key -> Lock, so one caller loads while others wait
+        self.refreshing = set()
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0,
+                         'refreshes': 0, 'errors': 0, 'evictions': 0}
+
+    def get(self, key: str, loader: Callable, ttl: float, stale_ttl: float = 0):
+        """
+        Get a cached value, loading or refreshing it as needed
+
+        Args:
+            key: Cache key
+            loader: Function returning the value
+            ttl: Seconds the value is fresh
+            stale_ttl: Further seconds a stale value is served while refreshing
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                if entry.is_fresh():
+                    self.counters['hits'] += 1
+                    return entry.value
+                if entry.is_usable():
+                    self.counters['stale_hits'] += 1
+                    self._refresh_in_background(key, loader, ttl, stale_ttl)
+                    return entry.value
+            self.counters['misses'] += 1
+            load_lock = self.load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another caller may have loaded it while we waited
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None and entry.is_fresh():
+                    return entry.value
+            return self._load(key, loader, ttl, stale_ttl)
+
+    def _load(self, key: str, loader: Callable, ttl: float, stale_ttl: float):
+        """Run the loader and store a non-None result"""
+        try:
+            value = loader()
+        except Exception as e:
+            logger.error(f"Cache loader for {key} failed: {e}")
+            value = None
+
+        with self.lock:
+            if value is None:
+                self.counters['errors'] += 1
+                entry = self.entries.get(key)
+                return entry.value if entry is not None and entry.is_usable() else None
+            self.entries[key] = CacheEntry(value, ttl, stale_ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                evicted, _ = self.entries.popitem(last=False)
+                self.load_locks.pop(evicted, None)
+                self.counters['evictions'] += 1
+        return value
+
+    def _refresh_in_background(self, key: str, loader: Callable, ttl: float, stale_ttl: float):
+        """Start one refresh thread per key (caller holds self.lock)"""
+        if key in self.refreshing:
+            return
+        self.refreshing.add(key)
+        self.counters['refreshes'] += 1
+
+        def refresh():
+            try:
+                self._load(key, loader, ttl, stale_ttl)
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f'cache-refresh-{key}', daemon=True).start()
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """
+        Drop one key, or every key when key is None
+
+        Returns:
+            Number of entries removed
+        """
+        with self.lock:
+            if key is None:
+                count = len(self.entries)
+                self.entries.clear()
+                return count
+            return 1 if self.entries.pop(key, None) is not None else 0
+
+    def stats(self) -> dict:
+        """Counters and per-key ages"""
+        with self.lock:
+            lookups = self.counters['hits'] + self.counters['stale_hits'] + self.counters['misses']
+            return {
+                **self.counters,
+                'hit_rate': round((lookups - self.counters['misses']) / lookups, 3) if lookups else None,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'keys': {
+                    key: {
+                        'age': round(entry.age(), 1),
+                        'ttl': entry.ttl,
+                        'fresh': entry.is_fresh()
+                    }
+                    for key, entry in self.entries.items()
+                }
+            }
+
+
+# Global cache instance
+_cache = TTLCache()
+
+
+def get_cache() -> TTLCache:
+    """Get the global cache"""
+    return _cache
+
+
+def cached(ttl: float, stale_ttl: float = 0, key: Optional[str] = None):
+    """
+    Decorator caching a no-argument collector in the global cache
+
+    The wrapped function gains invalidate() and uncached attributes.
+
+    Args:
+        ttl: Seconds the value is fresh
+        stale_ttl: Further seconds a stale value is served while refreshing
+        key: Cache key (defaults to the function name)
+    """
+    def decorator(func):
+        cache_key = key or func.__name__
+
+        @functools.wraps(func)
+        def wrapper():
+            return _cache.get(cache_key, func, ttl, stale_ttl)
+
+        wrapper.invalidate = lambda: _cache.invalidate(cache_key)
+        wrapper.uncached = func
+        return wrapper
+    return decorator
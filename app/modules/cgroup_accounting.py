@@ -0,0 +1,214 @@
+"""Cgroup accounting module - per-service CPU, memory, I/O and pids from cgroup v2
+
+systemd puts every service in its own cgroup, and on a cgroup v2 (unified)
+hierarchy the kernel already keeps that cgroup's totals in
+/sys/fs/cgroup/system.slice/<unit>.service:
+
+- cpu.stat      usage_usec/user_usec/system_usec (CPU time of every process)
+- memory.current  bytes charged to the cgroup (including page cache)
+- io.stat       rbytes/wbytes/rios/wios per block device
+- pids.current  number of tasks
+
+Reading four small files per unit replaces walking the unit's PIDs. The
+sampler drives it once per stats sample; CPU and I/O rates come from counter
+deltas and are recorded into metric history as service.<unit>.cpu_percent
+(% of one core, like top), service.<unit>.memory (bytes),
+service.<unit>.read_rate / write_rate (bytes/s) and service.<unit>.pids,
+averaged to one sample per history_resolution seconds.
+
+A unit that is stopped has no cgroup directory and reports active=False; a
+restarted unit starts new counters, so the first interval after a restart has
+no rates.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from app.modules.collectors import sample_interval
+
+logger = logging.getLogger(__name__)
+
+# io.stat keys summed across devices
+IO_KEYS = ('rbytes', 'wbytes', 'rios', 'wios')
+
+
+def parse_cpu_stat(text: str) -> Dict[str, int]:
+    """"usage_usec 123" lines of cpu.stat -> {"usage_usec": 123, ...}"""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(' ')
+        if value:
+            values[key] = int(value)
+    return values
+
+
+def parse_io_stat(text: str) -> Dict[str, int]:
+    """Sum the IO_KEYS of every "8:0 rbytes=1 wbytes=2 ..." line of io.stat"""
+    totals = dict.fromkeys(IO_KEYS, 0)
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition('=')
+            if key in totals:
+                totals[key] += int(value)
+    return totals
+
+
+def unit_path(unit: str) -> str:
+    """Unit name -> cgroup directory relative to the hierarchy root"""
+    if '.' not in unit:
+        unit += '.service'
+    return os.path.join('system.slice', unit)
+
+
+class CgroupAccounting:
+    """Computes per-unit resource usage from cgroup v2 counter deltas"""
+
+    def __init__(self, units: Sequence[str], cgroup_path: str = '/sys/fs/cgroup',
+                 max_age: float = 2.0):
+        """
+        Initialize the accounting
+
+        Args:
+            units: systemd units ("nginx" means nginx.service)
+            cgroup_path: cgroup v2 mount point (tests point this at a temp dir)
+            max_age: Seconds results are reused before stats() samples again
+        """
+        self.units = [unit[:-len('.service')] if unit.endswith('.service') else unit
+                      for unit in units]
+        self.cgroup_path = cgroup_path
+        self.max_age = max_age
+        self.available = os.path.exists(os.path.join(cgroup_path, 'cgroup.controllers'))
+        if not self.available:
+            logger.info(f"No cgroup v2 hierarchy at {cgroup_path} - service accounting disabled")
+        self.lock = threading.Lock()
+        self.counters: Dict[str, dict] = {}  # unit -> last raw counters
+        self.results: Dict[str, dict] = {}
+        self.sampled_at: Optional[float] = None  # monotonic time of the last sample
+        self.timestamp: Optional[float] = None  # epoch time of the last sample
+        self.history = None  # optional MetricHistory that receives usage
+        self.history_resolution = 10.0  # seconds per stored history sample (averaged)
+
+    def _read(self, unit: str) -> Optional[dict]:
+        """Raw counters of one unit (None if its cgroup does not exist)"""
+        path = os.path.join(self.cgroup_path, unit_path(unit))
+        try:
+            with open(os.path.join(path, 'cpu.stat'), 'r') as f:
+                cpu = parse_cpu_stat(f.read())
+        except OSError:
+            return None  # unit not running
+
+        counters = {
+            'usage_usec': cpu.get('usage_usec', 0),
+            'user_usec': cpu.get('user_usec', 0),
+            'system_usec': cpu.get('system_usec', 0),
+        }
+        # Controllers that are not enabled for the slice have no file
+        for name, key in (('memory.current', 'memory'), ('pids.current', 'pids')):
+            try:
+                with open(os.path.join(path, name), 'r') as f:
+                    counters[key] = int(f.read())
+            except (OSError, ValueError):
+                counters[key] = None
+        try:
+            with open(os.path.join(path, 'io.stat'), 'r') as f:
+                counters.update(parse_io_stat(f.read()))
+        except OSError:
+            pass
+        return counters
+
+    def sample(self, now: Optional[float] = None) -> Dict[str, dict]:
+        """Read every unit's files once and compute usage since the previous sample"""
+        now = time.monotonic() if now is None else now
+        current = {unit: self._read(unit) for unit in self.units} if self.available else {}
+
+        with self.lock:
+            elapsed, stale = sample_interval(self.sampled_at, now)
+            if stale:
+                return self.results  # older than the last sample: keep the newer state
+            results = {}
+            for unit in self.units:
+                values = current.get(unit)
+                if values is None:
+                    results[unit] = {'active': False}
+                    continue
+                result = results[unit] = {
+                    'active': True,
+                    'cpu_seconds': round(values['usage_usec'] / 1e6, 2),
+                    'memory_bytes': values['memory'],
+                    'pids': values['pids'],
+                }
+                previous = self.counters.get(unit)
+                if elapsed is None or previous is None or values['usage_usec'] < previous['usage_usec']:
+                    continue  # no baseline yet, or the unit restarted
+                delta = {key: values.get(key, 0) - previous.get(key, 0)
+                         for key in ('usage_usec', 'user_usec', 'system_usec') + IO_KEYS}
+                elapsed_usec = elapsed * 1e6
+                result.update({
+                    'cpu_percent': round(delta['usage_usec'] / elapsed_usec * 100, 1),
+                    'user_percent': round(delta['user_usec'] / elapsed_usec * 100, 1),
+                    'system_percent': round(delta['system_usec'] / elapsed_usec * 100, 1),
+                    'read_bytes_per_sec': round(max(delta['rbytes'], 0) / elapsed, 1),
+                    'write_bytes_per_sec': round(max(delta['wbytes'], 0) / elapsed, 1),
+                    'read_iops': round(max(delta['rios'], 0) / elapsed, 2),
+                    'write_iops': round(max(delta['wios'], 0) / elapsed, 2),
+                })
+
+            self.counters = {unit: values for unit, values in current.items() if values is not None}
+            self.results = results
+            self.sampled_at = now
+            self.timestamp = time.time()
+            return results
+
+    def stats(self) -> Dict[str, dict]:
+        """Latest per-unit usage, sampling only when it is older than max_age"""
+        if self.sampled_at is None and self.available:
+            # First use without the sampler: take a baseline for the delta
+            self.sample()
+            time.sleep(0.25)
+            return self.sample()
+        if self.sampled_at is None or time.monotonic() - self.sampled_at >= self.max_age:
+            return self.sample()
+        return self.results
+
+    def record_snapshot(self, snapshot):
+        """Sampler callback - sample the units and record their usage into history"""
+        if not self.available:
+            return
+        results = self.sample(snapshot.monotonic)
+        if self.history is None:
+            return
+        metrics = {}
+        for unit, values in results.items():
+            if not values['active']:
+                continue
+            metrics[f'service.{unit}.memory'] = values['memory_bytes']
+            metrics[f'service.{unit}.pids'] = values['pids']
+            if 'cpu_percent' in values:
+                metrics[f'service.{unit}.cpu_percent'] = values['cpu_percent']
+                metrics[f'service.{unit}.read_rate'] = values['read_bytes_per_sec']
+                metrics[f'service.{unit}.write_rate'] = values['write_bytes_per_sec']
+        if metrics:
+            self.history.record(metrics, snapshot.timestamp, self.history_resolution)
+
+
+# Global accounting instance
+_accounting: Optional[CgroupAccounting] = None
+
+
+def get_cgroup_accounting() -> Optional[CgroupAccounting]:
+    """Get the global cgroup accounting instance"""
+    return _accounting
+
+
+def init_cgroup_accounting(units: Sequence[str]) -> CgroupAccounting:
+    """Initialize the global cgroup accounting for a list of units"""
+    global _accounting
+
+    if _accounting is not None:
+        logger.warning("Cgroup accounting already initialized")
+        return _accounting
+
+    _accounting = CgroupAccounting(units)
+    return _accounting
@@ -0,0 +1,102 @@
+"""Parallel collection module - runs slow collectors concurrently under a deadline
+
+Used by the collector registry for io and network collectors, so a detailed
+tick is bounded by the overall deadline instead of the sum of every
+subprocess and HTTP call.
+A collector that misses its timeout is left running in the background; its
+last good value is returned (marked stale) and it is not started again until
+the running call finishes, so a hung source can never fill the pool.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelCollector:
+    """Bounded thread pool with per-collector timeouts and last-good fallback"""
+
+    def __init__(self, max_workers: int = 6):
+        """
+        Initialize the collector pool
+
+        Args:
+            max_workers: Maximum collectors running at the same time
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='collector')
+        self.inflight = {}  # name -> Future still running from an earlier call
+        self.last_good: Dict[str, Tuple[object, float]] = {}  # name -> (value, monotonic time)
+        self.lock = threading.Lock()
+
+    def _submit(self, name: str, func: Callable):
+        """Start a collector, or reuse its call that is still running"""
+        with self.lock:
+            future = self.inflight.get(name)
+            if future is None or future.done():
+                future = self.executor.submit(func)
+                self.inflight[name] = future
+            return future
+
+    def run(self, collectors: Dict[str, Tuple[Callable, float]], deadline: float):
+        """
+        Run collectors concurrently
+
+        Args:
+            collectors: {name: (function, timeout seconds)}
+            deadline: Overall seconds to wait for all collectors
+
+        Returns:
+            Tuple of ({name: value}, {name: status}) where status has
+            timed_out, stale, error and duration fields
+        """
+        started = time.monotonic()
+        end = started + deadline
+        futures = {name: (self._submit(name, func), timeout)
+                   for name, (func, timeout) in collectors.items()}
+
+        results, status = {}, {}
+        for name, (future, timeout) in futures.items():
+            remaining = min(started + timeout, end) - time.monotonic()
+            entry = {'timed_out': False, 'stale': False, 'error': None}
+            try:
+                value = future.result(timeout=max(0, remaining))
+                self.last_good[name] = (value, time.monotonic())
+                results[name] = value
+            except FutureTimeoutError:
+                entry['timed_out'] = True
+                results[name] = self._fallback(name, entry)
+            except Exception as e:
+                logger.error(f"Collector {name} failed: {e}", exc_info=True)
+                entry['error'] = str(e)
+                results[name] = self._fallback(name, entry)
+            entry['duration'] = round(time.monotonic() - started, 3)
+            status[name] = entry
+
+        return results, status
+
+    def _fallback(self, name: str, entry: dict):
+        """Last good value for a collector that did not finish in time"""
+        last = self.last_good.get(name)
+        if last is None:
+            return None
+        entry['stale'] = True
+        entry['age'] = round(time.monotonic() - last[1], 1)
+        return last[0]
+
+
+# Global collector pool
+_collector: Optional[ParallelCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_parallel_collector() -> ParallelCollector:
+    """Get or create the global collector pool"""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                _collector = ParallelCollector()
+    return _collector
@@ -0,0 +1,292 @@
+"""Collector registry module - per-collector cadence, cost class and dependencies
+
+get_all_stats() used to read every source on every call, so the OS name was
+re-read each second and temperature could only be sampled as often as the
+partition list. Each source is now a registered collector that declares:
+
+- interval: seconds between runs (None = once per process)
+- cost: "cheap" (in-process reads, run inline), "io" (subprocesses, file
+  walks) or "network" - io and network collectors run on the parallel
+  collection pool under their timeout
+- depends: cheap collectors whose latest values are passed in as keyword
+  arguments (e.g. one /proc read shared by the CPU, memory and uptime collectors)
+- key: dotted path of the value in the assembled stats dict (None = internal,
+  only used as a dependency)
+- groups: which snapshots include it ("stats", "detailed")
+
+A single schedule (a heap of next-due times) decides which collectors run on
+each sampler tick, so a tick only pays for the collectors that are due.
+Modules plug in with the @collector decorator without touching
+get_all_stats().
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.modules import collection
+
+logger = logging.getLogger(__name__)
+
+COST_CLASSES = ('cheap', 'io', 'network')
+SLACK = 0.05  # seconds - a tick that wakes up slightly early still runs what is due
+
+
+def sample_interval(previous: Optional[float], now: float) -> Tuple[Optional[float], bool]:
+    """
+    Seconds since the previous sample of a counter-delta collector
+
+    Sampler callbacks pass the monotonic time their snapshot was taken, so a
+    request that sampled in between can leave `now` at or before `previous`.
+
+    Returns:
+        (elapsed, stale): elapsed is None when there is no baseline yet; stale
+        is True when `now` is not after `previous` - the caller must neither
+        compute rates nor move its counters back to that older time
+    """
+    if previous is None:
+        return None, False
+    elapsed = now - previous
+    return elapsed, elapsed <= 0
+
+
+class Collector:
+    """A registered source of one value in the stats dicts"""
+
+    def __init__(self, name: str, func: Callable, interval: Optional[float],
+                 key: Optional[str] = None, cost: str = 'cheap', depends: Sequence[str] = (),
+                 timeout: float = 2.0, groups: Sequence[str] = ('detailed',)):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.key = key
+        self.cost = cost
+        self.depends = tuple(depends)
+        self.timeout = timeout
+        self.groups = tuple(groups)
+        self.value = None
+        self.updated: Optional[float] = None  # epoch time of the last successful run
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        self.timed_out = False
+        self.runs = 0
+
+    def call(self, registry: 'CollectorRegistry'):
+        """Run the collector with its dependencies' latest values"""
+        return self.func(**{dep: registry.collectors[dep].value for dep in self.depends})
+
+    def status(self) -> dict:
+        return {
+            'name': self.name,
+            'key': self.key,
+            'interval': self.interval,
+            'cost': self.cost,
+            'depends': list(self.depends),
+            'groups': list(self.groups),
+            'runs': self.runs,
+            'updated': self.updated,
+            'duration': round(self.duration, 4),
+            'timed_out': self.timed_out,
+            'error': self.error
+        }
+
+
+class CollectorRegistry:
+    """Registered collectors and the schedule of when each is next due"""
+
+    def __init__(self, max_deadline: float = 10.0):
+        """
+        Initialize the registry
+
+        Args:
+            max_deadline: Overall seconds one tick waits for io/network collectors
+        """
+        self.max_deadline = max_deadline
+        self.collectors: Dict[str, Collector] = {}  # registration order = dependency order
+        self.schedule = []  # heap of (monotonic due time, sequence, name)
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+
+    def register(self, name: str, func: Callable, interval: Optional[float],
+                 key: Optional[str] = None, cost: str = 'cheap', depends: Sequence[str] = (),
+                 timeout: float = 2.0, groups: Sequence[str] = ('detailed',)) -> Collector:
+        """
+        Register a collector (due immediately)
+
+        Dependencies must already be registered and cheap, which rules out
+        cycles and lets each tick run them inline before their dependents.
+        """
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class: {cost}")
+        for dep in depends:
+            if dep not in self.collectors:
+                raise ValueError(f"{name} depends on unregistered collector {dep}")
+            if self.collectors[dep].cost != 'cheap':
+                raise ValueError(f"{name} depends on {dep}, which is not a cheap collector")
+        with self.lock:
+            if name in self.collectors:
+                raise ValueError(f"Collector already registered: {name}")
+            collector = self.collectors[name] = Collector(
+                name, func, interval, key, cost, depends, timeout, groups
+            )
+            heapq.heappush(self.schedule, (time.monotonic(), next(self.sequence), name))
+        return collector
+
+    def collector(self, name: str, interval: Optional[float], **options):
+        """Decorator form of register()"""
+        def decorator(func):
+            self.register(name, func, interval, **options)
+            return func
+        return decorator
+
+    def _claim_due(self, group: str, now: float) -> list:
+        """Pop the group's due collectors (and their due dependencies) off the schedule"""
+        wanted = {name for name, c in self.collectors.items() if group in c.groups}
+        # Dependencies are registered first, so one reverse pass closes over them
+        for name in reversed(list(self.collectors)):
+            if name in wanted:
+                wanted.update(self.collectors[name].depends)
+
+        claimed, kept = [], []
+        with self.lock:
+            while self.schedule and self.schedule[0][0] <= now + SLACK:
+                entry = heapq.heappop(self.schedule)
+                if entry[2] in wanted:
+                    claimed.append(entry)
+                else:
+                    kept.append(entry)
+            for entry in kept:
+                heapq.heappush(self.schedule, entry)
+        # Registration order runs dependencies before their dependents
+        order = {name: i for i, name in enumerate(self.collectors)}
+        claimed.sort(key=lambda entry: order[entry[2]])
+        return claimed
+
+    def _reschedule(self, entries, now: float):
+        """Put run collectors back on the schedule at their next due time"""
+        with self.lock:
+            for due, _, name in entries:
+                interval = self.collectors[name].interval
+                if interval is None:
+                    continue  # run once
+                # Fixed cadence: skip missed slots instead of bursting to catch up
+                next_due = due + interval
+                if next_due < now:
+                    next_due = now + interval
+                heapq.heappush(self.schedule, (next_due, next(self.sequence), name))
+
+    def run_due(self, group: str):
+        """
+        Run the group's collectors that are due
+
+        Cheap collectors run inline; io and network collectors run together on
+        the parallel collection pool, bounded by their timeouts. A collector
+        claimed by one tick is off the schedule until it finishes, so a slow
+        detailed tick never runs a shared collector twice.
+        """
+        started = time.monotonic()
+        claimed = self._claim_due(group, started)
+        pooled = {}
+        for entry in claimed:
+            collector = self.collectors[entry[2]]
+            if collector.cost != 'cheap':
+                pooled[collector.name] = (lambda c=collector: c.call(self), collector.timeout)
+                continue
+            run_started = time.monotonic()
+            try:
+                collector.value = collector.call(self)
+                collector.updated = time.time()
+                collector.error = None
+            except Exception as e:
+                logger.error(f"Collector {collector.name} failed: {e}", exc_info=True)
+                collector.error = str(e)
+            collector.duration = time.monotonic() - run_started
+            collector.runs += 1
+
+        if pooled:
+            deadline = min(self.max_deadline, max(timeout for _, timeout in pooled.values()))
+            results, status = collection.get_parallel_collector().run(pooled, deadline)
+            for name, value in results.items():
+                collector, entry = self.collectors[name], status[name]
+                if not (entry['timed_out'] or entry['error']):
+                    collector.updated = time.time()
+                collector.value = value
+                collector.timed_out = entry['timed_out']
+                collector.error = entry['error']
+                collector.duration = entry['duration']
+                collector.runs += 1
+
+        self._reschedule(claimed, time.monotonic())
+
+    def build(self, group: str) -> dict:
+        """Assemble the group's latest values into a nested dict by key"""
+        stats = {}
+        for collector in self.collectors.values():
+            if collector.key is None or group not in collector.groups:
+                continue
+            *parents, leaf = collector.key.split('.')
+            node = stats
+            for part in parents:
+                node = node.setdefault(part, {})
+            if isinstance(collector.value, dict) and isinstance(node.get(leaf), dict):
+                node[leaf].update(collector.value)  # several collectors share a section
+            elif isinstance(collector.value, dict):
+                node[leaf] = dict(collector.value)
+            else:
+                node[leaf] = collector.value
+        return stats
+
+    def collect(self, group: str) -> dict:
+        """Run the group's due collectors and return its assembled stats"""
+        self.run_due(group)
+        return self.build(group)
+
+    def collection_status(self, group: str) -> dict:
+        """Timeout/staleness of the group's io and network collectors"""
+        status = {}
+        now = time.time()
+        for collector in self.collectors.values():
+            if collector.cost == 'cheap' or group not in collector.groups:
+                continue
+            stale = collector.updated is not None and (collector.timed_out or bool(collector.error))
+            entry = {'timed_out': collector.timed_out, 'stale': stale,
+                     'error': collector.error, 'duration': round(collector.duration, 3)}
+            if stale:
+                entry['age'] = round(now - collector.updated, 1)
+            status[collector.name] = entry
+        return status
+
+    def status(self) -> List[dict]:
+        """Per-collector cadence and last run details, with the next due time"""
+        with self.lock:
+            due = {name: when for when, _, name in self.schedule}
+        now = time.monotonic()
+        result = []
+        for collector in self.collectors.values():
+            entry = collector.status()
+            entry['next_due_in'] = round(max(0.0, due[collector.name] - now), 2) \
+                if collector.name in due else None
+            result.append(entry)
+        return result
+
+
+# Global registry
+_registry: Optional[CollectorRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> CollectorRegistry:
+    """Get or create the global collector registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CollectorRegistry()
+    return _registry
+
+
+def collector(name: str, interval: Optional[float], **options):
+    """Register a function with the global registry (see CollectorRegistry.register)"""
+    return get_registry().collector(name, interval, **options)
@@ -0,0 +1,169 @@
+"""Connection stats module - socket counts from /proc/net without PID lookups
+
+psutil.net_connections() enumerates every socket and then walks
+/proc/[pid]/fd to map socket inodes to processes, only for /api/system/info
+to take len() of the result. With many MQTT and nginx connections that is one
+of the most expensive calls in the detailed stats. This module reads:
+
+- /proc/net/sockstat and sockstat6 - kernel socket totals (in use, orphans,
+  TIME_WAIT, memory pages)
+- /proc/net/snmp - TCP/UDP counters (open/reset/retransmit totals)
+- /proc/net/tcp, tcp6, udp, udp6 - one line per socket; only the state column
+  of TCP lines is looked at, nothing is resolved to a PID
+
+The total of the four socket tables is the same count psutil returned.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# st column of /proc/net/tcp (include/net/tcp_states.h)
+TCP_STATES = {
+    '01': 'ESTABLISHED',
+    '02': 'SYN_SENT',
+    '03': 'SYN_RECV',
+    '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2',
+    '06': 'TIME_WAIT',
+    '07': 'CLOSE',
+    '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK',
+    '0A': 'LISTEN',
+    '0B': 'CLOSING',
+    '0C': 'NEW_SYN_RECV',
+}
+
+SOCKET_TABLES = ('tcp', 'tcp6', 'udp', 'udp6')
+
+# /proc/net/snmp counters reported per protocol
+SNMP_FIELDS = {
+    'Tcp': ('ActiveOpens', 'PassiveOpens', 'AttemptFails', 'EstabResets', 'CurrEstab',
+            'InSegs', 'OutSegs', 'RetransSegs', 'InErrs', 'OutRsts'),
+    'Udp': ('InDatagrams', 'OutDatagrams', 'NoPorts', 'InErrors', 'RcvbufErrors', 'SndbufErrors'),
+}
+
+
+def parse_sockstat(text: str) -> Dict[str, Dict[str, int]]:
+    """"TCP: inuse 4 orphan 0 tw 4" lines -> {"tcp": {"inuse": 4, ...}}"""
+    result = {}
+    for line in text.splitlines():
+        protocol, _, rest = line.partition(':')
+        fields = rest.split()
+        result[protocol.strip().lower()] = {
+            fields[i]: int(fields[i + 1]) for i in range(0, len(fields) - 1, 2)
+        }
+    return result
+
+
+def parse_snmp(text: str) -> Dict[str, Dict[str, int]]:
+    """Header/value line pairs of /proc/net/snmp -> {"tcp": {"CurrEstab": 12, ...}}"""
+    lines = text.splitlines()
+    result = {}
+    for header, values in zip(lines[::2], lines[1::2]):
+        protocol, _, names = header.partition(':')
+        if protocol not in SNMP_FIELDS:
+            continue
+        row = dict(zip(names.split(), values.partition(':')[2].split()))
+        result[protocol.lower()] = {name: int(row[name]) for name in SNMP_FIELDS[protocol]
+                                    if name in row}
+    return result
+
+
+def count_table(data: bytes, states: Optional[Dict[str, int]] = None) -> int:
+    """
+    Count the sockets in one /proc/net/{tcp,udp}[6] table
+
+    Args:
+        data: File contents
+        states: If given, per-state counts are added to it (TCP tables)
+    """
+    lines = data.split(b'\n')[1:]  # skip the header
+    count = 0
+    for line in lines:
+        if not line:
+            continue
+        count += 1
+        if states is not None:
+            # "sl: local rem st ..." - the state is the fourth field
+            state = line.split(None, 4)[3].decode()
+            name = TCP_STATES.get(state, state)
+            states[name] = states.get(name, 0) + 1
+    return count
+
+
+class ConnectionStats:
+    """Socket totals and TCP state counts read straight from /proc/net"""
+
+    def __init__(self, proc_path: str = '/proc', max_age: float = 2.0):
+        """
+        Initialize the collector
+
+        Args:
+            proc_path: procfs mount point (tests point this at a temp dir)
+            max_age: Seconds a result is reused before /proc/net is read again
+        """
+        self.net_path = os.path.join(proc_path, 'net')
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.cached: Optional[dict] = None
+        self.sampled_at: Optional[float] = None  # monotonic time of the cached result
+
+    def _read(self, name: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.net_path, name), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def sample(self) -> dict:
+        """Read the socket tables, sockstat and snmp once"""
+        states: Dict[str, int] = {}
+        tables = {}
+        for table in SOCKET_TABLES:
+            data = self._read(table)
+            if data is not None:
+                tables[table] = count_table(data, states if table.startswith('tcp') else None)
+
+        sockstat = {}
+        for name in ('sockstat', 'sockstat6'):
+            data = self._read(name)
+            if data is not None:
+                for protocol, values in parse_sockstat(data.decode()).items():
+                    sockstat.setdefault(protocol, {}).update(values)
+        snmp = self._read('snmp')
+
+        return {
+            'total': sum(tables.values()),
+            'tables': tables,
+            'tcp_states': dict(sorted(states.items())),
+            'sockstat': sockstat,
+            'snmp': parse_snmp(snmp.decode()) if snmp is not None else {},
+            'sampled_at': time.time()
+        }
+
+    def stats(self) -> dict:
+        """Latest connection stats, reading /proc/net only when older than max_age"""
+        with self.lock:
+            if self.sampled_at is None or time.monotonic() - self.sampled_at >= self.max_age:
+                self.cached = self.sample()
+                self.sampled_at = time.monotonic()
+            return self.cached
+
+
+# Global connection stats collector
+_connections: Optional[ConnectionStats] = None
+_connections_lock = threading.Lock()
+
+
+def get_connection_stats() -> ConnectionStats:
+    """Get or create the global connection stats collector"""
+    global _connections
+    if _connections is None:
+        with _connections_lock:
+            if _connections is None:
+                _connections = ConnectionStats()
+    return _connections
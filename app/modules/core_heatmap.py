@@ -0,0 +1,174 @@
+"""Per-core CPU heatmap module - cores x time utilization matrix
+
+The quick stats only carry overall CPU usage, which hides one core pinned at
+100% by librespot or shairport-sync on a 4-core Pi (the total reads 25%).
+This module keeps per-core utilization as a 2-D NumPy ring (cores x samples,
+float32) fed by the sampler, and downsamples any time window to a fixed-size
+grid with vectorized reductions (np.add.reduceat / np.maximum.reduceat).
+
+Utilization is computed from the per-core /proc/stat time deltas read
+through the shared procfs reader (psutil.cpu_times(percpu=True) off Linux),
+rather than psutil.cpu_percent(percpu=True), so it does not disturb the
+interval of other callers. Guest time is left out of the totals because the
+kernel already counts it in user and nice.
+
+NumPy is optional - without it the heatmap is disabled.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+import psutil
+
+from app.modules import procfs
+
+# Try to import numpy, but don't fail if not available
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES = ('mean', 'max')
+
+
+class CoreHeatmap:
+    """Ring buffer of per-core utilization with fixed-size grid queries"""
+
+    def __init__(self, retention: float = 6 * 3600, resolution: float = 1.0,
+                 cores: Optional[int] = None):
+        """
+        Initialize the heatmap
+
+        Args:
+            retention: Seconds of samples to keep
+            resolution: Expected seconds between samples (sizes the ring)
+            cores: Number of cores (detected when None)
+        """
+        self.cores = cores or psutil.cpu_count() or 1
+        self.capacity = int(math.ceil(retention / resolution))
+        self.values = np.zeros((self.cores, self.capacity), dtype=np.float32)
+        self.times = np.zeros(self.capacity, dtype=np.float64)
+        self.head = 0  # next write position
+        self.count = 0
+        self.previous = None  # last per-core (busy, total) seconds
+        self.lock = threading.Lock()
+
+    def _read_times(self):
+        """Per-core (busy, total) CPU seconds"""
+        times = np.array(procfs.percpu_times(), dtype=np.float64).reshape(-1, 2)
+        return times[:, 0], times[:, 1]
+
+    def sample(self, timestamp: Optional[float] = None):
+        """Read per-core times and append utilization since the previous sample"""
+        busy, total = self._read_times()
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            previous, self.previous = self.previous, (busy, total)
+            if previous is None or len(busy) != self.cores:
+                return None
+            elapsed = total - previous[1]
+            percent = np.divide(busy - previous[0], elapsed,
+                                out=np.zeros(self.cores), where=elapsed > 0) * 100
+            self.append(np.clip(percent, 0, 100), timestamp)
+            return percent
+
+    def append(self, percent, timestamp: float):
+        """Store one column of per-core utilization (caller holds the lock)"""
+        self.values[:, self.head] = percent
+        self.times[self.head] = timestamp
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def record_snapshot(self, snapshot):
+        """Sampler callback - sample per-core utilization"""
+        self.sample(snapshot.timestamp)
+
+    def _ordered(self):
+        """Stored samples oldest first (caller holds the lock)"""
+        if self.count < self.capacity:
+            return self.times[:self.count].copy(), self.values[:, :self.count].copy()
+        order = np.r_[self.head:self.capacity, 0:self.head]
+        return self.times[order], self.values[:, order]
+
+    def query(self, window: float, width: int = 120, aggregate: str = 'mean',
+              now: Optional[float] = None) -> dict:
+        """
+        Downsample a time window to a cores x width grid
+
+        Args:
+            window: Seconds of history
+            width: Number of time buckets
+            aggregate: "mean" or "max" per bucket
+            now: End of the window (defaults to the current time)
+
+        Returns:
+            Dict with bucket start timestamps and one row of values per core
+            (None for buckets without samples)
+        """
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}")
+        now = time.time() if now is None else now
+        start = now - window
+
+        with self.lock:
+            times, values = self._ordered()
+
+        first = np.searchsorted(times, start, side='left')
+        last = np.searchsorted(times, now, side='right')
+        times, values = times[first:last], values[:, first:last]
+
+        edges = start + window * np.arange(width) / width
+        grid = np.full((self.cores, width), np.nan, dtype=np.float64)
+        if len(times):
+            starts = np.searchsorted(times, edges, side='left')
+            counts = np.diff(np.append(starts, len(times)))
+            filled = counts > 0
+            # Reduce only non-empty buckets: their starts are strictly increasing,
+            # so each segment runs exactly to the next non-empty bucket
+            indices = starts[filled]
+            if aggregate == 'mean':
+                grid[:, filled] = np.add.reduceat(values, indices, axis=1) / counts[filled]
+            else:
+                grid[:, filled] = np.maximum.reduceat(values, indices, axis=1)
+
+        rows = np.round(grid, 1).tolist()
+        return {
+            'cores': self.cores,
+            'window': window,
+            'width': width,
+            'step': window / width,
+            'aggregate': aggregate,
+            'samples': int(len(times)),
+            'timestamps': np.round(edges, 3).tolist(),
+            'values': [[None if math.isnan(v) else v for v in row] for row in rows]
+        }
+
+
+# Global heatmap instance
+_heatmap: Optional[CoreHeatmap] = None
+
+
+def get_core_heatmap() -> Optional[CoreHeatmap]:
+    """Get the global per-core heatmap instance"""
+    return _heatmap
+
+
+def init_core_heatmap(retention: float = 6 * 3600, resolution: float = 1.0) -> Optional[CoreHeatmap]:
+    """Initialize the global per-core heatmap (None when numpy is missing)"""
+    global _heatmap
+
+    if not NUMPY_AVAILABLE:
+        logger.warning("numpy not available - per-core heatmap disabled")
+        return None
+
+    if _heatmap is not None:
+        logger.warning("Core heatmap already initialized")
+        return _heatmap
+
+    _heatmap = CoreHeatmap(retention, resolution)
+    return _heatmap
@@ -0,0 +1,208 @@
+"""Delta module - versioned payloads with changed-leaf patches
+
+Endpoints that are polled (stats, GPIO pins, MQTT devices) keep a
+DeltaTracker of their recent payloads. A client that passes the version it
+last saw (?since=<version>) gets only the leaf fields that changed since
+then, as JSON-patch-like operations:
+
+    {"op": "replace", "path": "/cpu/percent", "value": 12.5}
+    {"op": "remove", "path": "/devices/2"}
+
+Paths are JSON pointers. A list whose length changed is replaced as a whole
+rather than patched element by element. When the client's version is no
+longer in the tracker's window (too old, or from before a restart) the full
+payload is returned instead.
+
+Versions start at the process start time in milliseconds, so versions from
+an earlier process are never mistaken for current ones.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+_MISSING = object()
+
+
+def _escape(key) -> str:
+    """Escape a key for use in a JSON pointer"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def flatten(payload, prefix: str = '') -> Tuple[Dict[str, object], Dict[str, int]]:
+    """
+    Flatten a JSON-like payload
+
+    Returns:
+        Tuple of ({pointer: leaf value}, {pointer: list length})
+    """
+    leaves, lists = {}, {}
+
+    def walk(value, path):
+        if isinstance(value, dict) and value:
+            for key, item in value.items():
+                walk(item, f'{path}/{_escape(key)}')
+        elif isinstance(value, list) and value:
+            lists[path] = len(value)
+            for index, item in enumerate(value):
+                walk(item, f'{path}/{index}')
+        else:
+            if isinstance(value, list):
+                lists[path] = 0
+            leaves[path] = value
+
+    walk(payload, prefix)
+    return leaves, lists
+
+
+def resolve(payload, path: str):
+    """Get the value at a JSON pointer"""
+    value = payload
+    for part in path.split('/')[1:]:
+        part = part.replace('~1', '/').replace('~0', '~')
+        value = value[int(part)] if isinstance(value, list) else value[part]
+    return value
+
+
+def diff(old: tuple, new: tuple, payload) -> List[dict]:
+    """
+    Operations turning an old flattened payload into a new one
+
+    Args:
+        old: flatten() result of the base version
+        new: flatten() result of the new version
+        payload: The new payload (for whole-list replacements)
+    """
+    old_leaves, old_lists = old
+    new_leaves, new_lists = new
+
+    # Lists that changed length (or appeared) are replaced whole
+    replaced = sorted(path for path, length in new_lists.items()
+                      if old_lists.get(path) != length)
+    # Keep only the outermost replaced lists
+    outer = []
+    for path in replaced:
+        if not any(path.startswith(p + '/') for p in outer):
+            outer.append(path)
+
+    def covered(path):
+        return any(path == p or path.startswith(p + '/') for p in outer)
+
+    changes = [{'op': 'replace', 'path': path, 'value': resolve(payload, path)} for path in outer]
+    for path, value in new_leaves.items():
+        if covered(path):
+            continue
+        old_value = old_leaves.get(path, _MISSING)
+        if old_value is _MISSING or old_value != value or type(old_value) is not type(value):
+            changes.append({'op': 'replace', 'path': path, 'value': value})
+
+    # Every container that still exists in the new payload
+    present = set()
+    for path in list(new_leaves) + list(new_lists):
+        while path:
+            present.add(path)
+            path = path.rsplit('/', 1)[0]
+
+    removed = set()
+    for path in list(old_leaves) + list(old_lists):
+        if path in present or covered(path):
+            continue
+        # Remove the outermost container that no longer exists
+        parts = path.split('/')
+        for i in range(2, len(parts) + 1):
+            ancestor = '/'.join(parts[:i])
+            if ancestor not in present:
+                removed.add(ancestor)
+                break
+    changes.extend({'op': 'remove', 'path': path} for path in sorted(removed))
+    return changes
+
+
+class DeltaTracker:
+    """Keeps a window of recent versions of one endpoint's payload"""
+
+    def __init__(self, window: int = 32):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Versions kept for computing deltas
+        """
+        self.window = window
+        self.version = int(time.time() * 1000)
+        self.versions: 'OrderedDict[int, tuple]' = OrderedDict()
+        self.payload = None
+        self.key = None
+        self.lock = threading.Lock()
+
+    def update(self, payload, key=None) -> int:
+        """
+        Record the current payload
+
+        Args:
+            payload: Current JSON-like payload
+            key: Optional identity (e.g. snapshot timestamp) - an unchanged key skips the comparison
+
+        Returns:
+            Current version
+        """
+        with self.lock:
+            return self._update(payload, key)
+
+    def _update(self, payload, key) -> int:
+        """Record a payload (caller holds the lock)"""
+        if key is not None and key == self.key:
+            return self.version
+        flat = flatten(payload)
+        latest = self.versions.get(self.version)
+        if latest is None or latest != flat:
+            self.version += 1
+            self.versions[self.version] = flat
+            while len(self.versions) > self.window:
+                self.versions.popitem(last=False)
+        self.payload = payload
+        self.key = key
+        return self.version
+
+    def _changes_since(self, since: int) -> Optional[List[dict]]:
+        """Operations from a known version to the current one (caller holds the lock)"""
+        base = self.versions.get(since)
+        if base is None:
+            return None
+        if since == self.version:
+            return []
+        return diff(base, self.versions[self.version], self.payload)
+
+    def changes_since(self, since: int) -> Optional[List[dict]]:
+        """Operations from a known version to the current one (None when unknown)"""
+        with self.lock:
+            return self._changes_since(since)
+
+    def respond(self, payload, since: Optional[int] = None, key=None) -> dict:
+        """
+        Build a response body for a polling client
+
+        Returns:
+            {"version", "delta": True, "base", "changes"} when since is known,
+            otherwise the full payload plus "version" and "delta": False
+        """
+        with self.lock:
+            version = self._update(payload, key)
+            changes = self._changes_since(since) if since is not None else None
+        if changes is not None:
+            return {'version': version, 'delta': True, 'base': since, 'changes': changes}
+        return {**payload, 'version': version, 'delta': False}
+
+
+# Per-endpoint trackers
+_trackers: Dict[str, DeltaTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_delta_tracker(name: str) -> DeltaTracker:
+    """Get or create the tracker for an endpoint"""
+    with _trackers_lock:
+        tracker = _trackers.get(name)
+        if tracker is None:
+            tracker = _trackers[name] = DeltaTracker()
+        return tracker
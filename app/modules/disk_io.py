@@ -0,0 +1,161 @@
+"""Disk I/O module - per-device throughput, IOPS and latency from /proc/diskstats
+
+On a Pi the SD card is usually the bottleneck long before capacity is. This
+collector diffs /proc/diskstats between samples to get, for each whole block
+device (mmcblk0, sda, nvme0n1 - partitions and loop/ram devices skipped):
+
+- read/write bytes per second and IOPS
+- utilization (% of wall time with I/O in flight)
+- average queue depth (weighted time in queue / elapsed)
+- await (average ms per completed request, like iostat)
+
+The sampler drives it once per stats sample; throughput and utilization are
+recorded into metric history as disk.<dev>.read_rate, disk.<dev>.write_rate
+(bytes/s) and disk.<dev>.utilization (%), averaged to one sample per
+history_resolution seconds.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from app.modules.collectors import sample_interval
+
+logger = logging.getLogger(__name__)
+
+SECTOR_SIZE = 512  # /proc/diskstats always counts 512-byte sectors
+
+# Whole disks only - partitions, loop, ram and zram devices are skipped
+DEVICE_PATTERN = re.compile(r'^(mmcblk\d+|sd[a-z]+|nvme\d+n\d+|vd[a-z]+|hd[a-z]+)$')
+
+
+def parse_diskstats(text: str) -> Dict[str, tuple]:
+    """
+    Parse /proc/diskstats
+
+    Returns:
+        {device: (reads, sectors read, ms reading, writes, sectors written,
+                  ms writing, in flight, ms doing I/O, weighted ms)}
+    """
+    devices = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 14 or not DEVICE_PATTERN.match(fields[2]):
+            continue
+        values = [int(v) for v in fields[3:14]]
+        # reads, merged, sectors, ms, writes, merged, sectors, ms, in flight, io ms, weighted ms
+        devices[fields[2]] = (values[0], values[2], values[3], values[4], values[6],
+                              values[7], values[8], values[9], values[10])
+    return devices
+
+
+class DiskIOCollector:
+    """Computes per-device I/O rates and latency from /proc/diskstats deltas"""
+
+    def __init__(self, proc_path: str = '/proc', max_age: float = 2.0):
+        """
+        Initialize the collector
+
+        Args:
+            proc_path: procfs mount point (tests point this at a temp dir)
+            max_age: Seconds results are reused before stats() samples again
+        """
+        self.path = os.path.join(proc_path, 'diskstats')
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.counters: Dict[str, tuple] = {}
+        self.results: Dict[str, dict] = {}
+        self.sampled_at: Optional[float] = None  # monotonic time of the last sample
+        self.timestamp: Optional[float] = None  # epoch time of the last sample
+        self.history = None  # optional MetricHistory that receives rates
+        self.history_resolution = 10.0  # seconds per stored history sample (averaged)
+
+    def _read(self) -> Dict[str, tuple]:
+        try:
+            with open(self.path, 'r') as f:
+                return parse_diskstats(f.read())
+        except OSError as e:
+            logger.debug(f"Cannot read {self.path}: {e}")
+            return {}
+
+    def sample(self, now: Optional[float] = None) -> Dict[str, dict]:
+        """Read /proc/diskstats once and compute stats since the previous sample"""
+        now = time.monotonic() if now is None else now
+        current = self._read()
+
+        with self.lock:
+            elapsed, stale = sample_interval(self.sampled_at, now)
+            if stale:
+                return self.results  # older than the last sample: keep the newer state
+            results = {}
+            for device, values in current.items():
+                previous = self.counters.get(device)
+                if elapsed is None or previous is None:
+                    continue
+                delta = [c - p for c, p in zip(values, previous)]
+                if any(d < 0 for i, d in enumerate(delta) if i != 6):
+                    continue  # counters reset (device re-attached)
+                reads, sectors_read, ms_reading, writes, sectors_written, ms_writing = delta[:6]
+                io_ms, weighted_ms = delta[7], delta[8]
+                elapsed_ms = elapsed * 1000
+                completed = reads + writes
+
+                results[device] = {
+                    'read_bytes_per_sec': round(sectors_read * SECTOR_SIZE / elapsed, 1),
+                    'write_bytes_per_sec': round(sectors_written * SECTOR_SIZE / elapsed, 1),
+                    'read_iops': round(reads / elapsed, 2),
+                    'write_iops': round(writes / elapsed, 2),
+                    'utilization': round(min(io_ms / elapsed_ms * 100, 100.0), 1),
+                    'queue_depth': round(weighted_ms / elapsed_ms, 2),
+                    'await_ms': round((ms_reading + ms_writing) / completed, 2) if completed else 0.0,
+                    'read_await_ms': round(ms_reading / reads, 2) if reads else 0.0,
+                    'write_await_ms': round(ms_writing / writes, 2) if writes else 0.0,
+                    'in_flight': values[6]
+                }
+
+            self.counters = current
+            self.results = results
+            self.sampled_at = now
+            self.timestamp = time.time()
+            return results
+
+    def stats(self) -> Dict[str, dict]:
+        """Latest per-device stats, sampling only when they are older than max_age"""
+        if self.sampled_at is None:
+            # First use without the sampler: take a baseline for the delta
+            self.sample()
+            time.sleep(0.25)
+            return self.sample()
+        if time.monotonic() - self.sampled_at >= self.max_age:
+            return self.sample()
+        return self.results
+
+    def record_snapshot(self, snapshot):
+        """Sampler callback - sample diskstats and record rates into history"""
+        results = self.sample(snapshot.monotonic)
+        if self.history is None:
+            return
+        metrics = {}
+        for device, values in results.items():
+            metrics[f'disk.{device}.read_rate'] = values['read_bytes_per_sec']
+            metrics[f'disk.{device}.write_rate'] = values['write_bytes_per_sec']
+            metrics[f'disk.{device}.utilization'] = values['utilization']
+        if metrics:
+            self.history.record(metrics, snapshot.timestamp, self.history_resolution)
+
+
+# Global collector
+_collector: Optional[DiskIOCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_disk_io() -> DiskIOCollector:
+    """Get or create the global disk I/O collector"""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                _collector = DiskIOCollector()
+    return _collector
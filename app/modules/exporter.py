@@ -0,0 +1,243 @@
+"""Prometheus exporter module - OpenMetrics text rendered from collector state
+
+A scrape only reads state the collectors already keep: the sampler's latest
+stats snapshot, the raw counters held by the network and disk collectors, the
+MQTT device table and GPIO pin states. The rest are single in-process reads
+(/proc/stat, /proc/meminfo, statvfs, the VideoCore mailbox). Nothing forks and
+nothing calls out to the network, so scraping every few seconds is free.
+
+Counters are exported as raw totals (bytes, packets, CPU seconds) so
+Prometheus computes rates itself with rate()/irate().
+"""
+import logging
+import math
+import os
+import time
+from typing import Dict, List
+
+from app.modules import metrics_sampler, procfs, system_monitor, gpio_control, videocore
+from app.modules.net_rates import get_net_rates
+from app.modules.disk_io import get_disk_io, SECTOR_SIZE
+from app.modules.mqtt_tasmota import get_mqtt_client
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# sysfs network counter -> (metric direction, metric kind)
+NETWORK_COUNTERS = {
+    'rx_bytes': ('receive', 'bytes'), 'tx_bytes': ('transmit', 'bytes'),
+    'rx_packets': ('receive', 'packets'), 'tx_packets': ('transmit', 'packets'),
+    'rx_errors': ('receive', 'errors'), 'tx_errors': ('transmit', 'errors'),
+    'rx_dropped': ('receive', 'dropped'), 'tx_dropped': ('transmit', 'dropped')
+}
+DIRECTION_VERBS = {'receive': 'received', 'transmit': 'transmitted'}
+
+
+def _escape(value) -> str:
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class MetricFamily:
+    """One metric family and its samples"""
+
+    def __init__(self, name: str, metric_type: str, help_text: str, unit: str = ''):
+        """
+        Args:
+            name: Family name (counters without the _total suffix)
+            metric_type: "gauge" or "counter"
+            help_text: Description for the HELP line
+            unit: OpenMetrics unit - the name must end with it
+        """
+        self.name = name
+        self.type = metric_type
+        self.help = help_text
+        self.unit = unit
+        self.samples: List[tuple] = []
+
+    def add(self, value, **labels):
+        """Add a sample (None values are skipped)"""
+        if value is not None:
+            self.samples.append((labels, value))
+        return self
+
+    def render(self) -> str:
+        suffix = '_total' if self.type == 'counter' else ''
+        lines = [f'# TYPE {self.name} {self.type}']
+        if self.unit:
+            lines.append(f'# UNIT {self.name} {self.unit}')
+        lines.append(f'# HELP {self.name} {self.help}')
+        for labels, value in self.samples:
+            label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            name = self.name + suffix + (f'{{{label_text}}}' if label_text else '')
+            lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+def render(families: List[MetricFamily]) -> str:
+    """OpenMetrics exposition of the families that have samples"""
+    body = '\n'.join(family.render() for family in families if family.samples)
+    return body + '\n# EOF\n' if body else '# EOF\n'
+
+
+def _refresh(collector):
+    """Sample a counter collector if the sampler has not done so recently"""
+    if collector.sampled_at is None or time.monotonic() - collector.sampled_at >= collector.max_age:
+        collector.sample()
+
+
+def _system_families() -> List[MetricFamily]:
+    snapshot = metrics_sampler.get_snapshot('stats')
+    data = snapshot.data if snapshot else system_monitor.get_all_stats()
+    cpu = data.get('cpu', {})
+
+    usage = MetricFamily('pi_cpu_usage_ratio', 'gauge', 'CPU utilization (0-1) over the last sample', 'ratio')
+    if cpu.get('percent') is not None:
+        usage.add(cpu['percent'] / 100)
+    temperature = MetricFamily('pi_cpu_temperature_celsius', 'gauge', 'SoC temperature', 'celsius')
+    temperature.add(cpu.get('temperature'))
+    age = MetricFamily('pi_stats_snapshot_age_seconds', 'gauge',
+                       'Age of the sampled stats snapshot', 'seconds')
+    if snapshot is not None:
+        age.add(round(snapshot.age(), 3))
+
+    # Raw values the snapshot only carries rounded; track_cpu=False leaves the
+    # sampler's CPU percent interval alone
+    proc = procfs.sample(track_cpu=False)
+
+    cpu_seconds = MetricFamily('pi_cpu_seconds', 'counter', 'CPU time spent per mode', 'seconds')
+    for mode, value in procfs.cpu_times().items():
+        cpu_seconds.add(value, mode=mode)
+
+    load = MetricFamily('pi_load1', 'gauge', '1-minute load average')
+    load.add(proc.load1)
+
+    boot = MetricFamily('pi_boot_time_seconds', 'gauge', 'System boot time (epoch)', 'seconds')
+    boot.add(round(time.time() - proc.uptime))
+
+    mem_total = MetricFamily('pi_memory_total_bytes', 'gauge', 'Total physical memory', 'bytes')
+    mem_total.add(proc.mem_total)
+    mem_available = MetricFamily('pi_memory_available_bytes', 'gauge',
+                                 'Memory available without swapping', 'bytes')
+    mem_available.add(proc.mem_available)
+    mem_used = MetricFamily('pi_memory_used_bytes', 'gauge', 'Memory in use', 'bytes')
+    mem_used.add(proc.mem_used)
+
+    disk = os.statvfs('/')
+    fs_size = MetricFamily('pi_filesystem_size_bytes', 'gauge', 'Filesystem size', 'bytes')
+    fs_size.add(disk.f_blocks * disk.f_frsize, mountpoint='/')
+    fs_free = MetricFamily('pi_filesystem_free_bytes', 'gauge', 'Filesystem free space', 'bytes')
+    fs_free.add(disk.f_bavail * disk.f_frsize, mountpoint='/')
+
+    throttle_active = MetricFamily('pi_throttle_active', 'gauge', 'Throttle condition present now')
+    throttle_occurred = MetricFamily('pi_throttle_occurred', 'gauge',
+                                     'Throttle condition seen since boot')
+    throttled = videocore.get_telemetry().throttled()
+    if throttled is not None:
+        for flag, bit in videocore.THROTTLE_FLAGS.items():
+            throttle_active.add(bool(throttled & bit), flag=flag)
+            throttle_occurred.add(bool(throttled & bit << videocore.THROTTLE_OCCURRED_SHIFT), flag=flag)
+
+    return [usage, temperature, age, cpu_seconds, load, boot, mem_total, mem_available,
+            mem_used, fs_size, fs_free, throttle_active, throttle_occurred]
+
+
+def _network_families() -> List[MetricFamily]:
+    engine = get_net_rates()
+    _refresh(engine)
+    families: Dict[str, MetricFamily] = {}
+    with engine.lock:
+        counters = {iface: dict(values) for iface, values in engine.counters.items()}
+    for iface, values in sorted(counters.items()):
+        for counter, value in values.items():
+            direction, kind = NETWORK_COUNTERS[counter]
+            name = f'pi_network_{direction}_{kind}'
+            family = families.get(name)
+            if family is None:
+                family = families[name] = MetricFamily(
+                    name, 'counter', f'Network {kind} {DIRECTION_VERBS[direction]}',
+                    'bytes' if kind == 'bytes' else ''
+                )
+            family.add(value, interface=iface)
+    return list(families.values())
+
+
+def _disk_families() -> List[MetricFamily]:
+    collector = get_disk_io()
+    _refresh(collector)
+    read_bytes = MetricFamily('pi_disk_read_bytes', 'counter', 'Bytes read', 'bytes')
+    written_bytes = MetricFamily('pi_disk_written_bytes', 'counter', 'Bytes written', 'bytes')
+    reads = MetricFamily('pi_disk_reads_completed', 'counter', 'Reads completed')
+    writes = MetricFamily('pi_disk_writes_completed', 'counter', 'Writes completed')
+    io_time = MetricFamily('pi_disk_io_time_seconds', 'counter', 'Time spent doing I/O', 'seconds')
+    in_flight = MetricFamily('pi_disk_io_now', 'gauge', 'I/O requests in flight')
+    with collector.lock:
+        counters = dict(collector.counters)
+    for device, values in sorted(counters.items()):
+        reads.add(values[0], device=device)
+        read_bytes.add(values[1] * SECTOR_SIZE, device=device)
+        writes.add(values[3], device=device)
+        written_bytes.add(values[4] * SECTOR_SIZE, device=device)
+        in_flight.add(values[6], device=device)
+        io_time.add(values[7] / 1000, device=device)
+    return [read_bytes, written_bytes, reads, writes, io_time, in_flight]
+
+
+def _mqtt_families() -> List[MetricFamily]:
+    client = get_mqtt_client()
+    connected = MetricFamily('pi_mqtt_connected', 'gauge', 'Connected to the MQTT broker')
+    online = MetricFamily('pi_mqtt_device_online', 'gauge', 'Tasmota device reported online')
+    if client is not None:
+        connected.add(client.connected)
+        for device in client.get_devices():
+            online.add(device['online'], device=device['name'], topic=device['topic'])
+    return [connected, online]
+
+
+def _gpio_families() -> List[MetricFamily]:
+    state = MetricFamily('pi_gpio_pin_state', 'gauge', 'GPIO pin level (0=low, 1=high)')
+    for pin in gpio_control.get_all_pins():
+        state.add(pin['state'], pin=pin['id'], name=pin.get('name', ''),
+                  gpio=pin.get('gpio_number', ''))
+    return [state]
+
+
+# Sources rendered on each scrape; one failing source does not hide the others
+SOURCES = {
+    'system': _system_families,
+    'network': _network_families,
+    'disk': _disk_families,
+    'mqtt': _mqtt_families,
+    'gpio': _gpio_families
+}
+
+
+def collect() -> str:
+    """Render all metrics as OpenMetrics text"""
+    started = time.perf_counter()
+    families = []
+    up = MetricFamily('pi_exporter_source_up', 'gauge', 'Source rendered without error')
+    for name, source in SOURCES.items():
+        try:
+            families.extend(source())
+            up.add(1, source=name)
+        except Exception as e:
+            logger.error(f"Metrics source {name} failed: {e}")
+            up.add(0, source=name)
+    duration = MetricFamily('pi_exporter_render_seconds', 'gauge',
+                            'Time spent rendering this scrape', 'seconds')
+    duration.add(round(time.perf_counter() - started, 6))
+    return render(families + [up, duration])
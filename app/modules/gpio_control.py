@@ -27,6 +27,8 @@ class GPIOController:
         self.chip = None
         self.request = None
         self.pin_offsets = {}  # Map pin_id to GPIO number
+        self.version = 0  # Bumped on every state change (used for ETags)
+        self.instance = os.urandom(4).hex()  # Tells ETags of a re-created controller apart
         
         if GPIOD_AVAILABLE:
             self._initialize_gpio()
@@ -155,6 +157,7 @@ class GPIOController:
         if not GPIOD_AVAILABLE or self.request is None:
             # Simulation mode
             self.simulated_states[pin_id] = state
+            self.version += 1
             logger.debug(f"[SIMULATION] Set {pin_id} (GPIO {pin_config['gpio_number']}) to {state}")
             return True
         
@@ -163,6 +166,7 @@ class GPIOController:
                 gpio_num = self.pin_offsets[pin_id]
                 value = Value.ACTIVE if state == 1 else Value.INACTIVE
                 self.request.set_value(gpio_num, value)
+                self.version += 1
                 logger.info(f"Set {pin_id} (GPIO {gpio_num}) to {'HIGH' if state == 1 else 'LOW'}")
                 return True
             else:
@@ -0,0 +1,251 @@
+"""Outbound HTTP client module - pooled session with scheduled, persisted lookups
+
+External lookups (weather, public IP) go through one requests.Session so
+connections and TLS sessions are reused. Each lookup is a RemoteResource that
+a background thread refreshes on its own interval; the last good value is
+written to disk and loaded again at startup, so pages answer instantly after
+a restart even while the network is down.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 5)
+
+# Wait before retrying a failed lookup (seconds)
+RETRY_BACKOFF = 60
+
+
+class RemoteResource:
+    """A remote JSON document refreshed on a schedule, with the last good value kept"""
+
+    def __init__(self, client: 'HttpClient', name: str, url: str, parse: Callable,
+                 interval: float, headers: Optional[dict] = None):
+        """
+        Initialize the resource
+
+        Args:
+            client: Owning HttpClient
+            name: Resource name (also the persisted file name)
+            url: URL returning JSON
+            parse: Function turning the JSON document into the stored value
+            interval: Seconds between refreshes
+            headers: Extra request headers
+        """
+        self.client = client
+        self.name = name
+        self.url = url
+        self.parse = parse
+        self.interval = interval
+        self.headers = headers or {}
+        self.value = None
+        self.fetched_at: Optional[float] = None  # epoch time of the last good value
+        self.next_due = 0.0  # monotonic time of the next refresh
+        self.last_error: Optional[str] = None
+        self.lock = threading.Lock()
+        self._load()
+
+    @property
+    def path(self) -> Optional[str]:
+        if self.client.cache_dir is None:
+            return None
+        return os.path.join(self.client.cache_dir, f'{self.name}.json')
+
+    def _load(self):
+        """Load the persisted last good value"""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+            self.value = saved['value']
+            self.fetched_at = saved['fetched_at']
+            # Refresh right away if the saved value is already older than the interval
+            self.next_due = time.monotonic() + max(0, self.interval - (time.time() - self.fetched_at))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable {self.path}: {e}")
+
+    def _save(self):
+        """Persist the last good value (atomic replace)"""
+        if self.path is None:
+            return
+        try:
+            os.makedirs(self.client.cache_dir, exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'value': self.value, 'fetched_at': self.fetched_at}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist {self.name}: {e}")
+
+    def is_due(self) -> bool:
+        return time.monotonic() >= self.next_due
+
+    def refresh(self) -> bool:
+        """Fetch now; returns True when a new value was stored"""
+        with self.lock:
+            try:
+                response = self.client.get(self.url, headers=self.headers)
+                response.raise_for_status()
+                value = self.parse(response.json())
+            except Exception as e:
+                self.last_error = str(e)
+                self.next_due = time.monotonic() + min(self.interval, RETRY_BACKOFF)
+                logger.warning(f"Refreshing {self.name} failed: {e}")
+                return False
+
+            changed = value != self.value
+            self.value = value
+            self.fetched_at = time.time()
+            self.last_error = None
+            self.next_due = time.monotonic() + self.interval
+            if changed:
+                self._save()
+            return True
+
+    def get(self):
+        """
+        Get the last good value
+
+        Fetches inline only when there is no value yet, or when no background
+        refresher is running and the value is due.
+        """
+        if self.is_due() and (self.value is None or not self.client.running):
+            self.refresh()
+        return self.value
+
+    def status(self) -> dict:
+        """Age and error information for API responses"""
+        return {
+            'fetched_at': self.fetched_at,
+            'age': round(time.time() - self.fetched_at, 1) if self.fetched_at else None,
+            'stale': self.fetched_at is None or time.time() - self.fetched_at > self.interval * 2,
+            'error': self.last_error
+        }
+
+
+class HttpClient:
+    """Shared requests session plus the background refresher for remote resources"""
+
+    def __init__(self, cache_dir: Optional[str] = None, pool_size: int = 4, retries: int = 2,
+                 timeout=DEFAULT_TIMEOUT):
+        """
+        Initialize the client
+
+        Args:
+            cache_dir: Directory for persisted values (None disables persistence)
+            pool_size: Connections kept open per host
+            retries: Retries for connection errors and 5xx responses
+            timeout: Default (connect, read) timeout
+        """
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.resources: Dict[str, RemoteResource] = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.wakeup = threading.Event()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the pooled session with the default timeout"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def register(self, name: str, url: str, parse: Callable, interval: float,
+                 headers: Optional[dict] = None) -> RemoteResource:
+        """Register a remote resource (returns the existing one if already registered)"""
+        with self.lock:
+            resource = self.resources.get(name)
+            if resource is None:
+                resource = RemoteResource(self, name, url, parse, interval, headers)
+                self.resources[name] = resource
+                self.wakeup.set()
+            return resource
+
+    def resource(self, name: str) -> Optional[RemoteResource]:
+        return self.resources.get(name)
+
+    def start(self):
+        """Start refreshing registered resources in the background"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='http-refresh', daemon=True)
+        self.thread.start()
+        logger.info(f"HTTP refresher started ({len(self.resources)} resources)")
+
+    def stop(self):
+        """Stop the refresher and close pooled connections"""
+        self.running = False
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+        self.session.close()
+
+    def _run(self):
+        """Refresh each resource when it is due"""
+        while self.running:
+            for resource in list(self.resources.values()):
+                if not self.running:
+                    return
+                if resource.is_due():
+                    resource.refresh()
+
+            now = time.monotonic()
+            next_due = min((r.next_due for r in self.resources.values()), default=now + 60)
+            self.wakeup.wait(timeout=min(max(next_due - now, 0.1), 60))
+            self.wakeup.clear()
+
+
+# Global client instance
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the global client (an unpersisted one is created if not initialized)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def init_http_client(cache_dir: Optional[str] = None, pool_size: int = 4) -> HttpClient:
+    """Initialize the global client (call start() after registering resources)"""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            logger.warning("HTTP client already initialized")
+            return _client
+        _client = HttpClient(cache_dir=cache_dir, pool_size=pool_size)
+        return _client
+
+
+def shutdown_http_client():
+    """Stop the global client"""
+    global _client
+
+    if _client is not None:
+        _client.stop()
+        _client = None
@@ -0,0 +1,413 @@
+"""Metric archive module - persistent round-robin (RRD-style) metric store
+
+The archive is a single fixed-size file that is memory-mapped and updated in
+place. Each metric has one round-robin table per tier (e.g. 1s for 1h, 1m for
+7d, 15m for 1y) holding consolidated (avg, min, max) rows. Rows roll from a
+tier into the next coarser one as their buckets close.
+
+To keep SD card wear low, closed rows are buffered in memory and written to
+the map in one batch every flush interval, followed by a single msync.
+
+File layout:
+    header   magic, version, tier table, metric names, first/last bucket per table
+    data     max_metrics blocks, each holding every tier's rows back to back
+"""
+import atexit
+import fcntl
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PIRRD\x00\x00\x01'
+VERSION = 1
+NAME_SIZE = 48
+ROW = struct.Struct('<fff')  # avg, min, max
+BUCKET = struct.Struct('<I')
+HEADER = struct.Struct('<8sIII')  # magic, version, max_metrics, tier_count
+TIER = struct.Struct('<II')  # step seconds, rows
+
+# Default tiers: (step seconds, rows) - 1s for 1h, 1m for 7d, 15m for 1y
+DEFAULT_TIERS = ((1, 3600), (60, 7 * 24 * 60), (900, 365 * 24 * 4))
+
+NAN = float('nan')
+
+
+class _Accumulator:
+    """Consolidates rows of one tier into the current bucket of the next"""
+
+    __slots__ = ('bucket', 'total', 'count', 'low', 'high')
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.total = 0.0
+        self.count = 0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, avg: float, low: float, high: float):
+        if math.isnan(avg):
+            return
+        self.total += avg
+        self.count += 1
+        self.low = min(self.low, low)
+        self.high = max(self.high, high)
+
+    def row(self) -> Tuple[float, float, float]:
+        if not self.count:
+            return NAN, NAN, NAN
+        return self.total / self.count, self.low, self.high
+
+
+class MetricArchive:
+    """Fixed-size, memory-mapped multi-resolution metric store"""
+
+    def __init__(self, path: str, tiers=DEFAULT_TIERS, max_metrics: int = 64,
+                 flush_interval: float = 60.0):
+        """
+        Open (or create) a metric archive
+
+        Args:
+            path: Archive file path
+            tiers: Sequence of (step seconds, rows), finest first
+            max_metrics: Number of metric slots reserved in the file
+            flush_interval: Seconds between batched writes to the file
+        """
+        self.path = path
+        self.tiers = tuple((int(step), int(rows)) for step, rows in tiers)
+        self.max_metrics = max_metrics
+        self.flush_interval = flush_interval
+
+        # Layout
+        self.tier_offsets = []
+        offset = 0
+        for _, rows in self.tiers:
+            self.tier_offsets.append(offset)
+            offset += rows * ROW.size
+        self.metric_block = offset
+        self.names_offset = HEADER.size + TIER.size * len(self.tiers)
+        self.first_offset = self.names_offset + NAME_SIZE * max_metrics
+        self.last_offset = self.first_offset + BUCKET.size * max_metrics * len(self.tiers)
+        header_size = self.last_offset + BUCKET.size * max_metrics * len(self.tiers)
+        self.data_offset = -(-header_size // mmap.PAGESIZE) * mmap.PAGESIZE
+        self.file_size = self.data_offset + self.metric_block * max_metrics
+
+        self.slots: Dict[str, int] = {}
+        self.accumulators: Dict[Tuple[int, int], _Accumulator] = {}
+        self.pending: Dict[Tuple[int, int, int], Tuple[float, float, float]] = {}
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self._full_warned = False
+
+        self._open()
+        logger.info(f"Metric archive opened: {path} ({self.file_size // 1024}KB, "
+                    f"{len(self.slots)}/{max_metrics} metrics)")
+
+    def _open(self):
+        """Open the file, creating or recreating it if the layout changed"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Only one process may write the archive: a second one (another gunicorn
+            # worker, or a second create_app in the same host) runs without it
+            fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self.fd)
+            raise RuntimeError(f"Metric archive {self.path} is in use by another process")
+
+        if not self._header_matches():
+            if os.fstat(self.fd).st_size:
+                logger.warning(f"Metric archive layout changed, recreating {self.path}")
+            os.ftruncate(self.fd, 0)
+            os.ftruncate(self.fd, self.file_size)  # sparse, allocated as rows are written
+            self._write_header()
+
+        self.map = mmap.mmap(self.fd, self.file_size)
+        for slot in range(self.max_metrics):
+            raw = self.map[self.names_offset + slot * NAME_SIZE:
+                           self.names_offset + (slot + 1) * NAME_SIZE]
+            name = raw.rstrip(b'\x00').decode('utf-8', 'replace')
+            if name:
+                self.slots[name] = slot
+
+    def _header_matches(self) -> bool:
+        """Check the on-disk header against the configured layout"""
+        if os.fstat(self.fd).st_size != self.file_size:
+            return False
+        raw = os.pread(self.fd, self.names_offset, 0)
+        magic, version, max_metrics, tier_count = HEADER.unpack_from(raw)
+        if (magic, version, max_metrics, tier_count) != (MAGIC, VERSION, self.max_metrics, len(self.tiers)):
+            return False
+        tiers = tuple(TIER.unpack_from(raw, HEADER.size + i * TIER.size) for i in range(tier_count))
+        return tiers == self.tiers
+
+    def _write_header(self):
+        """Write the file header (only on creation)"""
+        header = bytearray(self.names_offset)
+        HEADER.pack_into(header, 0, MAGIC, VERSION, self.max_metrics, len(self.tiers))
+        for i, (step, rows) in enumerate(self.tiers):
+            TIER.pack_into(header, HEADER.size + i * TIER.size, step, rows)
+        os.pwrite(self.fd, bytes(header), 0)
+
+    def _slot(self, name: str) -> Optional[int]:
+        """Get or allocate the slot for a metric (caller holds the lock)"""
+        slot = self.slots.get(name)
+        if slot is not None:
+            return slot
+        if len(self.slots) >= self.max_metrics:
+            if not self._full_warned:
+                logger.warning(f"Metric archive full ({self.max_metrics} metrics), not archiving {name}")
+                self._full_warned = True
+            return None
+
+        slot = len(self.slots)
+        encoded = name.encode('utf-8')[:NAME_SIZE]
+        start = self.names_offset + slot * NAME_SIZE
+        self.map[start:start + NAME_SIZE] = encoded.ljust(NAME_SIZE, b'\x00')
+        self.slots[name] = slot
+        return slot
+
+    def _bucket_pos(self, offset: int, slot: int, tier: int) -> int:
+        return offset + (slot * len(self.tiers) + tier) * BUCKET.size
+
+    def _row_pos(self, slot: int, tier: int, bucket: int) -> int:
+        rows = self.tiers[tier][1]
+        return (self.data_offset + slot * self.metric_block + self.tier_offsets[tier]
+                + (bucket % rows) * ROW.size)
+
+    def record(self, metrics: Dict[str, Optional[float]], timestamp: Optional[float] = None):
+        """Record one sample for each metric in a {name: value} dict"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            for name, value in metrics.items():
+                slot = self._slot(name)
+                if slot is None:
+                    continue
+                value = NAN if value is None else float(value)
+                self._add(slot, 0, int(timestamp) // self.tiers[0][0], value, value, value)
+
+            if time.monotonic() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def _add(self, slot: int, tier: int, bucket: int, avg: float, low: float, high: float):
+        """Feed a row into a tier's open bucket, rolling closed buckets upward"""
+        acc = self.accumulators.get((slot, tier))
+        if acc is None:
+            acc = self.accumulators[(slot, tier)] = _Accumulator(bucket)
+        elif bucket != acc.bucket:
+            self._close(slot, tier, acc)
+            acc = self.accumulators[(slot, tier)] = _Accumulator(bucket)
+        acc.add(avg, low, high)
+
+    def _close(self, slot: int, tier: int, acc: _Accumulator):
+        """Queue a finished bucket for writing and consolidate it into the next tier"""
+        row = acc.row()
+        self.pending[(slot, tier, acc.bucket)] = row
+        if tier + 1 < len(self.tiers):
+            step, next_step = self.tiers[tier][0], self.tiers[tier + 1][0]
+            self._add(slot, tier + 1, acc.bucket * step // next_step, *row)
+
+    def _flush(self):
+        """Write pending rows into the map in place and sync once (caller holds the lock)"""
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+
+        for (slot, tier, bucket) in sorted(self.pending):
+            rows = self.tiers[tier][1]
+            pos = self._bucket_pos(self.last_offset, slot, tier)
+            last = BUCKET.unpack_from(self.map, pos)[0]
+            if not last:
+                # First row of this table - rows before it were never written
+                BUCKET.pack_into(self.map, self._bucket_pos(self.first_offset, slot, tier), bucket)
+            elif bucket <= last - rows:
+                continue  # older than the table covers
+            # Blank out buckets skipped while nothing was recorded
+            if last and bucket > last + 1:
+                for missing in range(max(last + 1, bucket - rows + 1), bucket):
+                    ROW.pack_into(self.map, self._row_pos(slot, tier, missing), NAN, NAN, NAN)
+            ROW.pack_into(self.map, self._row_pos(slot, tier, bucket), *self.pending[(slot, tier, bucket)])
+            if bucket > last:
+                BUCKET.pack_into(self.map, pos, bucket)
+
+        self.pending.clear()
+        self.map.flush()
+
+    def flush(self):
+        """Write pending rows to disk now"""
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        """Write open buckets and pending rows, then release the file"""
+        with self.lock:
+            if self.map.closed:
+                return
+            # Keep partially filled buckets - they are overwritten if the bucket continues after restart
+            for (slot, tier), acc in self.accumulators.items():
+                self.pending[(slot, tier, acc.bucket)] = acc.row()
+            self.accumulators.clear()
+            self._flush()
+            self.map.close()
+            os.close(self.fd)
+
+    def metrics(self) -> List[str]:
+        """Names of all archived metrics"""
+        return sorted(self.slots)
+
+    def pick_tier(self, window: float) -> int:
+        """Finest tier whose retention covers the window"""
+        for tier, (step, rows) in enumerate(self.tiers):
+            if step * rows >= window:
+                return tier
+        return len(self.tiers) - 1
+
+    def fetch(self, name: str, start: float, end: Optional[float] = None,
+              tier: Optional[int] = None) -> Optional[dict]:
+        """
+        Read consolidated rows for a metric
+
+        Args:
+            name: Metric name
+            start: Epoch seconds of the first row
+            end: Epoch seconds of the last row (default: now)
+            tier: Tier index to read (default: finest tier covering the range)
+
+        Returns:
+            Dict with step, timestamps, avg, min and max lists, or None if unknown
+        """
+        end = time.time() if end is None else end
+        with self.lock:
+            slot = self.slots.get(name)
+            if slot is None:
+                return None
+            if tier is None:
+                tier = self.pick_tier(end - start)
+            step, rows = self.tiers[tier]
+
+            first = BUCKET.unpack_from(self.map, self._bucket_pos(self.first_offset, slot, tier))[0]
+            last = BUCKET.unpack_from(self.map, self._bucket_pos(self.last_offset, slot, tier))[0]
+            pending = {bucket: row for (s, t, bucket), row in self.pending.items()
+                       if s == slot and t == tier}
+            if pending:
+                first = first or min(pending)
+                last = max(last, max(pending))
+
+            first_bucket = max(int(start) // step, last - rows + 1, first)
+            last_bucket = min(int(end) // step, last)
+
+            timestamps, avgs, lows, highs = [], [], [], []
+            for bucket in range(first_bucket, last_bucket + 1):
+                row = pending.get(bucket)
+                if row is None:
+                    row = ROW.unpack_from(self.map, self._row_pos(slot, tier, bucket))
+                if math.isnan(row[0]):
+                    continue
+                timestamps.append(bucket * step)
+                avgs.append(row[0])
+                lows.append(row[1])
+                highs.append(row[2])
+
+        return {
+            'metric': name,
+            'step': step,
+            'timestamps': timestamps,
+            'avg': avgs,
+            'min': lows,
+            'max': highs
+        }
+
+    def query(self, name: str, window: float, max_points: int = 0) -> Optional[dict]:
+        """
+        Get a metric's consolidated history over a time window
+
+        Same shape as MetricHistory.query(), plus min/max per point.
+        """
+        now = time.time()
+        rows = self.fetch(name, now - window, now)
+        if rows is None:
+            return None
+
+        timestamps, avgs, lows, highs = rows['timestamps'], rows['avg'], rows['min'], rows['max']
+        resolution = rows['step']
+        if max_points and len(timestamps) > max_points:
+            resolution = max(resolution, window / max_points)
+            timestamps, avgs, lows, highs = _consolidate(
+                timestamps, avgs, lows, highs, now - window, resolution)
+
+        return {
+            'metric': name,
+            'window': window,
+            'resolution': round(resolution, 3),
+            'count': len(timestamps),
+            'timestamps': timestamps,
+            'values': [round(v, 2) for v in avgs],
+            'min': [round(v, 2) for v in lows],
+            'max': [round(v, 2) for v in highs]
+        }
+
+
+def _consolidate(timestamps, avgs, lows, highs, start: float, bucket: float):
+    """Merge rows into fixed-width time buckets (avg of avgs, min of mins, max of maxes)"""
+    out = ([], [], [], [])
+    current = None
+    for ts, avg, low, high in zip(timestamps, avgs, lows, highs):
+        index = int((ts - start) // bucket)
+        if index != current:
+            if current is not None:
+                out[0].append(round(start + (current + 0.5) * bucket, 1))
+                out[1].append(acc.row()[0])
+                out[2].append(acc.low)
+                out[3].append(acc.high)
+            current, acc = index, _Accumulator(index)
+        acc.add(avg, low, high)
+    if current is not None:
+        out[0].append(round(start + (current + 0.5) * bucket, 1))
+        out[1].append(acc.row()[0])
+        out[2].append(acc.low)
+        out[3].append(acc.high)
+    return out
+
+
+# Global archive instance
+_archive: Optional[MetricArchive] = None
+
+
+def get_archive() -> Optional[MetricArchive]:
+    """Get the global metric archive instance"""
+    return _archive
+
+
+def init_archive(path: str, tiers=DEFAULT_TIERS, max_metrics: int = 64,
+                 flush_interval: float = 60.0) -> Optional[MetricArchive]:
+    """Open the global metric archive (returns None if it cannot be opened)"""
+    global _archive
+
+    if _archive is not None:
+        logger.warning("Metric archive already initialized")
+        return _archive
+
+    try:
+        _archive = MetricArchive(path, tiers, max_metrics, flush_interval)
+    except Exception as e:
+        logger.error(f"Metric archive disabled: {e}")
+        return None
+
+    # Flush on worker exit (gunicorn max_requests recycling, shutdown)
+    atexit.register(shutdown_archive)
+    return _archive
+
+
+def shutdown_archive():
+    """Flush and close the global metric archive"""
+    global _archive
+
+    if _archive is not None:
+        _archive.close()
+        _archive = None
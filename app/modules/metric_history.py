@@ -0,0 +1,329 @@
+"""Metric history module - compact in-memory ring buffers for metric trends
+
+Each metric is stored in two fixed-size arrays (float32 values and uint32
+timestamps in tenths of a second), so a sample costs 8 bytes and no Python
+objects are kept per sample. 24h at 1s resolution is ~690KB per metric.
+
+Metrics whose number grows with the hardware (per interface, disk or
+service) are registered with a coarser resolution: their buffer averages the
+samples of each slot into one, so 24h at 10s is ~69KB per metric.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Metrics recorded from each quick stats snapshot (dotted paths into get_all_stats())
+TRACKED_METRICS = (
+    'cpu.percent',
+    'cpu.temperature',
+    'memory.percent',
+    'memory.used',
+    'disk.percent',
+    'disk.used',
+)
+
+_DURATION_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([smhd]?)$')
+_DURATION_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a duration such as "90", "30s", "15m", "1h" or "7d" into seconds
+
+    Raises:
+        ValueError: If the value is not a valid positive duration
+    """
+    match = _DURATION_RE.match(str(value).strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    seconds = float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: {value}")
+    return seconds
+
+
+def flatten_stats(stats: dict, prefix: str = '') -> Dict[str, float]:
+    """Flatten nested stats into {"cpu.percent": 12.5, ...} (numeric leaves only)"""
+    flat = {}
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_stats(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+class RingBuffer:
+    """Fixed-size ring of (timestamp, value) samples backed by arrays"""
+
+    __slots__ = ('capacity', 'base_time', 'times', 'values', 'head', 'count',
+                 'resolution', 'slot', 'slot_sum', 'slot_count')
+
+    def __init__(self, capacity: int, base_time: float, resolution: Optional[float] = None):
+        """
+        Initialize a ring buffer
+
+        Args:
+            capacity: Maximum number of samples kept
+            base_time: Epoch time that stored timestamps are relative to
+            resolution: Average samples into one per this many seconds
+                (None stores every sample as it arrives)
+        """
+        self.capacity = capacity
+        self.base_time = base_time
+        self.times = array('I', bytes(4 * capacity))  # deciseconds since base_time
+        self.values = array('f', bytes(4 * capacity))
+        self.head = 0  # next write position
+        self.count = 0
+        self.resolution = resolution
+        self.slot = None  # slot being averaged (timestamp // resolution)
+        self.slot_sum = 0.0
+        self.slot_count = 0
+
+    def append(self, timestamp: float, value: Optional[float]):
+        """Add a sample, overwriting the oldest one when full"""
+        if self.resolution is None:
+            self._store(timestamp, value)
+            return
+        slot = int(timestamp // self.resolution)
+        if slot != self.slot:
+            if self.slot is not None:
+                # Slot complete: store its mean, stamped with the slot start
+                mean = self.slot_sum / self.slot_count if self.slot_count else None
+                self._store(self.slot * self.resolution, mean)
+            self.slot, self.slot_sum, self.slot_count = slot, 0.0, 0
+        if value is not None and not math.isnan(value):
+            self.slot_sum += value
+            self.slot_count += 1
+
+    def _store(self, timestamp: float, value: Optional[float]):
+        self.times[self.head] = max(0, int((timestamp - self.base_time) * 10))
+        self.values[self.head] = math.nan if value is None else value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _physical(self, index: int) -> int:
+        """Map a logical index (0 = oldest) to a position in the arrays"""
+        return (self.head - self.count + index) % self.capacity
+
+    def _first_index_since(self, ticks: int) -> int:
+        """Binary search for the oldest logical index with time >= ticks"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[self._physical(mid)] < ticks:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def since(self, timestamp: float):
+        """
+        Get samples taken at or after a time
+
+        Returns:
+            Tuple of (timestamps, values) arrays in chronological order
+        """
+        ticks = max(0, int((timestamp - self.base_time) * 10))
+        first = self._first_index_since(ticks)
+        n = self.count - first
+        if n <= 0:
+            return array('I'), array('f')
+
+        start = self._physical(first)
+        end = start + n
+        if end <= self.capacity:
+            return self.times[start:end], self.values[start:end]
+        end -= self.capacity
+        return (self.times[start:] + self.times[:end],
+                self.values[start:] + self.values[:end])
+
+    def oldest_time(self) -> Optional[float]:
+        """Epoch time of the oldest sample kept (None if empty)"""
+        if not self.count:
+            return None
+        return self.base_time + self.times[self._physical(0)] / 10
+
+    def memory_bytes(self) -> int:
+        """Bytes used by the sample arrays"""
+        return (self.times.itemsize + self.values.itemsize) * self.capacity
+
+
+class MetricHistory:
+    """Per-metric ring buffers fed by the metrics sampler"""
+
+    def __init__(self, retention: float = 86400, resolution: float = 1.0):
+        """
+        Initialize metric history
+
+        Args:
+            retention: Seconds of history to keep per metric
+            resolution: Expected seconds between samples (sizes the buffers)
+        """
+        self.retention = retention
+        self.resolution = resolution
+        self.capacity = int(math.ceil(retention / resolution))
+        self.base_time = time.time()
+        self.buffers: Dict[str, RingBuffer] = {}
+        self.lock = threading.Lock()
+        self.archive = None  # optional MetricArchive that also receives every sample
+        self.alerts = None  # optional AlertEngine that evaluates every sample
+
+        logger.info(f"Metric history initialized ({self.capacity} samples per metric)")
+
+    def register(self, name: str, resolution: Optional[float] = None) -> RingBuffer:
+        """
+        Register a metric (record() does this automatically)
+
+        Args:
+            name: Dotted metric name (e.g., "cpu.temperature")
+            resolution: Seconds between stored samples for this metric (defaults to
+                history resolution); samples arriving faster are averaged per slot
+        """
+        with self.lock:
+            return self._buffer(name, resolution)
+
+    def _buffer(self, name: str, resolution: Optional[float] = None) -> RingBuffer:
+        """Get or create a metric's ring buffer (caller holds the lock)"""
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            if resolution and resolution > self.resolution:
+                capacity = int(math.ceil(self.retention / resolution))
+                buffer = RingBuffer(capacity, self.base_time, resolution)
+            else:
+                buffer = RingBuffer(self.capacity, self.base_time)
+            self.buffers[name] = buffer
+        return buffer
+
+    def record(self, metrics: Dict[str, Optional[float]], timestamp: Optional[float] = None,
+               resolution: Optional[float] = None):
+        """
+        Record one sample for each metric in a {name: value} dict
+
+        Args:
+            metrics: {name: value} (None for a missing value)
+            timestamp: Epoch time of the sample (now if omitted)
+            resolution: Resolution for metrics seen for the first time (see register())
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            for name, value in metrics.items():
+                self._buffer(name, resolution).append(timestamp, value)
+        if self.archive is not None:
+            self.archive.record(metrics, timestamp)
+        if self.alerts is not None:
+            self.alerts.record(metrics, timestamp)
+
+    def record_snapshot(self, snapshot):
+        """Sampler callback - record tracked metrics from a quick stats snapshot"""
+        flat = flatten_stats(snapshot.data)
+        self.record({name: flat.get(name) for name in TRACKED_METRICS}, snapshot.timestamp)
+
+    def metrics(self) -> List[str]:
+        """Names of all recorded metrics"""
+        with self.lock:
+            return sorted(self.buffers)
+
+    def covers(self, name: str, window: float) -> bool:
+        """Check if in-memory samples reach back over the whole window"""
+        buffer = self.buffers.get(name)
+        if buffer is None or window > self.retention:
+            return False
+        with self.lock:
+            oldest = buffer.oldest_time()
+        resolution = buffer.resolution or self.resolution
+        return oldest is not None and oldest <= time.time() - window + 2 * resolution
+
+    def query(self, name: str, window: float, max_points: int = 0) -> Optional[dict]:
+        """
+        Get a metric's samples over a time window
+
+        Args:
+            name: Metric name
+            window: Seconds of history to return
+            max_points: Average into at most this many time buckets (0 = raw samples)
+
+        Returns:
+            Dict with timestamps and values lists, or None if the metric is unknown
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            return None
+
+        now = time.time()
+        with self.lock:
+            ticks, values = buffer.since(now - window)
+
+        timestamps = [round(self.base_time + t / 10, 1) for t in ticks]
+        resolution = buffer.resolution or self.resolution
+        if max_points and len(timestamps) > max_points:
+            bucket = window / max_points
+            timestamps, values = _downsample(timestamps, values, now - window, bucket)
+            resolution = bucket
+
+        return {
+            'metric': name,
+            'window': window,
+            'resolution': round(resolution, 3),
+            'count': len(timestamps),
+            'timestamps': timestamps,
+            'values': [None if math.isnan(v) else round(v, 2) for v in values]
+        }
+
+    def memory_bytes(self) -> int:
+        """Total bytes used by all ring buffers"""
+        return sum(buffer.memory_bytes() for buffer in self.buffers.values())
+
+
+def _downsample(timestamps, values, start: float, bucket: float):
+    """Average samples into fixed-width time buckets (NaN samples are skipped)"""
+    out_times, out_values = [], []
+    current = None
+    total = 0.0
+    n = 0
+    for ts, value in zip(timestamps, values):
+        index = int((ts - start) // bucket)
+        if index != current:
+            if current is not None:
+                out_times.append(round(start + (current + 0.5) * bucket, 1))
+                out_values.append(total / n if n else math.nan)
+            current, total, n = index, 0.0, 0
+        if not math.isnan(value):
+            total += value
+            n += 1
+    if current is not None:
+        out_times.append(round(start + (current + 0.5) * bucket, 1))
+        out_values.append(total / n if n else math.nan)
+    return out_times, out_values
+
+
+# Global history instance
+_history: Optional[MetricHistory] = None
+
+
+def get_history() -> Optional[MetricHistory]:
+    """Get the global metric history instance"""
+    return _history
+
+
+def init_history(retention: float = 86400, resolution: float = 1.0) -> MetricHistory:
+    """Initialize the global metric history"""
+    global _history
+
+    if _history is not None:
+        logger.warning("Metric history already initialized")
+        return _history
+
+    _history = MetricHistory(retention, resolution)
+    return _history
@@ -0,0 +1,226 @@
+"""Background metrics sampler - collects system stats on a fixed cadence
+
+Request handlers read the latest snapshot instead of calling psutil and
+forking vcgencmd themselves, so the cost of /api/system/stats stays the same
+no matter how many browser tabs are polling it. Each job tick only runs the
+registered collectors that are due (see collectors.py), so the tick interval
+is the finest cadence a collector can have.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+
+from app.modules import system_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(namedtuple('Snapshot', ['data', 'timestamp', 'monotonic', 'duration'])):
+    """
+    Immutable result of one collector run
+
+    Attributes:
+        data: Collected statistics (treat as read-only, it is shared by all requests)
+        timestamp: Wall clock time the sample was taken (epoch seconds)
+        monotonic: Monotonic clock time the sample was taken
+        duration: Seconds the collector took to run
+    """
+    __slots__ = ()
+
+    def age(self) -> float:
+        """Seconds since this snapshot was taken"""
+        return time.monotonic() - self.monotonic
+
+
+class SamplerJob:
+    """A collector function run on its own cadence by the sampler"""
+
+    def __init__(self, name: str, func: Callable[[], dict], interval: float,
+                 on_demand: bool = False, idle_timeout: float = 300.0):
+        """
+        Initialize a sampler job
+
+        Args:
+            name: Snapshot name (e.g., "stats", "detailed")
+            func: Collector returning a dict of statistics
+            interval: Seconds between runs
+            on_demand: Only run while clients have asked for this snapshot recently
+            idle_timeout: Seconds without a request before an on-demand job pauses
+        """
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.on_demand = on_demand
+        self.idle_timeout = idle_timeout
+        self.snapshot: Optional[Snapshot] = None
+        self.callbacks: List[Callable[[Snapshot], None]] = []
+        self.last_demand = 0.0
+        self.wakeup = threading.Event()
+        self.updated = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+
+    def is_idle(self) -> bool:
+        """Check if an on-demand job has had no recent requests"""
+        return self.on_demand and time.monotonic() - self.last_demand > self.idle_timeout
+
+
+class MetricsSampler:
+    """Runs collectors in background threads and publishes immutable snapshots"""
+
+    def __init__(self, interval: float = 2.0, detailed_interval: float = 30.0):
+        """
+        Initialize the metrics sampler
+
+        Args:
+            interval: Seconds between quick stats samples (get_all_stats)
+            detailed_interval: Seconds between detailed samples (get_all_stats_detailed)
+        """
+        self.jobs: Dict[str, SamplerJob] = {
+            'stats': SamplerJob('stats', system_monitor.get_all_stats, interval),
+            'detailed': SamplerJob('detailed', system_monitor.get_all_stats_detailed,
+                                   detailed_interval, on_demand=True),
+        }
+        self._stop = threading.Event()
+        self.running = False
+
+        logger.info(f"Metrics sampler initialized (stats every {interval}s, "
+                    f"detailed every {detailed_interval}s)")
+
+    def start(self):
+        """Start one sampling thread per job"""
+        if self.running:
+            return
+        self._stop.clear()
+        for job in self.jobs.values():
+            job.thread = threading.Thread(
+                target=self._run_job, args=(job,),
+                name=f"sampler-{job.name}", daemon=True
+            )
+            job.thread.start()
+        self.running = True
+        logger.info("Metrics sampler started")
+
+    def stop(self):
+        """Stop all sampling threads"""
+        self._stop.set()
+        for job in self.jobs.values():
+            job.wakeup.set()
+        for job in self.jobs.values():
+            if job.thread is not None:
+                job.thread.join(timeout=5)
+                job.thread = None
+        self.running = False
+        logger.info("Metrics sampler stopped")
+
+    def _run_job(self, job: SamplerJob):
+        """Sampling loop for a single job - runs on a fixed cadence"""
+        next_run = time.monotonic()
+        while not self._stop.is_set():
+            if job.is_idle():
+                # Sleep until a request wakes us up
+                job.wakeup.wait()
+                job.wakeup.clear()
+                next_run = time.monotonic()
+                continue
+
+            self._collect(job)
+
+            # Fixed cadence: skip missed slots instead of bursting to catch up
+            next_run += job.interval
+            now = time.monotonic()
+            if next_run < now:
+                next_run = now + job.interval
+            job.wakeup.wait(next_run - now)
+            job.wakeup.clear()
+
+    def _collect(self, job: SamplerJob):
+        """Run a collector once and publish its snapshot"""
+        started = time.monotonic()
+        try:
+            data = job.func()
+        except Exception as e:
+            logger.error(f"Error collecting {job.name} snapshot: {e}", exc_info=True)
+            return
+
+        snapshot = Snapshot(data, time.time(), time.monotonic(), time.monotonic() - started)
+        with job.updated:
+            job.snapshot = snapshot
+            job.updated.notify_all()
+
+        # Feed consumers such as metric history
+        for callback in job.callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Error in {job.name} sampler callback: {e}", exc_info=True)
+
+    def add_callback(self, name: str, callback: Callable[[Snapshot], None]):
+        """Call a function with every new snapshot of a job"""
+        self.jobs[name].callbacks.append(callback)
+
+    def get_snapshot(self, name: str, wait: float = 0) -> Optional[Snapshot]:
+        """
+        Get the latest snapshot for a job
+
+        Args:
+            name: Job name ("stats" or "detailed")
+            wait: Seconds to wait for a first snapshot if none exists yet
+
+        Returns:
+            Latest snapshot, or None if nothing has been collected
+        """
+        job = self.jobs.get(name)
+        if job is None:
+            return None
+
+        was_idle = job.is_idle()
+        job.last_demand = time.monotonic()
+        if was_idle:
+            job.wakeup.set()
+
+        # Wait for a fresh sample if there is none yet, or the job was paused
+        # long enough that the one we have is stale
+        current = job.snapshot
+        if wait > 0 and (current is None or current.age() > 2 * job.interval):
+            with job.updated:
+                job.updated.wait_for(lambda: job.snapshot is not current, timeout=wait)
+        return job.snapshot
+
+
+# Global sampler instance
+_sampler: Optional[MetricsSampler] = None
+
+
+def get_sampler() -> Optional[MetricsSampler]:
+    """Get the global metrics sampler instance"""
+    return _sampler
+
+
+def init_sampler(interval: float = 2.0, detailed_interval: float = 30.0) -> MetricsSampler:
+    """Initialize the global metrics sampler (call start() after adding callbacks)"""
+    global _sampler
+
+    if _sampler is not None:
+        logger.warning("Metrics sampler already initialized")
+        return _sampler
+
+    _sampler = MetricsSampler(interval, detailed_interval)
+    return _sampler
+
+
+def shutdown_sampler():
+    """Stop the global metrics sampler"""
+    global _sampler
+
+    if _sampler is not None:
+        _sampler.stop()
+        _sampler = None
+
+
+def get_snapshot(name: str, wait: float = 0) -> Optional[Snapshot]:
+    """Get the latest snapshot from the global sampler (None if not running)"""
+    if _sampler is None:
+        return None
+    return _sampler.get_snapshot(name, wait)
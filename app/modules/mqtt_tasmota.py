@@ -1,6 +1,7 @@
 """MQTT client for controlling Tasmota ESP32 devices"""
 import json
 import logging
+import os
 import threading
 import time
 from typing import Dict, List, Optional, Callable
@@ -78,6 +79,8 @@ class MQTTTasmotaClient:
         self.connected = False
         self.connection_lock = threading.Lock()
         self.message_callbacks: List[Callable] = []
+        self.version = 0  # Bumped whenever device data changes (used for ETags)
+        self.instance = os.urandom(4).hex()  # Tells ETags of a re-created client apart
         
         logger.info(f"MQTT client initialized for broker {broker_host}:{broker_port}")
     
@@ -92,6 +95,7 @@ class MQTTTasmotaClient:
         """
         device = TasmotaDevice(name, topic, device_type)
         self.devices[topic] = device
+        self.version += 1
         
         # Subscribe to device topics if connected
         if self.connected:
@@ -109,6 +113,7 @@ class MQTTTasmotaClient:
                 self.client.unsubscribe(f"{topic}/stat/#")
             
             del self.devices[topic]
+            self.version += 1
             logger.info(f"Removed device with topic: {topic}")
             return True
         return False
@@ -215,6 +220,8 @@ class MQTTTasmotaClient:
                         # Last Will and Testament (online/offline status)
                         device.online = (payload.lower() == 'online')
                     
+                    self.version += 1
+                    
                     # Call any registered callbacks
                     for callback in self.message_callbacks:
                         try:
@@ -254,6 +261,24 @@ class MQTTTasmotaClient:
             logger.error(f"Error publishing command: {e}")
             return False
     
+    def publish(self, topic: str, payload: str, retain: bool = False) -> bool:
+        """
+        Publish a message to an arbitrary topic (e.g. dashboard alerts)
+        
+        Returns:
+            bool: True if the message was queued for sending
+        """
+        if not self.connected:
+            logger.error("Cannot publish: Not connected to MQTT broker")
+            return False
+        
+        try:
+            result = self.client.publish(topic, payload, retain=retain)
+            return result.rc == mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            logger.error(f"Error publishing to {topic}: {e}")
+            return False
+    
     # Convenience methods for common Tasmota commands
     
     def power_on(self, device_topic: str, relay: int = None):
@@ -0,0 +1,174 @@
+"""Network rate module - per-interface throughput from sysfs counters
+
+Samples /sys/class/net/<iface>/statistics/* through cached file descriptors
+(re-read with pread) and turns the counter deltas into per-second rates.
+Rates are smoothed with a time-aware EWMA so irregular sample intervals do
+not skew them. The sampler drives it once per stats sample and the smoothed
+byte rates are recorded into metric history as network.<iface>.rx_rate and
+network.<iface>.tx_rate (bytes/s), averaged to one sample per
+history_resolution seconds.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from app.modules.collectors import sample_interval
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ('rx_bytes', 'tx_bytes', 'rx_packets', 'tx_packets',
+            'rx_errors', 'tx_errors', 'rx_dropped', 'tx_dropped')
+
+# Interfaces that are never interesting on the dashboard
+IGNORED_PREFIXES = ('lo', 'docker', 'veth', 'br-')
+
+
+class NetRateEngine:
+    """Computes smoothed per-interface rates from sysfs statistics counters"""
+
+    def __init__(self, sysfs_path: str = '/sys/class/net', smoothing: float = 5.0,
+                 max_age: float = 2.0):
+        """
+        Initialize the rate engine
+
+        Args:
+            sysfs_path: Network class directory (tests point this at a temp dir)
+            smoothing: EWMA time constant in seconds (0 = no smoothing)
+            max_age: Seconds rates are reused before rates() samples again
+        """
+        self.sysfs_path = sysfs_path
+        self.smoothing = smoothing
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self._fds: Dict[str, Optional[int]] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}  # iface -> last raw counters
+        self.smoothed: Dict[str, Dict[str, float]] = {}  # iface -> smoothed rates
+        self.sampled_at: Optional[float] = None  # monotonic time of the last sample
+        self.timestamp: Optional[float] = None  # epoch time of the last sample
+        self.history = None  # optional MetricHistory that receives byte rates
+        self.history_resolution = 10.0  # seconds per stored history sample (averaged)
+
+    def interfaces(self):
+        """Interfaces currently present in sysfs"""
+        try:
+            names = os.listdir(self.sysfs_path)
+        except OSError:
+            return []
+        return sorted(n for n in names if not n.startswith(IGNORED_PREFIXES))
+
+    def _read_counter(self, iface: str, counter: str) -> Optional[int]:
+        """Re-read one statistics counter through a cached file descriptor"""
+        path = os.path.join(self.sysfs_path, iface, 'statistics', counter)
+        fd = self._fds.get(path, -1)
+        if fd == -1:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                fd = None
+            self._fds[path] = fd
+        if fd is None:
+            return None
+        try:
+            return int(os.pread(fd, 32, 0))
+        except (OSError, ValueError):
+            # Interface went away - reopen on next sample
+            os.close(fd)
+            del self._fds[path]
+            return None
+
+    def _forget(self, iface: str):
+        """Drop state and descriptors for a removed interface"""
+        prefix = os.path.join(self.sysfs_path, iface, '')
+        for path in [p for p in self._fds if p.startswith(prefix)]:
+            fd = self._fds.pop(path)
+            if fd is not None:
+                os.close(fd)
+        self.counters.pop(iface, None)
+        self.smoothed.pop(iface, None)
+
+    def sample(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Read all counters once and update smoothed rates"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            elapsed, stale = sample_interval(self.sampled_at, now)
+            if stale:
+                return self._rates()  # older than the last sample: keep the newer state
+            present = self.interfaces()
+
+            for iface in [i for i in self.counters if i not in present]:
+                self._forget(iface)
+
+            for iface in present:
+                current = {}
+                for counter in COUNTERS:
+                    value = self._read_counter(iface, counter)
+                    if value is not None:
+                        current[counter] = value
+                previous = self.counters.get(iface)
+                self.counters[iface] = current
+                if not elapsed or previous is None:
+                    continue
+
+                # Weight of the new sample for a time constant of `smoothing` seconds
+                alpha = 1 - math.exp(-elapsed / self.smoothing) if self.smoothing > 0 else 1.0
+                smoothed = self.smoothed.setdefault(iface, {})
+                for counter, value in current.items():
+                    delta = value - previous.get(counter, value)
+                    if delta < 0:
+                        continue  # counter reset (driver reload) - skip this interval
+                    rate = delta / elapsed
+                    old = smoothed.get(counter)
+                    smoothed[counter] = rate if old is None else old + alpha * (rate - old)
+
+            self.sampled_at = now
+            self.timestamp = time.time()
+            return self._rates()
+
+    def _rates(self) -> Dict[str, Dict[str, float]]:
+        """Smoothed rates as {iface: {"rx_bytes_per_sec": ...}} (caller holds the lock)"""
+        return {
+            iface: {f'{counter}_per_sec': round(rate, 2) for counter, rate in rates.items()}
+            for iface, rates in self.smoothed.items()
+        }
+
+    def rates(self) -> Dict[str, Dict[str, float]]:
+        """Latest smoothed rates, sampling only when they are older than max_age"""
+        if self.sampled_at is None:
+            # First use without the sampler: take a baseline for the delta
+            self.sample()
+            time.sleep(0.25)
+            return self.sample()
+        if time.monotonic() - self.sampled_at >= self.max_age:
+            return self.sample()
+        with self.lock:
+            return self._rates()
+
+    def record_snapshot(self, snapshot):
+        """Sampler callback - sample counters and record byte rates into history"""
+        rates = self.sample(snapshot.monotonic)
+        if self.history is None:
+            return
+        metrics = {}
+        for iface, values in rates.items():
+            metrics[f'network.{iface}.rx_rate'] = values.get('rx_bytes_per_sec')
+            metrics[f'network.{iface}.tx_rate'] = values.get('tx_bytes_per_sec')
+        if metrics:
+            self.history.record(metrics, snapshot.timestamp, self.history_resolution)
+
+
+# Global rate engine
+_engine: Optional[NetRateEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_net_rates() -> NetRateEngine:
+    """Get or create the global network rate engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = NetRateEngine()
+    return _engine
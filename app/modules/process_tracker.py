@@ -0,0 +1,171 @@
+"""Process tracker module - incremental process table with CPU deltas
+
+Reads /proc/[pid]/stat directly (one read per process, no psutil.Process
+objects) and keeps per-PID tick counters between samples, so CPU % is the
+real usage since the previous sample rather than a memory-only ranking.
+Requests are served from the last sample; the table is rescanned at most
+once per max_age seconds no matter how many clients ask.
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+# One row of the process table
+ProcessSample = namedtuple('ProcessSample', ['pid', 'name', 'cpu_percent', 'rss'])
+
+SORT_KEYS = {
+    'cpu': lambda p: p.cpu_percent,
+    'memory': lambda p: p.rss,
+}
+
+
+def parse_stat(data: bytes):
+    """
+    Parse /proc/[pid]/stat
+
+    Returns:
+        Tuple of (name, cpu ticks, start time, rss pages)
+    """
+    # comm is wrapped in parentheses and may itself contain spaces or ")"
+    start, end = data.find(b'('), data.rfind(b')')
+    name = data[start + 1:end].decode(errors='replace')
+    fields = data[end + 2:].split()
+    # fields[0] is stat field 3 (state): utime=14, stime=15, starttime=22, rss=24
+    ticks = int(fields[11]) + int(fields[12])
+    return name, ticks, int(fields[19]), int(fields[21])
+
+
+class ProcessTracker:
+    """Keeps per-PID CPU tick state between samples of /proc"""
+
+    def __init__(self, proc_path: str = '/proc', max_age: float = 2.0):
+        """
+        Initialize the tracker
+
+        Args:
+            proc_path: procfs mount point (tests point this at a fake tree)
+            max_age: Seconds a sample is reused before /proc is scanned again
+        """
+        self.proc_path = proc_path
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.state: Dict[int, tuple] = {}  # pid -> (start time, cpu ticks)
+        self.table: List[ProcessSample] = []
+        self.sampled_at: Optional[float] = None  # monotonic time of the last scan
+        self.timestamp: Optional[float] = None  # epoch time of the last scan
+        self.memory_total = self._memory_total()
+
+    def _memory_total(self) -> int:
+        """Total RAM in bytes from meminfo"""
+        try:
+            with open(os.path.join(self.proc_path, 'meminfo'), 'rb') as f:
+                for line in f:
+                    if line.startswith(b'MemTotal:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def sample(self, now: Optional[float] = None) -> List[ProcessSample]:
+        """Scan /proc once and update CPU deltas"""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.sampled_at if self.sampled_at is not None else None
+
+        state, table = {}, []
+        try:
+            entries = os.scandir(self.proc_path)
+        except OSError as e:
+            logger.error(f"Cannot read {self.proc_path}: {e}")
+            return self.table
+
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                try:
+                    with open(os.path.join(entry.path, 'stat'), 'rb') as f:
+                        name, ticks, started, rss = parse_stat(f.read())
+                except (OSError, ValueError, IndexError):
+                    continue  # exited while scanning, or kernel thread edge case
+
+                cpu_percent = 0.0
+                previous = self.state.get(pid)
+                # Same start time means the same process (PIDs are reused)
+                if elapsed and previous is not None and previous[0] == started:
+                    cpu_percent = (ticks - previous[1]) / CLOCK_TICKS / elapsed * 100
+
+                state[pid] = (started, ticks)
+                table.append(ProcessSample(pid, name, round(cpu_percent, 1), rss * PAGE_SIZE))
+
+        self.state = state  # exited processes drop out here
+        self.table = table
+        self.sampled_at = now
+        self.timestamp = time.time()
+        return table
+
+    def _refresh(self):
+        """Rescan when the last sample is older than max_age (caller holds the lock)"""
+        now = time.monotonic()
+        if self.sampled_at is None:
+            # First use: take a baseline so CPU % has a delta to work with
+            self.sample(now)
+            time.sleep(0.25)
+            self.sample()
+        elif now - self.sampled_at >= self.max_age:
+            self.sample(now)
+
+    def top(self, sort: str = 'cpu', limit: int = 5) -> List[dict]:
+        """
+        Get the top processes
+
+        Args:
+            sort: "cpu" or "memory"
+            limit: Number of processes to return
+
+        Returns:
+            List of process dicts, highest first
+        """
+        key = SORT_KEYS[sort]
+        with self.lock:
+            self._refresh()
+            table = self.table
+        return [self._as_dict(p) for p in heapq.nlargest(limit, table, key=key)]
+
+    def _as_dict(self, process: ProcessSample) -> dict:
+        memory_percent = process.rss / self.memory_total * 100 if self.memory_total else 0.0
+        return {
+            'pid': process.pid,
+            'name': process.name,
+            'cpu_percent': process.cpu_percent,
+            'memory_percent': round(memory_percent, 2),
+            'memory_mb': round(process.rss / (1024**2), 1)
+        }
+
+    def count(self) -> int:
+        """Number of processes in the last sample"""
+        return len(self.table)
+
+
+# Global tracker instance
+_tracker: Optional[ProcessTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_process_tracker() -> ProcessTracker:
+    """Get or create the global process tracker"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ProcessTracker()
+    return _tracker
@@ -0,0 +1,285 @@
+"""Procfs module - single-pass reader for the quick stats hot path
+
+psutil.cpu_percent(), virtual_memory() and the uptime read each open, read
+and fully parse their own /proc file on every call. The quick stats sample
+runs every second, so this reader keeps /proc/stat, /proc/meminfo,
+/proc/loadavg and /proc/uptime open and re-reads them with pread into reused
+buffers. It parses only the fields the dashboard needs:
+
+- the aggregate "cpu" line of /proc/stat (only the first 512 bytes are read,
+  not the per-core and interrupt lines after it)
+- eight /proc/meminfo keys
+- the three load averages and the uptime seconds
+
+All of it comes back in one compact ProcSample. Values match the pinned
+psutil 5.9.6: memory "used" is total - free - buffers - cached, "percent" is
+based on available, cached includes SReclaimable, and CPU busy time excludes
+idle and iowait.
+
+scripts/bench_procfs.py compares the per-sample cost with the psutil path.
+"""
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProcSample = namedtuple('ProcSample', [
+    'cpu_percent',  # % busy since the previous sample (0.0 on the first)
+    'mem_total', 'mem_available', 'mem_used', 'mem_free',  # bytes
+    'buffers', 'cached',
+    'swap_total', 'swap_free',
+    'mem_percent',
+    'load1', 'load5', 'load15',
+    'uptime',  # seconds
+])
+
+# /proc/meminfo keys read (kB) -> ProcSample field
+MEMINFO_FIELDS = {
+    b'MemTotal:': 'mem_total',
+    b'MemFree:': 'mem_free',
+    b'MemAvailable:': 'mem_available',
+    b'Buffers:': 'buffers',
+    b'Cached:': 'cached',
+    b'SReclaimable:': 'reclaimable',
+    b'SwapTotal:': 'swap_total',
+    b'SwapFree:': 'swap_free',
+}
+
+# Columns of the aggregate "cpu" line of /proc/stat (same names as psutil.cpu_times())
+CPU_MODES = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal',
+             'guest', 'guest_nice')
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+# Bytes read from each file: enough for the fields above, not the whole file
+# (/proc/stat runs to several KB of per-core and interrupt counters)
+BUFFER_SIZES = {'stat': 512, 'meminfo': 4096, 'loadavg': 128, 'uptime': 64}
+
+
+def parse_meminfo(data, length: Optional[int] = None) -> Dict[str, int]:
+    """
+    Pick the MEMINFO_FIELDS values (bytes) out of /proc/meminfo
+
+    Searches the buffer for each key instead of splitting every line, so only
+    the numbers that are used get copied out.
+    """
+    length = len(data) if length is None else length
+    values = {}
+    for key, field in MEMINFO_FIELDS.items():
+        start = data.find(key, 0, length)
+        if start == -1:
+            continue
+        end = data.find(b'\n', start, length)
+        values[field] = int(data[start + len(key):end if end != -1 else length].split()[0]) * 1024
+    return values
+
+
+def _busy_total(fields):
+    """(busy, total) jiffies from the fields of one "cpu" line"""
+    # user nice system idle iowait irq softirq steal (guest time is already in user/nice)
+    times = [int(x) for x in fields[1:9]]
+    total = sum(times)
+    idle = times[3] + (times[4] if len(times) > 4 else 0)
+    return total - idle, total
+
+
+def parse_cpu_line(data, length: Optional[int] = None):
+    """(busy, total) jiffies from the aggregate "cpu" line of /proc/stat"""
+    length = len(data) if length is None else length
+    return _busy_total(data[:data.find(b'\n', 0, length)].split())
+
+
+def parse_percpu_lines(data, length: Optional[int] = None) -> List[Tuple[int, int]]:
+    """(busy, total) jiffies for each "cpuN" line of /proc/stat, in order"""
+    length = len(data) if length is None else length
+    cores = []
+    for line in bytes(data[:length]).split(b'\n')[1:]:
+        if not line.startswith(b'cpu'):
+            break  # the per-core lines come right after the aggregate one
+        cores.append(_busy_total(line.split()))
+    return cores
+
+
+class ProcReader:
+    """Keeps /proc descriptors and buffers open between samples"""
+
+    def __init__(self, proc_path: str = '/proc'):
+        """
+        Open the procfs files
+
+        Args:
+            proc_path: procfs mount point (tests point this at a temp dir)
+
+        Raises:
+            OSError: If a file cannot be opened (not Linux)
+        """
+        self.proc_path = proc_path
+        self.fds = {}
+        self.buffers = {}
+        try:
+            for name, size in BUFFER_SIZES.items():
+                self.fds[name] = os.open(os.path.join(proc_path, name), os.O_RDONLY)
+                self.buffers[name] = bytearray(size)
+        except OSError:
+            self.close()
+            raise
+        self.previous = None  # (busy, total) jiffies of the last sample
+        # The per-core lines need more of /proc/stat than sample() reads
+        self.percpu_buffer = bytearray(BUFFER_SIZES['stat'] + 128 * (os.cpu_count() or 1))
+        self.lock = threading.Lock()
+
+    def close(self):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+
+    def _read(self, name: str):
+        """pread a file from offset 0 into its reused buffer -> (buffer, length)"""
+        buffer = self.buffers[name]
+        return buffer, os.preadv(self.fds[name], [buffer], 0)
+
+    def sample(self, track_cpu: bool = True) -> ProcSample:
+        """
+        Read all four files once
+
+        Args:
+            track_cpu: Make this sample the start of the next CPU percent
+                interval (False for side readers like the exporter, so they
+                do not shorten the sampler's interval)
+        """
+        with self.lock:
+            busy, total = parse_cpu_line(*self._read('stat'))
+            previous = self.previous
+            if track_cpu or previous is None:
+                self.previous = (busy, total)
+            memory = parse_meminfo(*self._read('meminfo'))
+            buffer, length = self._read('loadavg')
+            load = [float(x) for x in buffer[:length].split(None, 3)[:3]]
+            buffer, length = self._read('uptime')
+            uptime = float(buffer[:buffer.find(b' ', 0, length)])
+
+        cpu_percent = 0.0
+        if previous is not None and total > previous[1]:
+            cpu_percent = max(0.0, min(100.0, (busy - previous[0]) * 100 / (total - previous[1])))
+        return build_sample(cpu_percent, memory, load, uptime)
+
+    def cpu_times(self) -> Dict[str, float]:
+        """Cumulative CPU seconds per mode from the aggregate /proc/stat line"""
+        with self.lock:
+            buffer, length = self._read('stat')
+            fields = buffer[:buffer.find(b'\n', 0, length)].split()[1:len(CPU_MODES) + 1]
+        return {mode: int(value) / CLOCK_TICKS for mode, value in zip(CPU_MODES, fields)}
+
+    def percpu_times(self) -> List[Tuple[int, int]]:
+        """Per-core (busy, total) jiffies from the "cpuN" lines of /proc/stat"""
+        with self.lock:
+            length = os.preadv(self.fds['stat'], [self.percpu_buffer], 0)
+            return parse_percpu_lines(self.percpu_buffer, length)
+
+
+def build_sample(cpu_percent: float, memory: Dict[str, int], load, uptime: float) -> ProcSample:
+    """Derive the psutil-compatible memory figures and pack a ProcSample"""
+    mem_total = memory.get('mem_total', 0)
+    mem_free = memory.get('mem_free', 0)
+    buffers = memory.get('buffers', 0)
+    cached = memory.get('cached', 0) + memory.get('reclaimable', 0)
+    available = memory.get('mem_available') or (mem_free + buffers + cached)
+    if available > mem_total:
+        available = mem_free  # container with distorted values (same as psutil)
+    mem_used = mem_total - mem_free - buffers - cached
+    if mem_used < 0:
+        mem_used = mem_total - mem_free  # caches larger than total (same as psutil)
+    return ProcSample(
+        cpu_percent=cpu_percent,
+        mem_total=mem_total,
+        mem_available=available,
+        mem_used=mem_used,
+        mem_free=mem_free,
+        buffers=buffers,
+        cached=cached,
+        swap_total=memory.get('swap_total', 0),
+        swap_free=memory.get('swap_free', 0),
+        mem_percent=(mem_total - available) * 100 / mem_total if mem_total else 0.0,
+        load1=load[0], load5=load[1], load15=load[2],
+        uptime=uptime,
+    )
+
+
+def psutil_sample() -> ProcSample:
+    """The same sample through psutil (fallback off Linux, and the benchmark baseline)"""
+    import psutil
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    load = os.getloadavg()
+    return ProcSample(
+        cpu_percent=psutil.cpu_percent(interval=0),
+        mem_total=memory.total,
+        mem_available=memory.available,
+        mem_used=memory.used,
+        mem_free=memory.free,
+        buffers=getattr(memory, 'buffers', 0),
+        cached=getattr(memory, 'cached', 0),
+        swap_total=swap.total,
+        swap_free=swap.free,
+        mem_percent=memory.percent,
+        load1=load[0], load5=load[1], load15=load[2],
+        uptime=time.time() - psutil.boot_time(),
+    )
+
+
+# Global reader instance
+_reader: Optional[ProcReader] = None
+_reader_lock = threading.Lock()
+_unavailable = False
+
+
+def get_proc_reader() -> Optional[ProcReader]:
+    """Get or create the global reader (None when /proc cannot be opened)"""
+    global _reader, _unavailable
+    if _reader is None and not _unavailable:
+        with _reader_lock:
+            if _reader is None and not _unavailable:
+                try:
+                    _reader = ProcReader()
+                except OSError as e:
+                    logger.info(f"procfs reader unavailable ({e}) - using psutil")
+                    _unavailable = True
+    return _reader
+
+
+def sample(track_cpu: bool = True) -> ProcSample:
+    """One quick stats sample from the global reader (psutil fallback)"""
+    reader = get_proc_reader()
+    return reader.sample(track_cpu) if reader is not None else psutil_sample()
+
+
+def cpu_times() -> Dict[str, float]:
+    """CPU seconds per mode from the global reader (psutil fallback)"""
+    reader = get_proc_reader()
+    if reader is None:
+        import psutil
+        return psutil.cpu_times()._asdict()
+    return reader.cpu_times()
+
+
+def percpu_times() -> List[Tuple[float, float]]:
+    """Per-core (busy, total) CPU time from the global reader (psutil fallback)"""
+    reader = get_proc_reader()
+    if reader is not None:
+        return reader.percpu_times()
+    import psutil
+    times_list = psutil.cpu_times(percpu=True)
+    if not times_list:
+        return []
+    fields = times_list[0]._fields
+    # guest and guest_nice are already counted in user and nice
+    counted = [i for i, name in enumerate(fields) if name not in ('guest', 'guest_nice')]
+    idle = [fields.index(name) for name in ('idle', 'iowait') if name in fields]
+    cores = []
+    for times in times_list:
+        total = sum(times[i] for i in counted)
+        cores.append((total - sum(times[i] for i in idle), total))
+    return cores
@@ -3,6 +3,8 @@ import subprocess
 import json
 import os
 
+from app.modules.collectors import collector
+
 
 def is_running():
     """Check if Raspotify service is running"""
@@ -18,6 +20,7 @@ def is_running():
         return False
 
 
+@collector('raspotify', 60, key='services.raspotify', cost='io', timeout=5.0)
 def get_service_status():
     """Get detailed Raspotify service status"""
     try:
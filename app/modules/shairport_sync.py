@@ -2,6 +2,8 @@
 import subprocess
 import os
 
+from app.modules.collectors import collector
+
 
 def is_running():
     """Check if Shairport Sync service is running"""
@@ -17,6 +19,7 @@ def is_running():
         return False
 
 
+@collector('shairport_sync', 60, key='services.shairport_sync', cost='io', timeout=5.0)
 def get_service_status():
     """Get detailed Shairport Sync service status"""
     try:
@@ -0,0 +1,156 @@
+"""Stream hub module - fan-out of sampler snapshots to Server-Sent Events clients
+
+The sampler publishes each snapshot once; the hub encodes it once - as a
+delta against the previously published stats version - and puts the event on
+every subscriber's bounded queue without blocking. A client that falls behind
+(queue full) is dropped - its stream ends and the browser's EventSource
+reconnects and starts from the latest snapshot.
+
+The number of open streams is capped because each one holds a worker thread
+(gthread) for its lifetime; streams also end after a maximum duration so
+threads are recycled and clients reconnect.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from app.modules.delta import get_delta_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One connected stream client"""
+
+    def __init__(self, queue_size: int):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.created = time.monotonic()
+        self.dropped = False
+
+
+def format_event(event: str, data, event_id: Optional[str] = None) -> str:
+    """Encode one SSE message"""
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class StreamHub:
+    """Broadcasts events to bounded per-client queues"""
+
+    def __init__(self, max_clients: int = 4, queue_size: int = 10):
+        """
+        Initialize the hub
+
+        Args:
+            max_clients: Maximum concurrent streams
+            queue_size: Events buffered per client before it is dropped
+        """
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self.subscribers: List[Subscription] = []
+        self.lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+        self.last_version = None  # stats version of the last published event
+
+    def subscribe(self) -> Optional[Subscription]:
+        """Register a client (None when the hub is full)"""
+        with self.lock:
+            if len(self.subscribers) >= self.max_clients:
+                return None
+            subscription = Subscription(self.queue_size)
+            self.subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+
+    def publish(self, event: str, data, event_id: Optional[str] = None):
+        """Send an event to every client without blocking"""
+        with self.lock:
+            if not self.subscribers:
+                return
+            message = format_event(event, data, event_id)
+            self.published += 1
+            for subscription in list(self.subscribers):
+                try:
+                    subscription.queue.put_nowait(message)
+                except queue.Full:
+                    self._drop(subscription)
+
+    def _drop(self, subscription: Subscription):
+        """Disconnect a slow client (caller holds the lock)"""
+        subscription.dropped = True
+        self.subscribers.remove(subscription)
+        self.dropped += 1
+        # Replace the backlog with the end-of-stream marker
+        while True:
+            try:
+                subscription.queue.get_nowait()
+            except queue.Empty:
+                break
+        subscription.queue.put_nowait(None)
+        logger.info("Dropped slow stream client")
+
+    def publish_snapshot(self, snapshot):
+        """
+        Sampler callback - push a quick stats snapshot
+
+        Sends a "delta" event with the fields changed since the previously
+        published version, or a full "stats" event when there is no usable base.
+        """
+        if not self.subscribers:
+            self.last_version = None
+            return
+
+        tracker = get_delta_tracker('stats')
+        base = self.last_version
+        version = tracker.update(snapshot.data, key=snapshot.timestamp)
+        changes = tracker.changes_since(base) if base is not None else None
+        self.last_version = version
+        event_id = f'{snapshot.timestamp:.3f}'
+
+        if changes is None:
+            self.publish('stats', {**snapshot.data, 'version': version, 'delta': False,
+                                   'sampled_at': snapshot.timestamp, 'age': 0.0}, event_id)
+        elif changes:
+            self.publish('delta', {'version': version, 'base': base, 'changes': changes,
+                                   'sampled_at': snapshot.timestamp}, event_id)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'clients': len(self.subscribers),
+                'max_clients': self.max_clients,
+                'published': self.published,
+                'dropped': self.dropped
+            }
+
+
+# Global hub instance
+_hub: Optional[StreamHub] = None
+
+
+def get_stream_hub() -> Optional[StreamHub]:
+    """Get the global stream hub instance"""
+    return _hub
+
+
+def init_stream_hub(max_clients: int = 4, queue_size: int = 10) -> StreamHub:
+    """Initialize the global stream hub"""
+    global _hub
+
+    if _hub is not None:
+        logger.warning("Stream hub already initialized")
+        return _hub
+
+    _hub = StreamHub(max_clients, queue_size)
+    return _hub
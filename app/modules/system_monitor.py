@@ -1,49 +1,50 @@
 """System monitoring module - collects Raspberry Pi system statistics"""
 import psutil
-import os
 import subprocess
 import platform
 import socket
 import logging
 from datetime import datetime
-import requests
+from app.modules import collectors, connections, disk_io, http_client, net_rates, process_tracker, procfs, videocore, wifi
+from app.modules.cache import cached
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
 
 def get_cpu_temp():
-    """Get CPU temperature"""
+    """Get CPU temperature (firmware mailbox or sysfs - no vcgencmd fork)"""
     try:
-        temp = subprocess.check_output(['vcgencmd', 'measure_temp']).decode()
-        return float(temp.replace('temp=', '').replace("'C\n", ''))
-    except:
-        try:
-            with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-                return float(f.read()) / 1000.0
-        except:
-            return None
+        return videocore.get_telemetry().temperature()
+    except Exception as e:
+        logger.debug(f"Error reading CPU temperature: {e}")
+        return None
+
+
+def _uptime_dict(uptime_seconds):
+    uptime_seconds = int(uptime_seconds)
+    days = uptime_seconds // 86400
+    hours = (uptime_seconds % 86400) // 3600
+    minutes = (uptime_seconds % 3600) // 60
+    return {
+        'days': days,
+        'hours': hours,
+        'minutes': minutes,
+        'seconds': uptime_seconds
+    }
 
 
 def get_uptime():
     """Get system uptime"""
     try:
         with open('/proc/uptime', 'r') as f:
-            uptime_seconds = int(float(f.read().split()[0]))
-        days = uptime_seconds // 86400
-        hours = (uptime_seconds % 86400) // 3600
-        minutes = (uptime_seconds % 3600) // 60
-        return {
-            'days': days,
-            'hours': hours,
-            'minutes': minutes,
-            'seconds': uptime_seconds
-        }
+            return _uptime_dict(float(f.read().split()[0]))
     except Exception as e:
         logger.error(f"Error getting uptime: {e}", exc_info=True)
         return None
 
 
+@cached(ttl=24 * 3600)
 def get_pi_model():
     """Get Raspberry Pi model"""
     try:
@@ -53,6 +54,7 @@ def get_pi_model():
         return platform.machine()
 
 
+@cached(ttl=3600)
 def get_os_info():
     """Get OS information"""
     try:
@@ -68,6 +70,20 @@ def get_os_info():
         return platform.platform()
 
 
+@cached(ttl=3600)
+def get_static_system_info():
+    """Get system facts that only change across reboots"""
+    boot_time = datetime.fromtimestamp(psutil.boot_time())
+    return {
+        'pi_model': get_pi_model(),
+        'os': get_os_info(),
+        'architecture': platform.machine(),
+        'cpu_cores': psutil.cpu_count(logical=False),
+        'cpu_threads': psutil.cpu_count(logical=True),
+        'boot_time': boot_time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
 def get_cpu_per_core():
     """Get CPU usage per core"""
     return psutil.cpu_percent(interval=0, percpu=True)
@@ -76,8 +92,11 @@ def get_cpu_per_core():
 def get_throttle_status():
     """Get Pi throttle status"""
     try:
-        throttle = subprocess.check_output(['vcgencmd', 'get_throttled']).decode()
-        value = int(throttle.split('=')[1], 16)
+        value = videocore.get_telemetry().throttled()
+        if value is None:
+            # Neither mailbox nor sysfs available - fall back to vcgencmd
+            throttle = subprocess.check_output(['vcgencmd', 'get_throttled']).decode()
+            value = int(throttle.split('=')[1], 16)
         
         status = {
             'under_voltage': bool(value & 0x1),
@@ -94,21 +113,27 @@ def get_throttle_status():
         return None
 
 
+def get_videocore_clocks_and_voltages():
+    """Get firmware clock rates (MHz) and voltages (V)"""
+    try:
+        telemetry = videocore.get_telemetry()
+        clocks = telemetry.clocks()
+        voltages = telemetry.voltages()
+        return {
+            'clocks': {name: round(hz / 1000000) if hz else None for name, hz in clocks.items()},
+            'voltages': {name: round(v, 4) if v else None for name, v in voltages.items()}
+        }
+    except Exception as e:
+        logger.debug(f"Error reading VideoCore clocks/voltages: {e}")
+        return {'clocks': {}, 'voltages': {}}
+
+
 def get_top_processes():
     """Get top memory consuming processes"""
-    processes = []
-    for proc in psutil.process_iter(['pid', 'name', 'memory_percent']):
-        try:
-            processes.append({
-                'pid': proc.info['pid'],
-                'name': proc.info['name'],
-                'memory_percent': round(proc.info['memory_percent'], 2)
-            })
-        except:
-            pass
-    return sorted(processes, key=lambda x: x['memory_percent'], reverse=True)[:5]
+    return process_tracker.get_process_tracker().top(sort='memory', limit=5)
 
 
+@cached(ttl=60, stale_ttl=300)
 def get_partitions():
     """Get partition usage"""
     partitions = []
@@ -150,14 +175,11 @@ def get_network_interfaces():
 
 
 def get_wifi_signal():
-    """Get WiFi signal strength"""
+    """Get WiFi signal strength in dBm"""
     try:
-        result = subprocess.check_output(['/usr/sbin/iwconfig', 'wlan0'], stderr=subprocess.DEVNULL).decode()
-        for line in result.split('\n'):
-            if 'Signal level' in line:
-                signal = line.split('Signal level=')[1].split(' ')[0]
-                return signal
-    except:
+        return wifi.get_wifi_collector().read().signal_dbm
+    except Exception as e:
+        logger.debug(f"Error getting WiFi signal: {e}")
         return None
 
 
@@ -171,122 +193,45 @@ def get_wifi_details():
         'signal_quality': None,
         'bit_rate': None,
         'tx_power': None,
-        'link_quality': None
+        'link_quality': None,
+        # Typed values (display strings above are kept for the UI)
+        'frequency_mhz': None,
+        'signal_dbm': None,
+        'noise_dbm': None,
+        'signal_quality_percent': None,
+        'bitrate_mbps': None,
+        'rx_bitrate_mbps': None,
+        'tx_power_dbm': None
     }
     
     try:
-        # Get info from iwconfig
-        iwconfig_result = subprocess.check_output(['/usr/sbin/iwconfig', 'wlan0'], stderr=subprocess.DEVNULL).decode()
+        # Shared with get_wifi_signal() - one read per /api/system/info call
+        reading = wifi.get_wifi_collector().read()
+        quality = wifi.signal_quality_percent(reading.signal_dbm)
         
-        for line in iwconfig_result.split('\n'):
-            # Extract SSID
-            if 'ESSID:' in line:
-                ssid = line.split('ESSID:')[1].strip().strip('"')
-                wifi_info['ssid'] = ssid if ssid else None
-            
-            # Extract frequency and calculate band
-            if 'Frequency:' in line:
-                freq_str = line.split('Frequency:')[1].split(' ')[0]
-                try:
-                    frequency = float(freq_str)
-                    wifi_info['frequency'] = f"{frequency} GHz"
-                    
-                    # Determine band based on frequency
-                    if 2.4 <= frequency < 2.5:
-                        wifi_info['band'] = '2.4 GHz'
-                    elif 5.0 <= frequency < 6.0:
-                        wifi_info['band'] = '5 GHz'
-                    elif frequency >= 6.0:
-                        wifi_info['band'] = '6 GHz (WiFi 6E)'
-                except:
-                    pass
-            
-            # Extract signal strength
-            if 'Signal level=' in line:
-                try:
-                    # Get the signal level portion
-                    signal_part = line.split('Signal level=')[1]
-                    # Extract the value with dBm
-                    signal = signal_part.split()[0] + ' ' + signal_part.split()[1] if 'dBm' in signal_part else signal_part.split()[0]
-                    wifi_info['signal_strength'] = signal
-                    
-                    # Calculate signal quality percentage (assuming -100 to -50 dBm range)
-                    if 'dBm' in signal:
-                        dbm = int(signal.split()[0])
-                        quality = min(100, max(0, 2 * (dbm + 100)))
-                        wifi_info['signal_quality'] = f"{quality}%"
-                except Exception as e:
-                    pass
-            
-            # Extract link quality
-            if 'Link Quality=' in line:
-                try:
-                    link_quality = line.split('Link Quality=')[1].split(' ')[0]
-                    wifi_info['link_quality'] = link_quality
-                except:
-                    pass
-            
-            # Extract bit rate
-            if 'Bit Rate=' in line:
-                try:
-                    bit_rate_parts = line.split('Bit Rate=')[1].split()
-                    wifi_info['bit_rate'] = ' '.join(bit_rate_parts[0:2])
-                except:
-                    pass
-            
-            # Extract Tx-Power
-            if 'Tx-Power=' in line:
-                try:
-                    tx_power = line.split('Tx-Power=')[1].split(' ')[0]
-                    wifi_info['tx_power'] = tx_power
-                except:
-                    pass
+        wifi_info.update({
+            'ssid': reading.ssid,
+            'band': wifi.band_for_frequency(reading.frequency_mhz),
+            'frequency_mhz': reading.frequency_mhz,
+            'signal_dbm': reading.signal_dbm,
+            'noise_dbm': reading.noise_dbm,
+            'signal_quality_percent': quality,
+            'bitrate_mbps': reading.tx_bitrate_mbps,
+            'rx_bitrate_mbps': reading.rx_bitrate_mbps,
+            'tx_power_dbm': reading.tx_power_dbm
+        })
         
-        # Try to get additional info from iw if available
-        try:
-            iw_result = subprocess.check_output(['iw', 'dev', 'wlan0', 'link'], stderr=subprocess.DEVNULL).decode()
-            
-            for line in iw_result.split('\n'):
-                # Get SSID if not already found
-                if 'SSID:' in line and not wifi_info['ssid']:
-                    wifi_info['ssid'] = line.split('SSID:')[1].strip()
-                
-                # Get frequency if not already found
-                if 'freq:' in line and not wifi_info['frequency']:
-                    freq_mhz = line.split('freq:')[1].strip().split()[0]
-                    try:
-                        freq_ghz = float(freq_mhz) / 1000
-                        wifi_info['frequency'] = f"{freq_ghz:.1f} GHz"
-                        
-                        # Determine band
-                        if 2400 <= float(freq_mhz) < 2500:
-                            wifi_info['band'] = '2.4 GHz'
-                        elif 5000 <= float(freq_mhz) < 6000:
-                            wifi_info['band'] = '5 GHz'
-                        elif float(freq_mhz) >= 6000:
-                            wifi_info['band'] = '6 GHz (WiFi 6E)'
-                    except:
-                        pass
-                
-                # Get signal strength in dBm
-                if 'signal:' in line and not wifi_info['signal_strength']:
-                    signal = line.split('signal:')[1].strip().split()[0]
-                    wifi_info['signal_strength'] = f"{signal} dBm"
-                    
-                    # Calculate quality
-                    try:
-                        dbm = int(signal)
-                        quality = min(100, max(0, 2 * (dbm + 100)))
-                        wifi_info['signal_quality'] = f"{quality}%"
-                    except:
-                        pass
-                
-                # Get tx bitrate
-                if 'tx bitrate:' in line and not wifi_info['bit_rate']:
-                    bit_rate = line.split('tx bitrate:')[1].strip()
-                    wifi_info['bit_rate'] = bit_rate
-        except:
-            pass  # iw command not available or failed
+        if reading.frequency_mhz:
+            wifi_info['frequency'] = f"{reading.frequency_mhz / 1000:g} GHz"
+        if reading.signal_dbm is not None:
+            wifi_info['signal_strength'] = f"{reading.signal_dbm} dBm"
+            wifi_info['signal_quality'] = f"{quality}%"
+        if reading.tx_bitrate_mbps is not None:
+            wifi_info['bit_rate'] = f"{reading.tx_bitrate_mbps:g} Mb/s"
+        if reading.tx_power_dbm is not None:
+            wifi_info['tx_power'] = f"{reading.tx_power_dbm} dBm"
+        if reading.link_quality is not None:
+            wifi_info['link_quality'] = f"{reading.link_quality[0]}/{reading.link_quality[1]}"
         
         return wifi_info
         
@@ -296,14 +241,11 @@ def get_wifi_details():
 
 
 def get_public_ip():
-    """Get public IP address"""
-    try:
-        response = requests.get('https://api.ipify.org?format=json', timeout=3)
-        return response.json()['ip']
-    except:
-        return None
+    """Get public IP address (refreshed in the background)"""
+    return get_remote_resource('public_ip').get()
 
 
+@cached(ttl=60, stale_ttl=300)
 def get_audio_devices():
     """Get connected audio devices"""
     try:
@@ -317,196 +259,203 @@ def get_audio_devices():
         return []
 
 
-def get_weather():
-    """Get local weather using wttr.in API with retry logic"""
-    max_retries = 2
-    timeout_seconds = 3
+def _parse_weather(data):
+    """Turn a wttr.in j1 document into the dashboard weather dict"""
+    current = data['current_condition'][0]
     
-    for attempt in range(max_retries):
-        try:
-            # Try with increasing timeout on retry
-            timeout = timeout_seconds if attempt == 0 else timeout_seconds + 2
-            response = requests.get(
-                'https://wttr.in/?format=j1', 
-                timeout=timeout,
-                headers={'User-Agent': 'curl/7.68.0'}  # Some servers prefer curl user agent
-            )
-            
-            if response.status_code != 200:
-                if attempt < max_retries - 1:
-                    continue
-                return None
-                
-            data = response.json()
-            current = data['current_condition'][0]
-            
-            # Get location info
-            location = data.get('nearest_area', [{}])[0]
-            location_name = location.get('areaName', [{}])[0].get('value', 'Unknown')
-            
-            # Get astronomy data for sunrise/sunset
-            astronomy = data.get('weather', [{}])[0].get('astronomy', [{}])[0]
-            
-            return {
-                'temperature': int(current['temp_C']),
-                'feels_like': int(current['FeelsLikeC']),
-                'condition': current['weatherDesc'][0]['value'],
-                'description': current['weatherDesc'][0]['value'],
-                'humidity': int(current['humidity']),
-                'wind_speed': float(current['windspeedKmph']),
-                'pressure': int(current.get('pressure', 0)),
-                'visibility': int(current.get('visibility', 0)) * 1000,  # Convert km to meters
-                'cloudiness': int(current.get('cloudcover', 0)),
-                'location': location_name,
-                'sunrise': astronomy.get('sunrise', 'N/A').replace('AM', '').strip(),
-                'sunset': astronomy.get('sunset', 'N/A').replace('PM', '').strip()
-            }
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                continue  # Retry
-            logger.warning(f"Weather API timeout after {max_retries} attempts")
-            return None
-        except Exception as e:
-            if attempt < max_retries - 1:
-                continue  # Retry on any error
-            logger.error(f"Weather API error: {e}", exc_info=True)
-            return None
+    # Get location info
+    location = data.get('nearest_area', [{}])[0]
+    location_name = location.get('areaName', [{}])[0].get('value', 'Unknown')
+    
+    # Get astronomy data for sunrise/sunset
+    astronomy = data.get('weather', [{}])[0].get('astronomy', [{}])[0]
     
-    return None
+    return {
+        'temperature': int(current['temp_C']),
+        'feels_like': int(current['FeelsLikeC']),
+        'condition': current['weatherDesc'][0]['value'],
+        'description': current['weatherDesc'][0]['value'],
+        'humidity': int(current['humidity']),
+        'wind_speed': float(current['windspeedKmph']),
+        'pressure': int(current.get('pressure', 0)),
+        'visibility': int(current.get('visibility', 0)) * 1000,  # Convert km to meters
+        'cloudiness': int(current.get('cloudcover', 0)),
+        'location': location_name,
+        'sunrise': astronomy.get('sunrise', 'N/A').replace('AM', '').strip(),
+        'sunset': astronomy.get('sunset', 'N/A').replace('PM', '').strip()
+    }
 
 
-def get_all_stats():
-    """Get all system statistics in one call - optimized for dashboard UI"""
-    # Only collect stats that the UI actually displays
-    # This removes blocking operations and reduces response time from ~9s to <50ms
-    
-    # CPU stats - non-blocking version
-    cpu_percent = psutil.cpu_percent(interval=0)
-    cpu_temp = get_cpu_temp()
-    
-    # Memory stats
-    memory = psutil.virtual_memory()
-    
-    # Disk stats
-    disk = psutil.disk_usage('/')
-    
-    # System info
-    uptime = get_uptime()
-    
-    # Simplified stats - only what the UI needs
-    stats = {
-        'cpu': {
-            'percent': round(cpu_percent, 1),
-            'temperature': round(cpu_temp, 1) if cpu_temp else None,
-        },
-        'memory': {
-            'total': round(memory.total / (1024**3), 2),
-            'used': round(memory.used / (1024**3), 2),
-            'percent': round(memory.percent, 1),
-        },
-        'disk': {
-            'total': round(disk.total / (1024**3), 2),
-            'used': round(disk.used / (1024**3), 2),
-            'percent': round(disk.percent, 1),
-        },
-        'system': {
-            'uptime': uptime,
-        }
+def get_weather():
+    """Get local weather from wttr.in (refreshed in the background)"""
+    return get_remote_resource('weather').get()
+
+
+# External lookups served by the shared HTTP client: refreshed on a schedule,
+# last good value persisted so it survives restarts and network outages
+REMOTE_RESOURCES = {
+    'public_ip': {
+        'url': 'https://api.ipify.org?format=json',
+        'parse': lambda data: data['ip'],
+        'interval': 300
+    },
+    'weather': {
+        'url': 'https://wttr.in/?format=j1',
+        'parse': _parse_weather,
+        'interval': 600,
+        'headers': {'User-Agent': 'curl/7.68.0'}  # Some servers prefer curl user agent
     }
-    
-    return stats
+}
 
 
-def get_all_stats_detailed():
-    """Get all system statistics (verbose version for future use)"""
-    # CPU stats - non-blocking version
-    cpu_percent = psutil.cpu_percent(interval=0)
+def get_remote_resource(name):
+    """Get (registering on first use) a scheduled remote lookup"""
+    client = http_client.get_http_client()
+    return client.resource(name) or client.register(name, **REMOTE_RESOURCES[name])
+
+
+def register_remote_resources():
+    """Register all remote lookups so the background refresher picks them up"""
+    for name in REMOTE_RESOURCES:
+        get_remote_resource(name)
+
+
+def _cpu_temperature():
     cpu_temp = get_cpu_temp()
+    return round(cpu_temp, 1) if cpu_temp else None
+
+
+def _cpu_frequency():
     cpu_freq = psutil.cpu_freq()
-    cpu_per_core = get_cpu_per_core()
-    
-    # Memory stats
-    memory = psutil.virtual_memory()
-    swap = psutil.swap_memory()
-    
-    # Disk stats
-    disk = psutil.disk_usage('/')
-    partitions = get_partitions()
-    
-    # Network stats
+    return {
+        'frequency': round(cpu_freq.current, 0) if cpu_freq else None,
+        'frequency_max': round(cpu_freq.max, 0) if cpu_freq else None
+    }
+
+
+def _load_average(proc):
+    return {
+        '1min': round(proc.load1, 2),
+        '5min': round(proc.load5, 2),
+        '15min': round(proc.load15, 2)
+    }
+
+
+def _memory(proc):
+    return {
+        'total': round(proc.mem_total / (1024**3), 2),
+        'used': round(proc.mem_used / (1024**3), 2),
+        'percent': round(proc.mem_percent, 1),
+    }
+
+
+def _memory_detail(proc):
+    swap_used = proc.swap_total - proc.swap_free
+    return {
+        'available': round(proc.mem_available / (1024**3), 2),
+        'buffers': round(proc.buffers / (1024**3), 2),
+        'cached': round(proc.cached / (1024**3), 2),
+        'swap_total': round(proc.swap_total / (1024**3), 2),
+        'swap_used': round(swap_used / (1024**3), 2),
+        'swap_percent': round(swap_used * 100 / proc.swap_total, 1) if proc.swap_total else 0.0
+    }
+
+
+def _disk(disk_usage):
+    return {
+        'total': round(disk_usage.total / (1024**3), 2),
+        'used': round(disk_usage.used / (1024**3), 2),
+        'percent': round(disk_usage.percent, 1),
+    }
+
+
+def _network_io():
     network = psutil.net_io_counters()
-    network_interfaces = get_network_interfaces()
-    active_connections = len(psutil.net_connections())
-    
-    # System info
-    boot_time = datetime.fromtimestamp(psutil.boot_time())
-    uptime = get_uptime()
-    load_avg = os.getloadavg()
-    
-    # Processes
-    process_count = len(psutil.pids())
-    top_processes = get_top_processes()
-    logged_users = len(psutil.users())
-    
-    stats = {
-        'system_info': {
-            'hostname': socket.gethostname(),
-            'pi_model': get_pi_model(),
-            'os': get_os_info(),
-            'architecture': platform.machine(),
-            'cpu_cores': psutil.cpu_count(logical=False),
-            'cpu_threads': psutil.cpu_count(logical=True),
-            'boot_time': boot_time.strftime('%Y-%m-%d %H:%M:%S')
-        },
-        'cpu': {
-            'percent': round(cpu_percent, 1),
-            'temperature': round(cpu_temp, 1) if cpu_temp else None,
-            'frequency': round(cpu_freq.current, 0) if cpu_freq else None,
-            'frequency_max': round(cpu_freq.max, 0) if cpu_freq else None,
-            'per_core': [round(x, 1) for x in cpu_per_core],
-            'throttle': get_throttle_status(),
-            'load_average': {
-                '1min': round(load_avg[0], 2),
-                '5min': round(load_avg[1], 2),
-                '15min': round(load_avg[2], 2)
-            }
-        },
-        'memory': {
-            'total': round(memory.total / (1024**3), 2),
-            'used': round(memory.used / (1024**3), 2),
-            'percent': round(memory.percent, 1),
-            'available': round(memory.available / (1024**3), 2),
-            'buffers': round(memory.buffers / (1024**3), 2),
-            'cached': round(memory.cached / (1024**3), 2),
-            'swap_total': round(swap.total / (1024**3), 2),
-            'swap_used': round(swap.used / (1024**3), 2),
-            'swap_percent': round(swap.percent, 1),
-            'top_processes': top_processes
-        },
-        'disk': {
-            'total': round(disk.total / (1024**3), 2),
-            'used': round(disk.used / (1024**3), 2),
-            'free': round(disk.free / (1024**3), 2),
-            'percent': round(disk.percent, 1),
-            'partitions': partitions
-        },
-        'network': {
-            'bytes_sent': round(network.bytes_sent / (1024**2), 2),
-            'bytes_recv': round(network.bytes_recv / (1024**2), 2),
-            'interfaces': network_interfaces,
-            'active_connections': active_connections,
-            'wifi_signal': get_wifi_signal(),
-            'wifi_details': get_wifi_details(),
-            'public_ip': get_public_ip()
-        },
-        'system': {
-            'uptime': uptime,
-            'process_count': process_count,
-            'logged_users': logged_users,
-            'audio_devices': get_audio_devices()
-        },
-        'weather': get_weather()
+    return {
+        'bytes_sent': round(network.bytes_sent / (1024**2), 2),
+        'bytes_recv': round(network.bytes_recv / (1024**2), 2)
     }
-    
-    return stats
 
+
+def register_collectors(registry):
+    """
+    Register the system collectors: (name, function, interval s, options)
+
+    "stats" collectors make up get_all_stats() (the dashboard) and are
+    included in get_all_stats_detailed() as well.
+    """
+    both = ('stats', 'detailed')
+    internal = ()  # only used as dependencies
+    collectors = [
+        # Quick stats - sampled every second for history and the live stream
+        # (one pread pass over /proc/stat, meminfo, loadavg and uptime)
+        ('proc', procfs.sample, 1, dict(groups=internal)),
+        ('cpu_percent', lambda proc: round(proc.cpu_percent, 1), 1,
+         dict(key='cpu.percent', depends=['proc'], groups=both)),
+        ('cpu_temperature', _cpu_temperature, 1, dict(key='cpu.temperature', groups=both)),
+        ('memory', _memory, 1, dict(key='memory', depends=['proc'], groups=both)),
+        ('disk_usage', lambda: psutil.disk_usage('/'), 10, dict(groups=internal)),
+        ('disk', _disk, 10, dict(key='disk', depends=['disk_usage'], groups=both)),
+        ('uptime', lambda proc: _uptime_dict(proc.uptime), 1,
+         dict(key='system.uptime', depends=['proc'], groups=both)),
+
+        # Detailed stats
+        ('system_info', lambda: {'hostname': socket.gethostname(), **get_static_system_info()},
+         3600, dict(key='system_info')),
+        ('cpu_frequency', _cpu_frequency, 5, dict(key='cpu')),
+        ('cpu_per_core', lambda: [round(x, 1) for x in get_cpu_per_core()], 5,
+         dict(key='cpu.per_core')),
+        ('load_average', _load_average, 5, dict(key='cpu.load_average', depends=['proc'])),
+        ('throttle', get_throttle_status, 5, dict(key='cpu.throttle', cost='io', timeout=2.0)),
+        ('videocore', get_videocore_clocks_and_voltages, 10,
+         dict(key='cpu.videocore', cost='io', timeout=2.0)),
+        ('memory_detail', _memory_detail, 5, dict(key='memory', depends=['proc'])),
+        ('top_processes', get_top_processes, 10,
+         dict(key='memory.top_processes', cost='io', timeout=3.0)),
+        ('disk_free', lambda disk_usage: {'free': round(disk_usage.free / (1024**3), 2)}, 10,
+         dict(key='disk', depends=['disk_usage'])),
+        ('partitions', get_partitions, 60, dict(key='disk.partitions', cost='io', timeout=3.0)),
+        ('disk_io', lambda: disk_io.get_disk_io().stats(), 5, dict(key='disk.io')),
+        ('network_io', _network_io, 5, dict(key='network')),
+        ('network_interfaces', get_network_interfaces, 30,
+         dict(key='network.interfaces', cost='io', timeout=2.0)),
+        ('net_rates', lambda: net_rates.get_net_rates().rates(), 5, dict(key='network.rates')),
+        # Socket tables read from /proc/net - no PID resolution like psutil.net_connections()
+        ('connections', lambda: connections.get_connection_stats().stats(), 10,
+         dict(groups=internal)),
+        ('active_connections', lambda connections: connections['total'], 10,
+         dict(key='network.active_connections', depends=['connections'])),
+        ('tcp_states', lambda connections: connections['tcp_states'], 10,
+         dict(key='network.tcp_states', depends=['connections'])),
+        ('wifi_signal', get_wifi_signal, 10, dict(key='network.wifi_signal', cost='io', timeout=2.0)),
+        ('wifi_details', get_wifi_details, 10,
+         dict(key='network.wifi_details', cost='io', timeout=3.0)),
+        ('public_ip', get_public_ip, 60, dict(key='network.public_ip', cost='network', timeout=5.0)),
+        ('process_count', lambda: len(psutil.pids()), 5, dict(key='system.process_count')),
+        ('logged_users', lambda: len(psutil.users()), 60, dict(key='system.logged_users')),
+        ('audio_devices', get_audio_devices, 60,
+         dict(key='system.audio_devices', cost='io', timeout=2.0)),
+        ('weather', get_weather, 600, dict(key='weather', cost='network', timeout=8.0)),
+    ]
+    for name, func, interval, options in collectors:
+        registry.register(name, func, interval, **options)
+
+
+register_collectors(collectors.get_registry())
+
+
+def get_all_stats():
+    """Get the dashboard statistics - runs only the collectors that are due"""
+    # Only collect stats that the UI actually displays; each source runs on
+    # its own cadence (temperature every second, disk usage every 10s)
+    return collectors.get_registry().collect('stats')
+
+
+def get_all_stats_detailed():
+    """Get all system statistics (verbose version for the system info page)"""
+    # Slow sources run in parallel; anything that misses its timeout
+    # keeps its last good value and is flagged in 'collection'
+    registry = collectors.get_registry()
+    stats = registry.collect('detailed')
+    stats['collection'] = registry.collection_status('detailed')
+    return stats
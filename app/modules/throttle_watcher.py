@@ -0,0 +1,233 @@
+"""Throttle watcher module - records throttling and under-voltage transitions
+
+get_throttle_status() only shows the bitmask at the moment a page asks for it,
+so a 300ms supply dip between page views leaves nothing but the sticky
+"occurred" bit. The watcher reads the bitmask from the VideoCore mailbox (a
+single in-process ioctl) every 200ms and stores only the edges - a flag being
+set or cleared - in a fixed-size log.
+
+It also follows the kernel log (/dev/kmsg, non-blocking) for the firmware
+driver's "Undervoltage detected!" / "Voltage normalised" messages, so each
+under-voltage edge can be matched with the kernel's own report.
+"""
+import errno
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from app.modules import videocore
+from app.modules.videocore import THROTTLE_FLAGS
+
+logger = logging.getLogger(__name__)
+
+KERNEL_PATTERN = re.compile(r'under-?voltage detected|voltage normali[sz]ed', re.IGNORECASE)
+CORRELATION_WINDOW = 2.0  # seconds between a bit edge and the matching kernel message
+FLAG_NAMES = {bit: flag for flag, bit in THROTTLE_FLAGS.items()}
+
+
+class ThrottleWatcher:
+    """Samples throttle bits at high frequency and logs their edges"""
+
+    def __init__(self, telemetry=None, interval: float = 0.2, size: int = 1000,
+                 kmsg_path: Optional[str] = '/dev/kmsg'):
+        """
+        Initialize the watcher
+
+        Args:
+            telemetry: VideoCoreTelemetry (the global one when None)
+            interval: Seconds between bitmask reads
+            size: Edges (and kernel messages) kept in the log
+            kmsg_path: Kernel log device (None disables kernel cross-referencing)
+        """
+        self.telemetry = telemetry
+        self.interval = interval
+        self.edges = deque(maxlen=size)  # (epoch time, bit, set?)
+        self.kernel = deque(maxlen=size)  # (epoch time, message)
+        self.kmsg_path = kmsg_path
+        self.kmsg_fd = None
+        self.bits = None  # last bitmask read
+        self.samples = 0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start the watcher thread"""
+        if self.thread is not None:
+            return
+        if self.telemetry is None:
+            self.telemetry = videocore.get_telemetry()
+        self._open_kmsg()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='throttle-watcher', daemon=True)
+        self.thread.start()
+        logger.info(f"Throttle watcher started ({self.interval * 1000:.0f}ms)")
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        if self.kmsg_fd is not None:
+            os.close(self.kmsg_fd)
+            self.kmsg_fd = None
+
+    def _run(self):
+        next_run = time.monotonic()
+        while not self.stop_event.is_set():
+            try:
+                if not self.poll():
+                    logger.warning("Throttle bits unavailable - throttle watcher stopped")
+                    return
+            except Exception as e:
+                logger.error(f"Throttle watcher error: {e}", exc_info=True)
+            next_run += self.interval
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                next_run = time.monotonic()  # fell behind - don't try to catch up
+                delay = 0
+            self.stop_event.wait(delay)
+
+    def poll(self, now: Optional[float] = None) -> bool:
+        """
+        Read the bitmask once and record edges
+
+        Returns:
+            False when no throttle source is available
+        """
+        value = self.telemetry.throttled()
+        if value is None:
+            return False
+        now = time.time() if now is None else now
+        with self.lock:
+            self.samples += 1
+            if self.bits is not None:
+                changed = (value ^ self.bits) & 0xF
+                for bit in FLAG_NAMES:
+                    if changed & bit:
+                        self.edges.append((now, bit, bool(value & bit)))
+            self.bits = value
+        self._read_kmsg()
+        return True
+
+    def _open_kmsg(self):
+        if self.kmsg_path is None or self.kmsg_fd is not None:
+            return
+        try:
+            self.kmsg_fd = os.open(self.kmsg_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError as e:
+            logger.info(f"Kernel log unavailable ({e}) - no kernel cross-reference")
+
+    def _read_kmsg(self):
+        """Drain new kernel log records without blocking"""
+        if self.kmsg_fd is None:
+            return
+        # kmsg timestamps are microseconds since boot
+        boot = time.time() - time.monotonic()
+        while True:
+            try:
+                data = os.read(self.kmsg_fd, 8192)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                if e.errno == errno.EPIPE:
+                    continue  # records overwritten before we read them
+                raise
+            if not data:
+                return
+            for line in data.decode('utf-8', 'replace').splitlines():
+                # "<priority>,<seq>,<usec>,<flags>;<message>" (continuation lines start with a space)
+                header, _, message = line.partition(';')
+                if not message or not KERNEL_PATTERN.search(message):
+                    continue
+                fields = header.split(',')
+                try:
+                    timestamp = boot + int(fields[2]) / 1e6
+                except (IndexError, ValueError):
+                    timestamp = time.time()
+                with self.lock:
+                    self.kernel.append((timestamp, message.strip()))
+
+    def events(self, since: Optional[float] = None, limit: int = 100) -> List[dict]:
+        """
+        Edges (newest first), each with the matching kernel message if any
+
+        Args:
+            since: Only edges after this epoch time
+            limit: Maximum events returned
+        """
+        with self.lock:
+            edges = list(self.edges)
+            kernel = list(self.kernel)
+
+        events = []
+        for timestamp, bit, is_set in reversed(edges):
+            if since is not None and timestamp <= since:
+                break
+            event = {'timestamp': round(timestamp, 3), 'flag': FLAG_NAMES[bit],
+                     'state': 'set' if is_set else 'cleared'}
+            if bit == THROTTLE_FLAGS['under_voltage']:
+                # Kernel messages are logged on both edges of an under-voltage episode
+                for kernel_time, message in kernel:
+                    if abs(kernel_time - timestamp) <= CORRELATION_WINDOW:
+                        event['kernel'] = message
+                        break
+            events.append(event)
+            if len(events) >= limit:
+                break
+        return events
+
+    def kernel_messages(self, since: Optional[float] = None) -> List[dict]:
+        """Under-voltage kernel messages (newest first)"""
+        with self.lock:
+            kernel = list(self.kernel)
+        return [{'timestamp': round(t, 3), 'message': m} for t, m in reversed(kernel)
+                if since is None or t > since]
+
+    def status(self) -> dict:
+        with self.lock:
+            bits = self.bits
+            return {
+                'running': self.thread is not None and self.thread.is_alive(),
+                'interval': self.interval,
+                'samples': self.samples,
+                'kernel_log': self.kmsg_fd is not None,
+                'current': {flag: bool(bits & bit) for flag, bit in THROTTLE_FLAGS.items()}
+                if bits is not None else None
+            }
+
+
+# Global watcher instance
+_watcher: Optional[ThrottleWatcher] = None
+
+
+def get_throttle_watcher() -> Optional[ThrottleWatcher]:
+    """Get the global throttle watcher instance"""
+    return _watcher
+
+
+def init_throttle_watcher(interval: float = 0.2, size: int = 1000) -> ThrottleWatcher:
+    """Initialize and start the global throttle watcher"""
+    global _watcher
+
+    if _watcher is not None:
+        logger.warning("Throttle watcher already initialized")
+        return _watcher
+
+    _watcher = ThrottleWatcher(interval=interval, size=size)
+    _watcher.start()
+    return _watcher
+
+
+def shutdown_throttle_watcher():
+    """Stop the global throttle watcher"""
+    global _watcher
+
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -0,0 +1,263 @@
+"""VideoCore telemetry module - fork-free firmware readings
+
+Reads temperature, throttle bits, clocks and voltages in-process instead of
+spawning `vcgencmd` (tens of milliseconds per fork on a Pi 3B). Two backends:
+
+- mailbox: firmware property interface via ioctl on /dev/vcio (needs the
+  `video` group, same as vcgencmd)
+- sysfs: kernel attributes kept open and re-read with pread (temperature,
+  ARM clock and - on kernels that expose it - throttle bits)
+
+FakeVcio answers the same mailbox messages in memory so the encoding and
+decoding can be exercised off-Pi.
+"""
+import fcntl
+import logging
+import os
+import struct
+import threading
+from array import array
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# ioctl request for /dev/vcio: _IOWR(100, 0, char *)
+IOCTL_MBOX_PROPERTY = (3 << 30) | (struct.calcsize('P') << 16) | (100 << 8)
+
+# Mailbox property tags
+TAG_GET_CLOCK_RATE = 0x00030002
+TAG_GET_VOLTAGE = 0x00030003
+TAG_GET_TEMPERATURE = 0x00030006
+TAG_GET_THROTTLED = 0x00030046
+
+REQUEST_CODE = 0x00000000
+RESPONSE_SUCCESS = 0x80000000
+TAG_RESPONSE = 0x80000000
+
+# Clock and voltage ids (firmware mailbox property interface)
+CLOCKS = {'arm': 3, 'core': 4, 'v3d': 5, 'h264': 6, 'isp': 7, 'sdram': 8, 'emmc': 1, 'uart': 2}
+VOLTAGES = {'core': 1, 'sdram_c': 2, 'sdram_p': 3, 'sdram_i': 4}
+
+# Throttle bits (same as `vcgencmd get_throttled`): flag -> bit set while the
+# condition is present; the sticky "occurred since boot" bit is 16 bits higher
+THROTTLE_FLAGS = {'under_voltage': 0x1, 'freq_capped': 0x2, 'throttled': 0x4, 'soft_temp_limit': 0x8}
+THROTTLE_OCCURRED_SHIFT = 16
+
+# sysfs attributes (relative to sysfs_root)
+SYSFS_TEMPERATURE = 'sys/class/thermal/thermal_zone0/temp'
+SYSFS_THROTTLED = 'sys/devices/platform/soc/soc:firmware/get_throttled'
+SYSFS_ARM_FREQ = 'sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq'
+
+
+class MailboxError(Exception):
+    """Raised when the firmware rejects or cannot answer a property request"""
+
+
+class VcioDevice:
+    """Real /dev/vcio mailbox device"""
+
+    def __init__(self, path: str = '/dev/vcio'):
+        self.fd = os.open(path, os.O_RDWR)
+
+    def ioctl(self, buffer: array):
+        """Send a property message; the firmware writes responses into the buffer"""
+        fcntl.ioctl(self.fd, IOCTL_MBOX_PROPERTY, buffer, True)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FakeVcio:
+    """
+    In-memory stand-in for /dev/vcio
+
+    Parses property messages exactly like the firmware does and answers from
+    the values below, so VideoCoreTelemetry can be tested without a Pi.
+    """
+
+    def __init__(self, temperature: float = 45.0, throttled: int = 0,
+                 clocks: Optional[Dict[str, int]] = None,
+                 voltages: Optional[Dict[str, float]] = None):
+        self.temperature = temperature
+        self.throttled = throttled
+        self.clocks = clocks or {'arm': 1200000000, 'core': 400000000, 'sdram': 450000000}
+        self.voltages = voltages or {'core': 1.2875, 'sdram_c': 1.2, 'sdram_p': 1.225, 'sdram_i': 1.2}
+        self.calls = 0
+
+    def ioctl(self, buffer: array):
+        self.calls += 1
+        clock_ids = {v: k for k, v in CLOCKS.items()}
+        voltage_ids = {v: k for k, v in VOLTAGES.items()}
+
+        i = 2
+        while buffer[i] != 0:
+            tag, size = buffer[i], buffer[i + 1]
+            value_at = i + 3
+            if tag == TAG_GET_TEMPERATURE:
+                buffer[value_at + 1] = int(self.temperature * 1000)
+            elif tag == TAG_GET_THROTTLED:
+                buffer[value_at] = self.throttled
+            elif tag == TAG_GET_CLOCK_RATE:
+                name = clock_ids.get(buffer[value_at])
+                buffer[value_at + 1] = self.clocks.get(name, 0)
+            elif tag == TAG_GET_VOLTAGE:
+                name = voltage_ids.get(buffer[value_at])
+                buffer[value_at + 1] = int(self.voltages.get(name, 0) * 1000000)
+            else:
+                raise MailboxError(f"Unsupported tag 0x{tag:08x}")
+            buffer[i + 2] = TAG_RESPONSE | min(size, 8)
+            i = value_at + size // 4
+        buffer[1] = RESPONSE_SUCCESS
+
+    def close(self):
+        pass
+
+
+class VideoCoreTelemetry:
+    """Reads VideoCore firmware telemetry without forking vcgencmd"""
+
+    def __init__(self, device=None, sysfs_root: str = '/', use_mailbox: bool = True):
+        """
+        Initialize the telemetry reader
+
+        Args:
+            device: Mailbox device (VcioDevice, FakeVcio) - opens /dev/vcio when None
+            sysfs_root: Root for sysfs fallback paths (tests point this at a temp dir)
+            use_mailbox: Set False to only use sysfs
+        """
+        self.sysfs_root = sysfs_root
+        self.device = device
+        self.lock = threading.Lock()
+        self._fds: Dict[str, Optional[int]] = {}
+
+        if self.device is None and use_mailbox:
+            try:
+                self.device = VcioDevice()
+            except OSError as e:
+                logger.info(f"VideoCore mailbox unavailable ({e}), using sysfs")
+
+        # Reused message buffer: header + one tag with 2 value words + end tag
+        self._buffer = array('I', bytes(4 * 8))
+
+    @property
+    def source(self) -> str:
+        """Backend in use: "mailbox" or "sysfs" """
+        return 'mailbox' if self.device is not None else 'sysfs'
+
+    def _property(self, tag: int, *args: int) -> Optional[array]:
+        """Send a single-tag property request and return its two value words"""
+        if self.device is None:
+            return None
+
+        # The buffer is shared by the throttle watcher, the sampler and pooled
+        # collectors: fill, send and decode it under one lock
+        with self.lock:
+            buffer = self._buffer
+            buffer[0] = len(buffer) * 4
+            buffer[1] = REQUEST_CODE
+            buffer[2] = tag
+            buffer[3] = 8  # value buffer size in bytes
+            buffer[4] = 4 * len(args)  # request length
+            buffer[5] = args[0] if args else 0
+            buffer[6] = 0
+            buffer[7] = 0  # end tag
+            try:
+                self.device.ioctl(buffer)
+            except (OSError, MailboxError) as e:
+                logger.debug(f"Mailbox request 0x{tag:08x} failed: {e}")
+                return None
+            if buffer[1] != RESPONSE_SUCCESS or not buffer[4] & TAG_RESPONSE:
+                return None
+            return buffer[5:7]  # copy, the buffer is reused by the next caller
+
+    def _read_sysfs(self, relative_path: str) -> Optional[str]:
+        """Re-read a sysfs attribute through a cached file descriptor"""
+        fd = self._fds.get(relative_path, -1)
+        if fd == -1:
+            try:
+                fd = os.open(os.path.join(self.sysfs_root, relative_path), os.O_RDONLY)
+            except OSError:
+                fd = None
+            self._fds[relative_path] = fd
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, 64, 0).decode().strip()
+        except OSError:
+            return None
+
+    def temperature(self) -> Optional[float]:
+        """SoC temperature in °C"""
+        values = self._property(TAG_GET_TEMPERATURE, 0)
+        if values is not None:
+            return values[1] / 1000.0
+        raw = self._read_sysfs(SYSFS_TEMPERATURE)
+        return int(raw) / 1000.0 if raw else None
+
+    def throttled(self) -> Optional[int]:
+        """Throttle bitmask (same bits as `vcgencmd get_throttled`)"""
+        values = self._property(TAG_GET_THROTTLED, 0)
+        if values is not None:
+            return values[0]
+        raw = self._read_sysfs(SYSFS_THROTTLED)
+        return int(raw, 16) if raw else None
+
+    def clock(self, name: str) -> Optional[int]:
+        """Clock rate in Hz (e.g. "arm", "core", "sdram")"""
+        values = self._property(TAG_GET_CLOCK_RATE, CLOCKS[name])
+        if values is not None:
+            return values[1]
+        if name == 'arm':
+            raw = self._read_sysfs(SYSFS_ARM_FREQ)
+            return int(raw) * 1000 if raw else None
+        return None
+
+    def voltage(self, name: str) -> Optional[float]:
+        """Voltage in volts (e.g. "core", "sdram_c") - mailbox only"""
+        values = self._property(TAG_GET_VOLTAGE, VOLTAGES[name])
+        if values is not None:
+            return values[1] / 1000000.0
+        return None
+
+    def clocks(self) -> Dict[str, Optional[int]]:
+        """ARM, core and SDRAM clock rates in Hz"""
+        return {name: self.clock(name) for name in ('arm', 'core', 'sdram')}
+
+    def voltages(self) -> Dict[str, Optional[float]]:
+        """Core and SDRAM voltages in volts"""
+        return {name: self.voltage(name) for name in VOLTAGES}
+
+    def read_all(self) -> dict:
+        """All telemetry in one call"""
+        return {
+            'source': self.source,
+            'temperature': self.temperature(),
+            'throttled': self.throttled(),
+            'clocks': self.clocks(),
+            'voltages': self.voltages()
+        }
+
+    def close(self):
+        """Release the mailbox device and cached sysfs descriptors"""
+        if self.device is not None:
+            self.device.close()
+            self.device = None
+        for fd in self._fds.values():
+            if fd is not None:
+                os.close(fd)
+        self._fds.clear()
+
+
+# Global telemetry reader
+_telemetry: Optional[VideoCoreTelemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> VideoCoreTelemetry:
+    """Get or create the global telemetry reader"""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = VideoCoreTelemetry()
+    return _telemetry
@@ -0,0 +1,327 @@
+"""WiFi collector module - reads link state in-process
+
+Replaces forking iwconfig/iw and scraping their text output:
+
+- /proc/net/wireless gives link quality, signal and noise levels
+- nl80211 over a generic netlink socket gives SSID, frequency, TX power and
+  the station's signal and bitrates
+
+One reading is shared by get_wifi_signal() and get_wifi_details() for a
+short time so /api/system/info only reads the interface once.
+"""
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROC_NET_WIRELESS = '/proc/net/wireless'
+
+# Netlink / generic netlink constants
+NETLINK_GENERIC = 16
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 0x2
+NLMSG_DONE = 0x3
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+NLA_TYPE_MASK = 0x3fff
+
+# nl80211 commands and attributes
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_STA_INFO = 21
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_SSID = 52
+NL80211_ATTR_WIPHY_TX_POWER_LEVEL = 98
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_STA_INFO_RX_BITRATE = 14
+NL80211_RATE_INFO_BITRATE = 1
+NL80211_RATE_INFO_BITRATE32 = 5
+
+NLMSGHDR = struct.Struct('=IHHII')  # len, type, flags, seq, pid
+GENLMSGHDR = struct.Struct('=BBH')  # cmd, version, reserved
+NLATTR = struct.Struct('=HH')  # len, type
+
+WifiReading = namedtuple('WifiReading', [
+    'interface',
+    'connected',
+    'ssid',
+    'frequency_mhz',
+    'signal_dbm',
+    'noise_dbm',
+    'link_quality',  # (current, max) or None
+    'tx_bitrate_mbps',
+    'rx_bitrate_mbps',
+    'tx_power_dbm',
+    'timestamp',
+])
+
+
+def band_for_frequency(frequency_mhz: Optional[int]) -> Optional[str]:
+    """Map a channel frequency to its WiFi band label"""
+    if not frequency_mhz:
+        return None
+    if 2400 <= frequency_mhz < 2500:
+        return '2.4 GHz'
+    if 5000 <= frequency_mhz < 5925:
+        return '5 GHz'
+    if frequency_mhz >= 5925:
+        return '6 GHz (WiFi 6E)'
+    return None
+
+
+def signal_quality_percent(dbm: Optional[int]) -> Optional[int]:
+    """Signal quality percentage (assuming a -100 to -50 dBm range)"""
+    if dbm is None:
+        return None
+    return min(100, max(0, 2 * (dbm + 100)))
+
+
+def parse_proc_net_wireless(text: str) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Parse /proc/net/wireless
+
+    Returns:
+        {interface: (link quality, signal dBm, noise dBm)}
+    """
+    result = {}
+    for line in text.splitlines()[2:]:
+        if ':' not in line:
+            continue
+        name, fields = line.split(':', 1)
+        fields = fields.split()
+        if len(fields) < 4:
+            continue
+        # Values carry a trailing '.' when updated since the last read
+        link, level, noise = (int(float(f.rstrip('.'))) for f in fields[1:4])
+        result[name.strip()] = (link, level, noise)
+    return result
+
+
+def _attributes(data: bytes, offset: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+    """Iterate over netlink attributes as (type, payload)"""
+    end = len(data) if end is None else end
+    while offset + NLATTR.size <= end:
+        length, attr_type = NLATTR.unpack_from(data, offset)
+        if length < NLATTR.size or offset + length > end:
+            break
+        yield attr_type & NLA_TYPE_MASK, data[offset + NLATTR.size:offset + length]
+        offset += (length + 3) & ~3
+
+
+def _attr(attr_type: int, payload: bytes) -> bytes:
+    """Encode one netlink attribute (padded to 4 bytes)"""
+    length = NLATTR.size + len(payload)
+    return NLATTR.pack(length, attr_type) + payload + b'\x00' * (-length % 4)
+
+
+def _bitrate_mbps(rate_info: bytes) -> Optional[float]:
+    """Decode a nested NL80211_RATE_INFO attribute into Mbit/s"""
+    rates = dict(_attributes(rate_info))
+    if NL80211_RATE_INFO_BITRATE32 in rates:
+        return struct.unpack('=I', rates[NL80211_RATE_INFO_BITRATE32][:4])[0] / 10.0
+    if NL80211_RATE_INFO_BITRATE in rates:
+        return struct.unpack('=H', rates[NL80211_RATE_INFO_BITRATE][:2])[0] / 10.0
+    return None
+
+
+class Nl80211:
+    """Minimal nl80211 client over a persistent generic netlink socket"""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC)
+        self.sock.settimeout(1.0)
+        self.sock.bind((0, 0))
+        self.seq = int(time.time())
+        self.family_id = self._resolve_family('nl80211')
+
+    def close(self):
+        self.sock.close()
+
+    def _request(self, msg_type: int, cmd: int, attrs: bytes, flags: int = 0) -> List[bytes]:
+        """Send a generic netlink request and collect the payloads of all replies"""
+        self.seq += 1
+        body = GENLMSGHDR.pack(cmd, 1, 0) + attrs
+        header = NLMSGHDR.pack(NLMSGHDR.size + len(body), msg_type, NLM_F_REQUEST | flags, self.seq, 0)
+        self.sock.send(header + body)
+
+        payloads = []
+        while True:
+            data = self.sock.recv(65536)
+            offset = 0
+            while offset + NLMSGHDR.size <= len(data):
+                length, kind, _, seq, _ = NLMSGHDR.unpack_from(data, offset)
+                if length < NLMSGHDR.size:
+                    return payloads
+                if seq == self.seq:
+                    if kind == NLMSG_DONE:
+                        return payloads
+                    if kind == NLMSG_ERROR:
+                        error = struct.unpack_from('=i', data, offset + NLMSGHDR.size)[0]
+                        if error:
+                            raise OSError(-error, os.strerror(-error))
+                        return payloads
+                    payloads.append(data[offset + NLMSGHDR.size + GENLMSGHDR.size:offset + length])
+                offset += (length + 3) & ~3
+            if not flags & NLM_F_DUMP and payloads:
+                return payloads
+
+    def _resolve_family(self, name: str) -> int:
+        """Look up a generic netlink family id"""
+        replies = self._request(GENL_ID_CTRL, CTRL_CMD_GETFAMILY,
+                                _attr(CTRL_ATTR_FAMILY_NAME, name.encode() + b'\x00'))
+        for payload in replies:
+            for attr_type, value in _attributes(payload):
+                if attr_type == CTRL_ATTR_FAMILY_ID:
+                    return struct.unpack('=H', value[:2])[0]
+        raise OSError(f"Generic netlink family {name} not found")
+
+    def interface(self, ifindex: int) -> dict:
+        """SSID, frequency (MHz) and TX power (dBm) of an interface"""
+        replies = self._request(self.family_id, NL80211_CMD_GET_INTERFACE,
+                                _attr(NL80211_ATTR_IFINDEX, struct.pack('=I', ifindex)))
+        info = {}
+        for payload in replies:
+            for attr_type, value in _attributes(payload):
+                if attr_type == NL80211_ATTR_SSID:
+                    info['ssid'] = value.decode('utf-8', 'replace')
+                elif attr_type == NL80211_ATTR_WIPHY_FREQ:
+                    info['frequency_mhz'] = struct.unpack('=I', value[:4])[0]
+                elif attr_type == NL80211_ATTR_WIPHY_TX_POWER_LEVEL:
+                    info['tx_power_dbm'] = struct.unpack('=I', value[:4])[0] // 100  # mBm
+        return info
+
+    def station(self, ifindex: int) -> dict:
+        """Signal (dBm) and bitrates (Mbit/s) of the access point we are associated with"""
+        replies = self._request(self.family_id, NL80211_CMD_GET_STATION,
+                                _attr(NL80211_ATTR_IFINDEX, struct.pack('=I', ifindex)),
+                                flags=NLM_F_DUMP)
+        info = {}
+        for payload in replies:
+            for attr_type, value in _attributes(payload):
+                if attr_type != NL80211_ATTR_STA_INFO:
+                    continue
+                for sta_type, sta_value in _attributes(value):
+                    if sta_type == NL80211_STA_INFO_SIGNAL:
+                        info['signal_dbm'] = struct.unpack('=b', sta_value[:1])[0]
+                    elif sta_type == NL80211_STA_INFO_TX_BITRATE:
+                        info['tx_bitrate_mbps'] = _bitrate_mbps(sta_value)
+                    elif sta_type == NL80211_STA_INFO_RX_BITRATE:
+                        info['rx_bitrate_mbps'] = _bitrate_mbps(sta_value)
+            if info:
+                break  # first station is the AP on a managed interface
+        return info
+
+
+class WifiCollector:
+    """Reads WiFi link state for one interface and shares it between consumers"""
+
+    def __init__(self, interface: str = 'wlan0', max_age: float = 2.0,
+                 proc_path: str = PROC_NET_WIRELESS):
+        """
+        Initialize the WiFi collector
+
+        Args:
+            interface: Wireless interface name
+            max_age: Seconds a reading is reused before reading again
+            proc_path: Path to /proc/net/wireless (overridable for tests)
+        """
+        self.interface = interface
+        self.max_age = max_age
+        self.proc_path = proc_path
+        self.lock = threading.Lock()
+        self._reading: Optional[WifiReading] = None
+        self._nl: Optional[Nl80211] = None
+        self._nl_failed = False
+
+    def _netlink(self) -> Optional[Nl80211]:
+        """Open the nl80211 socket once (stays None if unsupported)"""
+        if self._nl is None and not self._nl_failed:
+            try:
+                self._nl = Nl80211()
+            except OSError as e:
+                self._nl_failed = True
+                logger.info(f"nl80211 unavailable ({e}), using /proc/net/wireless only")
+        return self._nl
+
+    def _read_proc(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            with open(self.proc_path, 'r') as f:
+                return parse_proc_net_wireless(f.read()).get(self.interface)
+        except OSError:
+            return None
+
+    def read(self) -> WifiReading:
+        """Get the current reading (shared while younger than max_age)"""
+        with self.lock:
+            now = time.monotonic()
+            if self._reading is not None and now - self._reading.timestamp < self.max_age:
+                return self._reading
+            self._reading = self._collect(now)
+            return self._reading
+
+    def _collect(self, now: float) -> WifiReading:
+        values = {}
+        proc = self._read_proc()
+        if proc is not None:
+            link, level, noise = proc
+            values['link_quality'] = (link, 70)
+            values['signal_dbm'] = level
+            # -256 means the driver does not report noise
+            values['noise_dbm'] = noise if noise > -256 else None
+
+        try:
+            ifindex = socket.if_nametoindex(self.interface)
+        except OSError:
+            ifindex = None  # interface does not exist
+
+        nl = self._netlink() if ifindex is not None else None
+        if nl is not None:
+            try:
+                values.update(nl.interface(ifindex))
+                values.update(nl.station(ifindex))
+            except OSError as e:
+                logger.debug(f"nl80211 query for {self.interface} failed: {e}")
+                # Socket may be in a bad state - reopen on the next read
+                nl.close()
+                self._nl = None
+
+        connected = bool(values.get('ssid')) or values.get('signal_dbm') is not None
+        return WifiReading(
+            interface=self.interface,
+            connected=connected,
+            ssid=values.get('ssid') or None,
+            frequency_mhz=values.get('frequency_mhz'),
+            signal_dbm=values.get('signal_dbm'),
+            noise_dbm=values.get('noise_dbm'),
+            link_quality=values.get('link_quality'),
+            tx_bitrate_mbps=values.get('tx_bitrate_mbps'),
+            rx_bitrate_mbps=values.get('rx_bitrate_mbps'),
+            tx_power_dbm=values.get('tx_power_dbm'),
+            timestamp=now
+        )
+
+
+# Global collector instance
+_collector: Optional[WifiCollector] = None
+_collector_lock = threading.Lock()
+
+
+def get_wifi_collector() -> WifiCollector:
+    """Get or create the global WiFi collector"""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                _collector = WifiCollector()
+    return _collector
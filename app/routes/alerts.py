@@ -0,0 +1,38 @@
+"""Alerts API routes - active and recently resolved alerts"""
+from flask import Blueprint, jsonify
+from app.modules.alerts import get_alert_engine
+
+alerts_bp = Blueprint('alerts', __name__)
+
+
+@alerts_bp.route('')
+def alerts():
+    """Get pending/firing alerts and recently resolved ones"""
+    engine = get_alert_engine()
+    if engine is None:
+        return jsonify({'success': False, 'error': 'Alerts not enabled'}), 503
+    
+    try:
+        active = engine.active()
+        return jsonify({
+            'success': True,
+            'active': active,
+            'firing': sum(1 for alert in active if alert['state'] == 'firing'),
+            'resolved': engine.resolved()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@alerts_bp.route('/rules')
+def rules():
+    """Get the loaded alert rules"""
+    engine = get_alert_engine()
+    if engine is None:
+        return jsonify({'success': False, 'error': 'Alerts not enabled'}), 503
+    
+    return jsonify({
+        'success': True,
+        'rules': [rule.to_dict() for rule in engine.rules],
+        'notifiers': [type(notifier).__name__ for notifier in engine.notifiers]
+    })
@@ -0,0 +1,133 @@
+"""Batch API route - several GET endpoints in one round trip
+
+POST /api/batch with {"requests": ["/api/services/raspotify/status", ...]}
+dispatches each path in-process (no HTTP loopback) and returns every result
+in one response. Paths run concurrently on a small thread pool; GPIO routes
+touch hardware through a single line request, so they run one after another
+in the request thread instead.
+
+Each path runs with the caller's Accept, Authorization and Cookie headers, so
+it answers exactly as a direct fetch would. Every entry carries its ETag (for
+conditional endpoints); sending it back in "etags" makes that path
+conditional, answered with a bodyless 304 while it is unchanged. The batch
+response itself is MessagePack-encoded when the caller asks for it.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from flask import Blueprint, jsonify, request, current_app
+from werkzeug.exceptions import HTTPException
+
+from app.encoding import decode, negotiate
+
+batch_bp = Blueprint('batch', __name__)
+
+# Never dispatched from a batch: long-lived streams
+EXCLUDED_ENDPOINTS = {'system.stream'}
+# Blueprints whose routes must not run concurrently with each other
+SERIAL_BLUEPRINTS = {'gpio'}
+# Caller headers every sub-request runs with (If-None-Match comes per path from "etags")
+FORWARDED_HEADERS = ('Accept', 'Authorization', 'Cookie')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get or create the shared batch worker pool"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config['BATCH_MAX_WORKERS'],
+                    thread_name_prefix='batch'
+                )
+    return _executor
+
+
+def _dispatch(app, path: str, headers: Dict[str, str]) -> dict:
+    """Run one GET request through the app and capture its decoded result"""
+    started = time.monotonic()
+    try:
+        with app.test_request_context(path, method='GET', headers=headers):
+            response = app.full_dispatch_request()
+        result = {'status': response.status_code}
+        if response.headers.get('ETag'):
+            result['etag'] = response.headers['ETag']
+        if response.status_code != 304:
+            try:
+                result['body'] = decode(response)
+            except ValueError as e:
+                result['error'] = str(e)
+    except Exception as e:
+        app.logger.error(f"Batch request {path} failed: {e}")
+        result = {'status': 500, 'error': str(e)}
+    result['duration'] = round(time.monotonic() - started, 3)
+    return result
+
+
+@batch_bp.route('', methods=['POST'])
+def batch():
+    """Dispatch a list of GET routes and return all results"""
+    data = request.get_json(silent=True) or {}
+    paths = data.get('requests')
+    if not isinstance(paths, list) or not paths or not all(isinstance(p, str) for p in paths):
+        return jsonify({'success': False, 'error': 'requests must be a non-empty list of paths'}), 400
+
+    etags = data.get('etags', {})
+    if not isinstance(etags, dict) or not all(isinstance(e, str) for e in etags.values()):
+        return jsonify({'success': False, 'error': 'etags must map paths to ETag strings'}), 400
+
+    max_requests = current_app.config['BATCH_MAX_REQUESTS']
+    if len(paths) > max_requests:
+        return jsonify({
+            'success': False,
+            'error': f'Too many requests (maximum {max_requests})'
+        }), 400
+
+    try:
+        app = current_app._get_current_object()
+        adapter = app.url_map.bind('localhost')
+        started = time.monotonic()
+
+        forwarded = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+        headers = {path: {**forwarded, 'If-None-Match': etags[path]} if path in etags else forwarded
+                   for path in paths}
+
+        responses, parallel, serial = {}, [], []
+        for path in dict.fromkeys(paths):  # duplicates are answered once
+            try:
+                endpoint, _ = adapter.match(urlsplit(path).path, method='GET')
+            except HTTPException as e:
+                responses[path] = {'status': e.code, 'error': e.name}
+                continue
+            if endpoint in EXCLUDED_ENDPOINTS:
+                responses[path] = {'status': 400, 'error': 'Endpoint cannot be batched'}
+            elif endpoint.split('.', 1)[0] in SERIAL_BLUEPRINTS:
+                serial.append(path)
+            else:
+                parallel.append(path)
+
+        executor = _get_executor()
+        futures = {path: executor.submit(_dispatch, app, path, headers[path]) for path in parallel}
+        for path in serial:
+            responses[path] = _dispatch(app, path, headers[path])
+
+        deadline = started + current_app.config['BATCH_TIMEOUT']
+        for path, future in futures.items():
+            try:
+                responses[path] = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                responses[path] = {'status': 504, 'error': 'Timed out'}
+
+        return negotiate({
+            'success': True,
+            'responses': responses,
+            'duration': round(time.monotonic() - started, 3)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -1,6 +1,8 @@
 """GPIO API routes - REST endpoints for GPIO control"""
 from flask import Blueprint, jsonify, request
 from app.modules import gpio_control
+from app.modules.delta import get_delta_tracker
+from app.conditional import conditional, counter_version
 
 gpio_bp = Blueprint('gpio', __name__)
 
@@ -12,6 +14,7 @@ def health():
 
 
 @gpio_bp.route('/pins')
+@conditional(lambda: counter_version(gpio_control.get_gpio_controller()))
 def get_pins():
     """Get all configured GPIO pins with current states"""
     try:
@@ -25,12 +28,13 @@ def get_pins():
                 grouped[group] = []
             grouped[group].append(pin)
         
-        return jsonify({
-            'success': True,
+        # ?since=<version> returns only the fields changed since that version
+        body = get_delta_tracker('gpio_pins').respond({
             'pins': pins,
             'grouped': grouped,
             'count': len(pins)
-        })
+        }, since=request.args.get('since', type=int))
+        return jsonify({'success': True, **body})
     except Exception as e:
         return jsonify({
             'success': False,
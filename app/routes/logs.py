@@ -2,6 +2,8 @@
 from flask import Blueprint, jsonify, request
 import subprocess
 from datetime import datetime, timedelta
+from app.conditional import conditional, static_version
+from app.encoding import negotiate
 
 logs_bp = Blueprint('logs', __name__)
 
@@ -13,6 +15,7 @@ def health():
 
 
 @logs_bp.route('/services')
+@conditional(static_version)
 def list_services():
     """List available services for log viewing"""
     services = [
@@ -83,7 +86,7 @@ def view_logs(service):
                         'message': line[26:] if len(line) > 26 else line
                     })
             
-            return jsonify({
+            return negotiate({
                 'success': True,
                 'service': service,
                 'logs': parsed_logs,
@@ -141,7 +144,7 @@ def search_logs():
                         'message': line[26:] if len(line) > 26 else line
                     })
             
-            return jsonify({
+            return negotiate({
                 'success': True,
                 'query': query,
                 'logs': parsed_logs,
@@ -187,7 +190,7 @@ def get_errors():
                         'message': line[26:] if len(line) > 26 else line
                     })
             
-            return jsonify({
+            return negotiate({
                 'success': True,
                 'logs': parsed_logs,
                 'count': len(parsed_logs),
@@ -229,7 +232,7 @@ def get_boot_logs():
                         'message': line[26:] if len(line) > 26 else line
                     })
             
-            return jsonify({
+            return negotiate({
                 'success': True,
                 'logs': parsed_logs,
                 'count': len(parsed_logs)
@@ -283,7 +286,7 @@ def follow_logs(service):
                         'message': line[26:] if len(line) > 26 else line
                     })
             
-            return jsonify({
+            return negotiate({
                 'success': True,
                 'service': service,
                 'logs': parsed_logs,
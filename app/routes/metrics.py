@@ -0,0 +1,14 @@
+"""Prometheus metrics route - OpenMetrics exposition at /metrics"""
+from flask import Blueprint, Response, jsonify
+from app.modules import exporter
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """All collector state in OpenMetrics text format for Prometheus"""
+    try:
+        return Response(exporter.collect(), content_type=exporter.CONTENT_TYPE)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
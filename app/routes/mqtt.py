@@ -3,6 +3,9 @@ from flask import Blueprint, jsonify, request, current_app
 import json
 import os
 from app.modules.mqtt_tasmota import get_mqtt_client, init_mqtt_client, shutdown_mqtt_client
+from app.modules.delta import get_delta_tracker
+from app.conditional import conditional, counter_version, file_version
+from app.encoding import negotiate
 
 mqtt_bp = Blueprint('mqtt', __name__)
 
@@ -66,6 +69,7 @@ def get_mqtt_status():
 
 
 @mqtt_bp.route('/config', methods=['GET'])
+@conditional(lambda: file_version(MQTT_CONFIG_FILE))
 def get_mqtt_config():
     """Get MQTT configuration"""
     try:
@@ -158,6 +162,7 @@ def mqtt_disconnect():
 
 
 @mqtt_bp.route('/devices', methods=['GET'])
+@conditional(lambda: counter_version(get_mqtt_client()) if get_mqtt_client() else None)
 def get_devices():
     """Get list of all MQTT devices"""
     try:
@@ -167,7 +172,11 @@ def get_devices():
             return jsonify({'success': False, 'error': 'MQTT client not initialized'}), 400
         
         devices = client.get_devices()
-        return jsonify({'success': True, 'devices': devices})
+        # ?since=<version> returns only the fields changed since that version
+        body = get_delta_tracker('mqtt_devices').respond(
+            {'devices': devices}, since=request.args.get('since', type=int)
+        )
+        return negotiate({'success': True, **body})
     except Exception as e:
         current_app.logger.error(f"Error getting devices: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
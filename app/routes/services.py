@@ -1,6 +1,7 @@
 """Services API routes - control and monitor various services"""
 from flask import Blueprint, jsonify
 from app.modules import raspotify, shairport_sync
+from app.conditional import conditional, static_version
 
 services_bp = Blueprint('services', __name__)
 
@@ -60,6 +61,7 @@ def shairport_current():
 
 
 @services_bp.route('/list')
+@conditional(static_version)
 def list_services():
     """List all available services"""
     services = [
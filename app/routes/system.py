@@ -1,6 +1,24 @@
 """System API routes - system information and monitoring"""
-from flask import Blueprint, jsonify, current_app
-from app.modules import system_monitor
+import queue
+import time
+from flask import Blueprint, Response, jsonify, request, current_app
+from app.modules import system_monitor, metrics_sampler
+from app.modules.metric_history import get_history, parse_duration
+from app.modules.metric_archive import get_archive
+from app.modules.cache import get_cache
+from app.modules.collectors import get_registry
+from app.modules.process_tracker import get_process_tracker, SORT_KEYS
+from app.modules.connections import get_connection_stats
+from app.modules.net_rates import get_net_rates
+from app.modules.disk_io import get_disk_io
+from app.modules.cgroup_accounting import get_cgroup_accounting
+from app.modules.throttle_watcher import get_throttle_watcher
+from app.modules.core_heatmap import get_core_heatmap, AGGREGATES
+from app.modules.anomaly import get_anomaly_detector
+from app.modules.stream_hub import get_stream_hub, format_event
+from app.modules.delta import get_delta_tracker
+from app.conditional import conditional, static_version
+from app.encoding import negotiate
 
 system_bp = Blueprint('system', __name__)
 
@@ -11,31 +29,306 @@ def health():
     return jsonify({'status': 'ok', 'service': 'system'})
 
 
+def _with_snapshot_meta(data, snapshot):
+    """Add sample time and age to a copy of snapshot data"""
+    if snapshot is None:
+        # Sampler not running (e.g. testing) - data was collected inline
+        return {**data, 'sampled_at': time.time(), 'age': 0.0}
+    return {
+        **data,
+        'sampled_at': snapshot.timestamp,
+        'age': round(snapshot.age(), 2)
+    }
+
+
 @system_bp.route('/stats')
 def stats():
     """Get quick system statistics - optimized for dashboard"""
     try:
-        stats = system_monitor.get_all_stats()
-        return jsonify(stats)
+        snapshot = metrics_sampler.get_snapshot('stats')
+        data = snapshot.data if snapshot else system_monitor.get_all_stats()
+        
+        # ?since=<version> returns only the fields changed since that version
+        body = get_delta_tracker('stats').respond(
+            data,
+            since=request.args.get('since', type=int),
+            key=snapshot.timestamp if snapshot else None
+        )
+        return jsonify(_with_snapshot_meta(body, snapshot))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@system_bp.route('/stream')
+def stream():
+    """Push quick stats as Server-Sent Events (full "stats" then "delta" events)"""
+    hub = get_stream_hub()
+    snapshot = metrics_sampler.get_snapshot('stats')
+    if not current_app.config.get('METRICS_SAMPLER_ENABLED') or hub is None or snapshot is None:
+        return jsonify({'success': False, 'error': 'Live stream not enabled'}), 503
+    
+    subscription = hub.subscribe()
+    if subscription is None:
+        # Client falls back to polling /api/system/stats
+        return jsonify({'success': False, 'error': 'Too many live streams'}), 503
+    
+    heartbeat = current_app.config['STREAM_HEARTBEAT']
+    max_duration = current_app.config['STREAM_MAX_DURATION']
+    
+    def generate():
+        try:
+            # Reconnect delay for EventSource, then the current snapshot right away
+            yield 'retry: 3000\n\n'
+            full = get_delta_tracker('stats').respond(snapshot.data, key=snapshot.timestamp)
+            yield format_event('stats', _with_snapshot_meta(full, snapshot),
+                               event_id=f'{snapshot.timestamp:.3f}')
+            
+            deadline = time.monotonic() + max_duration
+            while time.monotonic() < deadline:
+                try:
+                    message = subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keepalive\n\n'  # keeps proxies from timing out
+                    continue
+                if message is None:
+                    break  # dropped for falling behind
+                yield message
+        finally:
+            hub.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # nginx: pass events through unbuffered
+    })
+
+
 @system_bp.route('/info')
 def system_info():
     """Get detailed system information"""
     try:
-        stats = system_monitor.get_all_stats_detailed()
+        # Only waits when the detailed collector has been idle (first page view)
+        snapshot = metrics_sampler.get_snapshot('detailed', wait=25)
+        data = snapshot.data if snapshot else system_monitor.get_all_stats_detailed()
+        stats = _with_snapshot_meta(data, snapshot)
         
-        # Add Flask config system info
-        stats['system_info']['local_ip'] = current_app.config.get('LOCAL_IP', 'unknown')
-        stats['system_info']['hostname'] = current_app.config.get('HOSTNAME', 'unknown')
+        # Add Flask config system info (copy - the snapshot is shared)
+        stats['system_info'] = {
+            **data['system_info'],
+            'local_ip': current_app.config.get('LOCAL_IP', 'unknown'),
+            'hostname': current_app.config.get('HOSTNAME', 'unknown')
+        }
         
         return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@system_bp.route('/history')
+def history():
+    """Get recorded history for a metric (e.g. ?metric=cpu.temperature&window=1h)"""
+    try:
+        metric_history = get_history()
+        if metric_history is None:
+            return jsonify({'success': False, 'error': 'Metric history not enabled'}), 503
+        
+        metric = request.args.get('metric')
+        if not metric:
+            return jsonify({
+                'success': False,
+                'error': 'Metric parameter required',
+                'metrics': metric_history.metrics()
+            }), 400
+        
+        try:
+            window = parse_duration(request.args.get('window', '1h'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        max_points = max(1, min(request.args.get('points', 720, type=int), 5000))
+        source = request.args.get('source', 'auto')  # auto, memory or archive
+        
+        # Use the on-disk archive for windows longer than in-memory history,
+        # or right after a restart when memory does not reach back far enough
+        result = None
+        archive = get_archive()
+        if archive is not None and (source == 'archive' or (
+                source == 'auto' and not metric_history.covers(metric, window))):
+            result = archive.query(metric, window, max_points)
+            if result is not None and not result['count'] and source == 'auto':
+                result = None  # nothing archived yet
+            if result is not None:
+                result['source'] = 'archive'
+        if result is None and source != 'archive':
+            result = metric_history.query(metric, window, max_points)
+            if result is not None:
+                result['source'] = 'memory'
+        
+        if result is None:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown metric: {metric}',
+                'metrics': metric_history.metrics()
+            }), 404
+        
+        return negotiate({'success': True, **result})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/disk/io')
+def disk_io():
+    """Get per-device disk throughput, IOPS, utilization and latency"""
+    try:
+        collector = get_disk_io()
+        return jsonify({
+            'success': True,
+            'devices': collector.stats(),
+            'sampled_at': collector.timestamp
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/services/usage')
+def services_usage():
+    """Get per-service CPU, memory, I/O and pids from cgroup v2 accounting"""
+    accounting = get_cgroup_accounting()
+    if not current_app.config.get('CGROUP_ACCOUNTING_ENABLED') or accounting is None:
+        return jsonify({'success': False, 'error': 'Service accounting not enabled'}), 503
+    
+    try:
+        return jsonify({
+            'success': True,
+            'available': accounting.available,
+            'units': accounting.stats(),
+            'sampled_at': accounting.timestamp
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/cpu/heatmap')
+def cpu_heatmap():
+    """Get per-core utilization as a fixed-size grid (e.g. ?window=1h&width=120&agg=max)"""
+    heatmap = get_core_heatmap()
+    if not current_app.config.get('METRICS_SAMPLER_ENABLED') or heatmap is None:
+        return jsonify({'success': False, 'error': 'CPU heatmap not enabled (requires the sampler and numpy)'}), 503
+    
+    try:
+        window = parse_duration(request.args.get('window', '1h'))
+        width = request.args.get('width', 120, type=int)
+        aggregate = request.args.get('agg', 'mean')
+        if not 1 <= width <= 1000:
+            raise ValueError('width must be between 1 and 1000')
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"agg must be one of: {', '.join(AGGREGATES)}")
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        return negotiate({'success': True, **heatmap.query(window, width, aggregate)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/throttle/events')
+def throttle_events():
+    """Get throttle/under-voltage transitions (e.g. ?since=<epoch>&limit=100)"""
+    watcher = get_throttle_watcher()
+    if not current_app.config.get('THROTTLE_WATCH_ENABLED') or watcher is None:
+        return jsonify({'success': False, 'error': 'Throttle watcher not enabled'}), 503
+    
+    try:
+        since = request.args.get('since', type=float)
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        return jsonify({
+            'success': True,
+            **watcher.status(),
+            'events': watcher.events(since, limit),
+            'kernel_messages': watcher.kernel_messages(since)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/anomalies')
+def anomalies():
+    """Get per-metric anomaly statistics (e.g. ?window=24h&metric=memory.percent,cpu.percent)"""
+    detector = get_anomaly_detector()
+    if not current_app.config.get('ANOMALY_DETECTION_ENABLED') or detector is None:
+        return jsonify({'success': False, 'error': 'Anomaly detection not enabled (requires numpy)'}), 503
+    
+    try:
+        window = parse_duration(request.args.get('window', '24h'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        metrics = request.args.get('metric')
+        if metrics:
+            # Ad-hoc selection - analyzed fresh, not cached
+            result = detector.analyze(window, metrics.split(','))
+        else:
+            result = detector.latest(window)
+        return negotiate({'success': True, **result})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/processes')
+def processes():
+    """Get top processes (e.g. ?sort=cpu&limit=10)"""
+    try:
+        sort = request.args.get('sort', 'cpu')
+        if sort not in SORT_KEYS:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid sort '{sort}' (use: {', '.join(SORT_KEYS)})"
+            }), 400
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+        
+        tracker = get_process_tracker()
+        top = tracker.top(sort=sort, limit=limit)
+        return jsonify({
+            'success': True,
+            'sort': sort,
+            'processes': top,
+            'total': tracker.count(),
+            'sampled_at': tracker.timestamp
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/collectors')
+def collector_status():
+    """Get each registered collector's cadence, cost class and last run"""
+    try:
+        return jsonify({'success': True, 'collectors': get_registry().status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/cache')
+def cache_stats():
+    """Get collector cache hit/miss counters and entry ages"""
+    try:
+        return jsonify({'success': True, 'cache': get_cache().stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/cache/invalidate', methods=['POST'])
+def cache_invalidate():
+    """Drop one cached collector value (JSON {"key": ...}) or all of them"""
+    try:
+        data = request.get_json(silent=True) or {}
+        removed = get_cache().invalidate(data.get('key'))
+        return jsonify({'success': True, 'removed': removed})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @system_bp.route('/network-stats')
 def network_stats():
     """Get network statistics"""
@@ -57,6 +350,35 @@ def network_stats():
         return jsonify({'error': str(e)}), 500
 
 
+@system_bp.route('/network/rates')
+def network_rates():
+    """Get smoothed per-interface throughput (bytes/s, packets/s, errors/s, drops/s)"""
+    try:
+        engine = get_net_rates()
+        rates = engine.rates()
+        return jsonify({
+            'success': True,
+            'interfaces': rates,
+            'total': {
+                'rx_bytes_per_sec': round(sum(r.get('rx_bytes_per_sec', 0) for r in rates.values()), 2),
+                'tx_bytes_per_sec': round(sum(r.get('tx_bytes_per_sec', 0) for r in rates.values()), 2)
+            },
+            'smoothing': engine.smoothing,
+            'sampled_at': engine.timestamp
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/network/connections')
+def network_connections():
+    """Get socket counts per table, TCP states, sockstat totals and TCP/UDP counters"""
+    try:
+        return jsonify({'success': True, **get_connection_stats().stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @system_bp.route('/network/interfaces')
 def network_interfaces():
     """Get network interface information"""
@@ -84,7 +406,8 @@ def public_ip():
         ip = system_monitor.get_public_ip()
         return jsonify({
             'success': True,
-            'public_ip': ip
+            'public_ip': ip,
+            **system_monitor.get_remote_resource('public_ip').status()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -111,7 +434,8 @@ def weather():
         if weather_data:
             return jsonify({
                 'success': True,
-                'weather': weather_data
+                'weather': weather_data,
+                **system_monitor.get_remote_resource('weather').status()
             })
         else:
             return jsonify({
@@ -123,6 +447,7 @@ def weather():
 
 
 @system_bp.route('/config')
+@conditional(static_version)
 def system_config():
     """Get system configuration including IP and hostname"""
     try:
@@ -78,12 +78,63 @@ function updateStats(stats) {
   }
 }
 
+// Apply a delta response ({changes: [{op, path, value}]}) to a cached payload.
+// Paths are JSON pointers; lists that change length arrive as whole values.
+function applyDelta(state, changes) {
+  changes.forEach(({ op, path, value }) => {
+    const keys = path.split('/').slice(1).map(k => k.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const last = keys.pop();
+    let target = state;
+    keys.forEach((key, i) => {
+      if (target[key] === undefined || target[key] === null) {
+        const next = i + 1 < keys.length ? keys[i + 1] : last;
+        target[key] = /^\d+$/.test(next) ? [] : {};
+      }
+      target = target[key];
+    });
+    if (op === 'remove') {
+      if (Array.isArray(target)) target.splice(Number(last), 1);
+      else delete target[last];
+    } else {
+      target[last] = value;
+    }
+  });
+  return state;
+}
+
+// Fetch several GET endpoints in one request; resolves to {path: body}
+async function fetchBatch(paths) {
+  const res = await fetch(`${API_BASE}/api/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ requests: paths })
+  });
+  if (!res.ok) throw new Error('Batch request failed');
+  const data = await res.json();
+  const bodies = {};
+  paths.forEach(path => {
+    const result = data.responses[path];
+    if (!result || result.body === undefined) {
+      throw new Error(`${path}: ${result ? result.error : 'missing from batch'}`);
+    }
+    bodies[path] = result.body;
+  });
+  return bodies;
+}
+
+// Latest full stats payload and its version (kept up to date by deltas)
+let statsState = null;
+let statsVersion = null;
+
 async function fetchStats() {
   try {
-    const res = await fetch(`${API_BASE}/api/system/stats`);
+    const since = statsVersion !== null ? `?since=${statsVersion}` : '';
+    const res = await fetch(`${API_BASE}/api/system/stats${since}`);
     if (!res.ok) throw new Error('Failed to fetch stats');
     const data = await res.json();
-    updateStats(data);
+    statsState = data.delta ? applyDelta(statsState, data.changes) : data;
+    statsVersion = data.version;
+    updateStats(statsState);
     clearError();
   } catch (error) {
     showError('Unable to connect to backend. Ensure Flask server is running.');
@@ -91,10 +142,55 @@ async function fetchStats() {
   }
 }
 
-// Initialize stats fetching if we're on a page that needs it
-if (document.getElementById('uptime')) {
+// Poll every 5 seconds (fallback when the live stream is unavailable)
+let statsPollTimer = null;
+
+function startStatsPolling() {
+  if (statsPollTimer) return;
   fetchStats();
-  setInterval(fetchStats, 5000);
+  statsPollTimer = setInterval(fetchStats, 5000);
+}
+
+// Live stats pushed by the server as they are sampled
+function startStatsStream() {
+  if (!window.EventSource) {
+    startStatsPolling();
+    return;
+  }
+  
+  const source = new EventSource(`${API_BASE}/api/system/stream`);
+  source.addEventListener('stats', (event) => {
+    statsState = JSON.parse(event.data);
+    statsVersion = statsState.version;
+    updateStats(statsState);
+    clearError();
+  });
+  source.addEventListener('delta', (event) => {
+    const delta = JSON.parse(event.data);
+    if (statsState === null || delta.version <= statsVersion) return;
+    if (delta.base > statsVersion) {
+      // Missed an update - reconnect for a fresh full snapshot
+      source.close();
+      startStatsStream();
+      return;
+    }
+    applyDelta(statsState, delta.changes);
+    statsVersion = delta.version;
+    updateStats(statsState);
+  });
+  source.onerror = () => {
+    // CLOSED means the server refused the stream (disabled or too many clients);
+    // otherwise EventSource reconnects on its own
+    if (source.readyState === EventSource.CLOSED) {
+      console.warn('Live stats stream unavailable, polling instead');
+      startStatsPolling();
+    }
+  };
+}
+
+// Initialize stats updates if we're on a page that needs it
+if (document.getElementById('uptime')) {
+  startStatsStream();
 }
 
 // Services page functionality
@@ -103,19 +199,17 @@ async function loadServices() {
   if (!container) return;
   
   try {
-    // Load Raspotify status
-    const raspotifyStatusRes = await fetch(`${API_BASE}/api/services/raspotify/status`);
-    const raspotifyStatusData = await raspotifyStatusRes.json();
-    
-    const raspotifyCurrentRes = await fetch(`${API_BASE}/api/services/raspotify/current`);
-    const raspotifyCurrentData = await raspotifyCurrentRes.json();
-    
-    // Load Shairport Sync status
-    const shairportStatusRes = await fetch(`${API_BASE}/api/services/shairport-sync/status`);
-    const shairportStatusData = await shairportStatusRes.json();
-    
-    const shairportCurrentRes = await fetch(`${API_BASE}/api/services/shairport-sync/current`);
-    const shairportCurrentData = await shairportCurrentRes.json();
+    // Raspotify and Shairport Sync status and current track in one round trip
+    const results = await fetchBatch([
+      '/api/services/raspotify/status',
+      '/api/services/raspotify/current',
+      '/api/services/shairport-sync/status',
+      '/api/services/shairport-sync/current'
+    ]);
+    const raspotifyStatusData = results['/api/services/raspotify/status'];
+    const raspotifyCurrentData = results['/api/services/raspotify/current'];
+    const shairportStatusData = results['/api/services/shairport-sync/status'];
+    const shairportCurrentData = results['/api/services/shairport-sync/current'];
     
     // Render both cards
     let html = '';
@@ -283,17 +283,23 @@ async function loadGPIOMode() {
 
 // Auto-refresh pin states
 let refreshInterval = null;
+let pinsState = null;
+let pinsVersion = null;
 
 function startAutoRefresh(intervalSeconds = 5) {
     stopAutoRefresh();
     
     refreshInterval = setInterval(async () => {
         try {
-            const response = await fetch(`${GPIO_API_BASE}/pins`);
+            // Only changed fields are returned once we know a version
+            const since = pinsVersion !== null ? `?since=${pinsVersion}` : '';
+            const response = await fetch(`${GPIO_API_BASE}/pins${since}`);
             const data = await response.json();
             
-            if (data.success && data.pins) {
-                data.pins.forEach(pin => {
+            if (data.success) {
+                pinsState = data.delta ? applyDelta(pinsState, data.changes) : data;
+                pinsVersion = data.version;
+                pinsState.pins.forEach(pin => {
                     updatePinState(pin.id, pin.state);
                 });
             }
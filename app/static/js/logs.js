@@ -129,6 +129,45 @@ async function showErrors() {
   }
 }
 
+// Show pending/firing alerts and recently resolved ones
+async function showAlerts() {
+  const loadingElem = document.getElementById('logs-loading');
+  const contentElem = document.getElementById('logs-content');
+  
+  if (loadingElem) loadingElem.style.display = 'flex';
+  
+  try {
+    const response = await fetch(`${API_BASE}/api/alerts`);
+    const data = await response.json();
+    
+    if (loadingElem) loadingElem.style.display = 'none';
+    
+    if (data.success) {
+      const formatTime = (ts) => ts ? new Date(ts * 1000).toLocaleString() : '';
+      const lines = data.active.map(alert =>
+        `[${alert.state.toUpperCase()}] [${alert.severity}] ${alert.rule}: ${alert.metric} = ${alert.value} ` +
+        `(${alert.op} ${alert.threshold}) since ${formatTime(alert.fired_at || alert.pending_since)}`
+      );
+      if (data.resolved.length) {
+        lines.push('', 'Recently resolved:');
+        data.resolved.forEach(alert => {
+          lines.push(`[RESOLVED] ${alert.rule}: ${alert.metric} at ${formatTime(alert.resolved_at)}`);
+        });
+      }
+      contentElem.textContent = lines.join('\n') || 'No active alerts';
+      
+      document.getElementById('current-service').textContent = 'Alerts';
+      document.getElementById('log-count').textContent = data.active.length;
+      document.getElementById('last-updated').textContent = new Date().toLocaleTimeString();
+    } else {
+      contentElem.textContent = `Error: ${data.error || 'Failed to load alerts'}`;
+    }
+  } catch (error) {
+    if (loadingElem) loadingElem.style.display = 'none';
+    contentElem.textContent = `Failed to load alerts: ${error.message}`;
+  }
+}
+
 // Show boot logs
 async function showBootLogs() {
   const loadingElem = document.getElementById('logs-loading');
@@ -11,7 +11,10 @@ backlog = 64
 # Worker processes - single worker for development and GPIO access
 # Multiple workers cause GPIO resource conflicts
 workers = 1
-worker_class = "sync"
+# Threaded worker so open /api/system/stream connections (capped by
+# STREAM_MAX_CLIENTS) do not block regular requests
+worker_class = "gthread"
+threads = 8
 worker_connections = 50
 max_requests = 1000  # Restart workers after 1000 requests to prevent memory leaks
 max_requests_jitter = 50
@@ -15,6 +15,7 @@ if __name__ == '__main__':
     app.run(
         host='0.0.0.0',
         port=5050,
-        debug=(env == 'development')
+        debug=(env == 'development'),
+        use_reloader=app.config['USE_RELOADER']
     )
 
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: anomaly detection over a full day of 1s metric history
+Usage: python3 scripts/bench_anomaly.py [seconds] [iterations]
+
+Fills a MetricHistory with every metric the sampler records (quick stats,
+per-interface rates, per-device disk I/O) for `seconds` of 1s samples, with a
+memory leak, a temperature drift and a few CPU spikes injected, then times
+AnomalyDetector.analyze() over the whole window. The target is well under a
+second on a Pi 3B.
+"""
+import sys
+import time
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.modules.anomaly import AnomalyDetector, NUMPY_AVAILABLE  # noqa: E402
+from app.modules.metric_history import MetricHistory, TRACKED_METRICS  # noqa: E402
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+METRICS = TRACKED_METRICS + tuple(
+    [f'network.{iface}.{direction}_rate' for iface in ('eth0', 'wlan0') for direction in ('rx', 'tx')]
+    + [f'disk.{device}.{field}' for device in ('mmcblk0', 'sda')
+       for field in ('read_rate', 'write_rate', 'utilization')]
+)
+
+
+def synthetic(name, n, rng):
+    """Noisy series with a known problem injected into some metrics"""
+    t = np.arange(n)
+    level = {'cpu.temperature': 48.0, 'memory.percent': 35.0, 'disk.percent': 61.0}.get(name, 20.0)
+    values = level + rng.normal(0, 1.0, n) + 2 * np.sin(2 * np.pi * t / 86400)
+    if name == 'memory.percent':
+        values += 15.0 * t / n  # creeping leak
+    elif name == 'cpu.temperature':
+        values[-3 * 3600:] += np.linspace(0, 12, 3 * 3600)  # fan failing
+    elif name == 'cpu.percent':
+        values[rng.integers(600, n, 5)] += 60  # short spikes
+    return values.astype(np.float32)
+
+
+def fill(history, seconds, rng):
+    """Write samples straight into the ring buffers (record() would take minutes)"""
+    history.base_time = time.time() - seconds
+    ticks = array('I', (np.arange(seconds, dtype=np.uint32) * 10).tobytes())
+    for name in METRICS:
+        buffer = history.register(name)
+        buffer.times[:seconds] = ticks
+        buffer.values[:seconds] = array('f', synthetic(name, seconds, rng).tobytes())
+        buffer.head = seconds % buffer.capacity
+        buffer.count = seconds
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 86400
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print("=" * 72)
+    print("Anomaly detection benchmark")
+    print("=" * 72)
+    if not NUMPY_AVAILABLE:
+        print("  numpy not installed - nothing to measure (pip install numpy)")
+        return
+
+    rng = np.random.default_rng(1)
+    history = MetricHistory(retention=seconds, resolution=1)
+    fill(history, seconds, rng)
+    detector = AnomalyDetector(history)
+
+    detector.analyze(seconds)  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = detector.analyze(seconds)
+    elapsed = (time.perf_counter() - started) / iterations
+
+    samples = seconds * len(METRICS)
+    print(f"  {len(METRICS)} metrics x {seconds:,} samples = {samples:,} samples")
+    print(f"  analyze(): {elapsed * 1000:.1f}ms ({samples / elapsed / 1e6:.1f}M samples/s)")
+    print()
+    print(f"  {'metric':<30} {'flags':<22} {'drift':>8} {'trend/h':>9} {'spikes':>7}")
+    for name in result['anomalous']:
+        metric = result['metrics'][name]
+        print(f"  {name:<30} {','.join(metric['flags']):<22} {metric['drift']:>8.1f} "
+              f"{metric['trend_per_hour']:>9.3f} {metric['spike_count']:>7}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
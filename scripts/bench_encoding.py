@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON vs MessagePack encoding of large API responses
+Usage: python3 scripts/bench_encoding.py [iterations]
+
+Encodes representative payloads (a 1000-line log listing, a 720-point metric
+history, a list of MQTT devices) with the app's own JSON provider and with
+msgpack, and prints serialization time, payload size and gzipped size.
+"""
+import gzip
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import create_app  # noqa: E402
+from app.encoding import MSGPACK_AVAILABLE  # noqa: E402
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+
+def log_payload(count=1000):
+    """Shape of /api/logs/view/<service>?lines=1000"""
+    logs = []
+    for i in range(count):
+        timestamp = f'2024-01-15T10:{i // 60 % 60:02d}:{i % 60:02d}+0000'
+        message = f'raspberrypi raspotify[812]: [INFO] librespot: Loading track {i} (spotify:track:{i:022d})'
+        raw = f'{timestamp} {message}'
+        logs.append({'raw': raw, 'timestamp': raw[:25], 'message': raw[26:]})
+    return {'success': True, 'service': 'raspotify', 'logs': logs,
+            'count': count, 'lines_requested': count}
+
+
+def history_payload(points=720):
+    """Shape of /api/system/history?metric=cpu.temperature&window=1h"""
+    start = 1700000000.0
+    return {'success': True, 'metric': 'cpu.temperature', 'window': 3600.0,
+            'resolution': 5.0, 'count': points, 'source': 'memory',
+            'timestamps': [start + i * 5.0 for i in range(points)],
+            'values': [45.0 + (i % 37) * 0.137 for i in range(points)]}
+
+
+def devices_payload(count=20):
+    """Shape of /api/mqtt/devices"""
+    devices = []
+    for i in range(count):
+        devices.append({
+            'name': f'Plug {i}', 'topic': f'tasmota_plug_{i}', 'type': 'plug',
+            'online': True, 'power_state': 'ON' if i % 2 else 'OFF',
+            'last_update': 1700000000.0 + i,
+            'sensor_data': {'ENERGY': {'Power': 12.5 + i, 'Voltage': 230, 'Current': 0.054,
+                                       'Today': 0.12, 'Total': 41.377}},
+            'state': {'Uptime': '2T03:11:09', 'Wifi': {'RSSI': 74, 'Signal': -63}}
+        })
+    return {'success': True, 'devices': devices, 'version': 1700000000123, 'delta': False}
+
+
+def bench(func, iterations):
+    """Average seconds per call"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("=" * 72)
+    print("Response encoding benchmark (JSON vs MessagePack)")
+    print("=" * 72)
+    if not MSGPACK_AVAILABLE:
+        print("  msgpack not installed - only JSON is measured (pip install msgpack)")
+
+    app = create_app('testing')
+    dumps = app.json.dumps  # what jsonify() uses
+
+    payloads = [
+        ('log listing (1000)', log_payload()),
+        ('metric history (720)', history_payload()),
+        ('mqtt devices (20)', devices_payload()),
+    ]
+
+    print(f"  {'payload':<22} {'format':<8} {'encode':>10} {'size':>10} {'gzip':>10}")
+    for label, payload in payloads:
+        encoders = [('json', lambda p=payload: dumps(p).encode())]
+        if MSGPACK_AVAILABLE:
+            encoders.append(('msgpack', lambda p=payload: msgpack.packb(p, use_bin_type=True)))
+
+        baseline = None
+        for name, encode in encoders:
+            with app.app_context():
+                elapsed = bench(encode, iterations)
+                body = encode()
+            size, gzipped = len(body), len(gzip.compress(body, 6))
+            note = ''
+            if baseline is None:
+                baseline = (elapsed, size)
+            else:
+                note = (f"  ({baseline[0] / elapsed:.1f}x faster, "
+                        f"{100 - size * 100 / baseline[1]:.0f}% smaller)")
+            print(f"  {label:<22} {name:<8} {elapsed * 1000:8.3f}ms {size:>9,}B {gzipped:>9,}B{note}")
+
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
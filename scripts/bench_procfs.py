@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: psutil vs the pread procfs reader for the quick stats sample
+Usage: python3 scripts/bench_procfs.py [iterations]
+
+Measures one CPU + memory + load + uptime reading per iteration:
+- the psutil calls get_all_stats() used to make (cpu_percent, virtual_memory,
+  and opening /proc/uptime)
+- psutil_sample(), the same ProcSample fields through psutil
+- ProcReader.sample(), which preads the four files through descriptors it
+  keeps open
+"""
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.modules.procfs import ProcReader, psutil_sample  # noqa: E402
+
+
+def bench(label, func, iterations):
+    """Run func iterations times and print per-call cost"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed / iterations * 1e6:8.1f} us/sample  ({iterations} samples)")
+    return elapsed / iterations
+
+
+def previous_quick_stats():
+    """The psutil part of get_all_stats() before the procfs reader"""
+    cpu_percent = psutil.cpu_percent(interval=0)
+    memory = psutil.virtual_memory()
+    with open('/proc/uptime', 'r') as f:
+        uptime = int(float(f.read().split()[0]))
+    return cpu_percent, memory, uptime
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print("=" * 72)
+    print("Quick stats sample benchmark (CPU, memory, load, uptime)")
+    print("=" * 72)
+
+    results = {
+        'previous': bench('psutil (previous get_all_stats)', previous_quick_stats, iterations),
+        'psutil': bench('psutil (all ProcSample fields)', psutil_sample, iterations),
+    }
+    reader = ProcReader()
+    results['procfs'] = bench('procfs pread reader', reader.sample, iterations)
+    reader.close()
+
+    print()
+    for name in ('previous', 'psutil'):
+        print(f"  Speedup vs {name}: {results[name] / results['procfs']:.1f}x")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
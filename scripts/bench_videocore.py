@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vcgencmd subprocess vs in-process VideoCore telemetry
+Usage: python3 scripts/bench_videocore.py [iterations]
+
+Measures one temperature + throttle reading per iteration, the pair that
+get_all_stats()/get_all_stats_detailed() need. Off-Pi the subprocess path is
+skipped and the in-process path runs against the FakeVcio stand-in.
+"""
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.modules.videocore import VideoCoreTelemetry, FakeVcio  # noqa: E402
+
+
+def bench(label, func, iterations):
+    """Run func iterations times and print per-call cost"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed / iterations * 1000:8.3f} ms/sample  ({iterations} samples)")
+    return elapsed / iterations
+
+
+def subprocess_sample():
+    temp = subprocess.check_output(['vcgencmd', 'measure_temp']).decode()
+    throttle = subprocess.check_output(['vcgencmd', 'get_throttled']).decode()
+    return float(temp.replace('temp=', '').replace("'C\n", '')), int(throttle.split('=')[1], 16)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("=" * 60)
+    print("VideoCore telemetry benchmark (temperature + throttled)")
+    print("=" * 60)
+
+    results = {}
+    if shutil.which('vcgencmd'):
+        results['subprocess'] = bench('vcgencmd subprocess x2', subprocess_sample, iterations)
+    else:
+        print("  vcgencmd not found - skipping subprocess path")
+
+    telemetry = VideoCoreTelemetry()
+    print(f"  In-process backend: {telemetry.source}")
+    results['native'] = bench(f'in-process ({telemetry.source})',
+                              lambda: (telemetry.temperature(), telemetry.throttled()),
+                              iterations * 10)
+
+    fake = VideoCoreTelemetry(device=FakeVcio())
+    results['fake'] = bench('in-process (FakeVcio)',
+                            lambda: (fake.temperature(), fake.throttled()),
+                            iterations * 10)
+
+    if 'subprocess' in results:
+        print(f"\n  Speedup vs subprocess: {results['subprocess'] / results['native']:.0f}x")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
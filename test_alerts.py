@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the alert rules engine
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules import alerts  # noqa: E402
+from app.modules.alerts import AlertEngine, AlertRule  # noqa: E402
+from app.modules.metric_history import MetricHistory  # noqa: E402
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.events = []
+
+    def notify(self, event):
+        self.events.append(event)
+
+
+def make_engine(*rules):
+    notifier = RecordingNotifier()
+    engine = AlertEngine(list(rules), [notifier])
+    # Deliver synchronously instead of through the notifier thread
+    engine._enqueue = notifier.notify
+    return engine, notifier
+
+
+def test_duration_rule_lifecycle():
+    """pending -> firing after the duration -> resolved when it clears"""
+    engine, notifier = make_engine(AlertRule('hot', 'cpu.temperature', '>', 75, duration=300))
+
+    engine.record({'cpu.temperature': 76.0}, 1000)
+    assert [a['state'] for a in engine.active()] == ['pending']
+    engine.record({'cpu.temperature': 78.0}, 1299)
+    assert not notifier.events
+    engine.record({'cpu.temperature': 78.5}, 1300)
+    assert engine.active()[0]['state'] == 'firing'
+    assert notifier.events[-1]['state'] == 'firing'
+    assert notifier.events[-1]['pending_since'] == 1000
+
+    engine.record({'cpu.temperature': 70.0}, 1400)
+    assert engine.active() == []
+    assert notifier.events[-1]['state'] == 'resolved'
+    assert engine.resolved()[0]['resolved_at'] == 1400
+    assert len(notifier.events) == 2
+
+
+def test_pending_reset_without_notification():
+    """A condition that clears before the duration never fires"""
+    engine, notifier = make_engine(AlertRule('hot', 'cpu.temperature', '>', 75, duration=60))
+    engine.record({'cpu.temperature': 80.0}, 0)
+    engine.record({'cpu.temperature': 70.0}, 30)
+    engine.record({'cpu.temperature': 80.0}, 40)
+    engine.record({'cpu.temperature': 80.0}, 90)
+    assert engine.active()[0]['state'] == 'pending'
+    assert notifier.events == []
+
+
+def test_immediate_rule_and_missing_values():
+    """Rules without a duration fire on the first sample; None keeps state"""
+    engine, notifier = make_engine(AlertRule('full', 'disk.percent', '>', 90))
+    engine.record({'disk.percent': 95.0}, 0)
+    assert notifier.events[-1]['state'] == 'firing'
+    engine.record({'disk.percent': None}, 1)
+    assert engine.active()[0]['state'] == 'firing'
+
+
+def test_wildcard_metrics():
+    """Each metric matching a wildcard rule is tracked separately"""
+    engine, notifier = make_engine(AlertRule('busy', 'disk.*.utilization', '>=', 90))
+    engine.record({'disk.mmcblk0.utilization': 95.0, 'disk.sda.utilization': 10.0,
+                   'disk.percent': 99.0}, 0)
+    assert [(a['rule'], a['metric']) for a in engine.active()] == [('busy', 'disk.mmcblk0.utilization')]
+
+
+def test_config_and_history_hook():
+    """Rules load from JSON and history forwards every sample"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'alert_rules.json'
+        path.write_text(json.dumps({
+            'rules': [{'name': 'mem', 'metric': 'memory.percent', 'threshold': 50, 'for': '1m'},
+                      {'name': 'off', 'metric': 'x', 'threshold': 1, 'enabled': False}],
+            'notifiers': [{'type': 'log'}, {'type': 'webhook', 'url': 'http://x', 'enabled': False}]
+        }))
+        engine = AlertEngine.from_config(str(path))
+    assert [rule.name for rule in engine.rules] == ['mem']
+    assert engine.rules[0].duration == 60
+    assert [type(n).__name__ for n in engine.notifiers] == ['LogNotifier']
+
+    history = MetricHistory(retention=60)
+    history.alerts = engine
+    history.record({'memory.percent': 75.0}, 100)
+    assert engine.active()[0]['metric'] == 'memory.percent'
+
+
+def test_malformed_rules_file():
+    """A broken rules file logs an error and leaves an engine without rules"""
+    previous = alerts._engine
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'alert_rules.json'
+            for content in ('{"rules": [', '{"rules": [{"metric": "x"}]}',
+                            '{"notifiers": [{"type": "pager"}]}', '[]'):
+                path.write_text(content)
+                alerts._engine = None
+                engine = alerts.init_alert_engine(str(path))
+                assert engine.rules == [], content
+                alerts.shutdown_alert_engine()
+    finally:
+        alerts._engine = previous
+
+
+def test_alerts_endpoint():
+    """/api/alerts lists active alerts and the loaded rules"""
+    client = create_app('testing').test_client()
+    response = client.get('/api/alerts')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] and isinstance(data['active'], list)
+    rules = client.get('/api/alerts/rules').get_json()['rules']
+    assert 'cpu_temperature_high' in [rule['name'] for rule in rules]
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Alert Rules Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Duration Lifecycle", test_duration_rule_lifecycle),
+        ("Pending Reset", test_pending_reset_without_notification),
+        ("Immediate / Missing", test_immediate_rule_and_missing_values),
+        ("Wildcard Metrics", test_wildcard_metrics),
+        ("Config / History Hook", test_config_and_history_hook),
+        ("Malformed Rules File", test_malformed_rules_file),
+        ("Alerts Endpoint", test_alerts_endpoint),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for anomaly detection over metric history
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules.anomaly import (  # noqa: E402
+    AnomalyDetector, NUMPY_AVAILABLE, analyze_series, ewma, rolling_zscores
+)
+from app.modules.metric_history import MetricHistory  # noqa: E402
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+def noise(n, level=20.0, seed=1):
+    return level + np.random.default_rng(seed).normal(0, 1, n)
+
+
+def test_ewma_matches_recursion():
+    """Blocked closed form equals the per-sample recursion"""
+    if not NUMPY_AVAILABLE:
+        return
+    values = noise(5000)
+    for alpha in (0.5, 2 / 61, 2 / 601):
+        expected, level = [], values[0]
+        for value in values:
+            level = alpha * value + (1 - alpha) * level
+            expected.append(level)
+        assert np.allclose(ewma(values, alpha), expected)
+
+
+def test_rolling_zscores_match_naive():
+    """Cumulative-sum windows give the same z-scores as slicing"""
+    if not NUMPY_AVAILABLE:
+        return
+    values, window = noise(1000), 50
+    z = rolling_zscores(values, window)
+    assert (z[:window] == 0).all()
+    for i in (window, 400, 999):
+        previous = values[i - window:i]
+        assert abs(z[i] - (values[i] - previous.mean()) / previous.std()) < 1e-6
+
+
+def test_spike_drift_and_clean_series():
+    """Spikes and a slow climb are flagged, plain noise is not"""
+    if not NUMPY_AVAILABLE:
+        return
+    n = 20000
+    timestamps = 1000.0 + np.arange(n)
+    assert analyze_series(timestamps, noise(n))['flags'] == []
+
+    spiky = noise(n)
+    spiky[15000] += 30
+    result = analyze_series(timestamps, spiky)
+    assert result['flags'] == ['spike']
+    assert result['spikes'][0]['timestamp'] == 16000.0
+
+    climbing = noise(n) + np.linspace(0, 10, n)
+    result = analyze_series(timestamps, climbing)
+    assert 'drift' in result['flags'] and result['drift'] > 3
+    assert abs(result['trend_per_hour'] - 10 / n * 3600) < 0.1
+
+
+def test_missing_values_skipped():
+    """NaN gaps are ignored and short series return None"""
+    if not NUMPY_AVAILABLE:
+        return
+    values = noise(200)
+    values[::3] = np.nan
+    result = analyze_series(np.arange(200.0), values)
+    assert result['samples'] == 133
+    assert analyze_series(np.arange(5.0), noise(5)) is None
+
+
+def test_detector_reads_history():
+    """The detector analyzes every recorded metric and caches the result"""
+    if not NUMPY_AVAILABLE:
+        return
+    history = MetricHistory(retention=600, resolution=1)
+    now = time.time()
+    for i, value in enumerate(noise(300)):
+        history.record({'a.value': value, 'b.value': 5.0}, now - 300 + i)
+    detector = AnomalyDetector(history)
+    result = detector.latest(3600)
+    assert set(result['metrics']) == {'a.value', 'b.value'}
+    assert result['metrics']['a.value']['samples'] == 300
+    assert detector.latest(3600) is result
+    assert set(detector.analyze(3600, ['b.value', 'missing'])['metrics']) == {'b.value'}
+
+
+def test_endpoint():
+    """The endpoint validates the window and reports 503 without numpy"""
+    client = create_app('testing').test_client()
+    response = client.get('/api/system/anomalies')
+    if not NUMPY_AVAILABLE:
+        assert response.status_code == 503
+        return
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True
+    assert client.get('/api/system/anomalies?window=bogus').status_code == 400
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Anomaly Detection Test Suite")
+    print("=" * 60)
+    if not NUMPY_AVAILABLE:
+        print("numpy not installed - detection tests skipped")
+
+    tests = [
+        ("EWMA", test_ewma_matches_recursion),
+        ("Rolling z-scores", test_rolling_zscores_match_naive),
+        ("Spike / Drift / Clean", test_spike_drift_and_clean_series),
+        ("Missing Values", test_missing_values_skipped),
+        ("Detector", test_detector_reads_history),
+        ("Endpoint", test_endpoint),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
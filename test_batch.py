@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched request endpoint
+"""
+
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.encoding import MSGPACK_AVAILABLE  # noqa: E402
+
+
+def batch(client, paths):
+    return client.post('/api/batch', json={'requests': paths})
+
+
+def test_combined_response():
+    """Every path is answered with its own status and body"""
+    client = create_app('testing').test_client()
+    paths = ['/api/services/list', '/api/gpio/pins', '/api/logs/services']
+    response = batch(client, paths)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert set(data['responses']) == set(paths)
+    for path in paths:
+        direct = client.get(path).get_json()
+        entry = data['responses'][path]
+        assert entry['status'] == 200, path
+        assert entry['body'].keys() == direct.keys(), path
+
+
+def test_per_path_errors():
+    """Unknown, non-GET and excluded paths fail individually"""
+    client = create_app('testing').test_client()
+    data = batch(client, [
+        '/api/services/list', '/api/nope', '/api/gpio/pin/gpio_17/toggle',
+        '/api/system/stream', '/api/batch'
+    ]).get_json()
+    statuses = {path: entry['status'] for path, entry in data['responses'].items()}
+    assert statuses == {
+        '/api/services/list': 200,
+        '/api/nope': 404,
+        '/api/gpio/pin/gpio_17/toggle': 405,
+        '/api/system/stream': 400,
+        '/api/batch': 405
+    }
+
+
+def test_query_string_and_duplicates():
+    """Query strings reach the endpoint and duplicate paths are answered once"""
+    client = create_app('testing').test_client()
+    data = batch(client, ['/api/gpio/pins?since=1', '/api/gpio/pins?since=1']).get_json()
+    assert list(data['responses']) == ['/api/gpio/pins?since=1']
+    assert data['responses']['/api/gpio/pins?since=1']['body']['delta'] is False
+
+
+def test_forwarded_accept_and_etags():
+    """Sub-requests see the caller's Accept; returned ETags make paths conditional"""
+    client = create_app('testing').test_client()
+    path = '/api/services/list'
+    entry = batch(client, [path]).get_json()['responses'][path]
+    assert entry['etag']
+    assert client.get(path, headers={'If-None-Match': entry['etag']}).status_code == 304
+
+    data = client.post('/api/batch', json={'requests': [path], 'etags': {path: entry['etag']}}).get_json()
+    assert data['responses'][path]['status'] == 304
+    assert 'body' not in data['responses'][path]
+
+    if not MSGPACK_AVAILABLE:
+        return
+    import msgpack
+    response = client.post('/api/batch', json={'requests': [path]},
+                           headers={'Accept': 'application/msgpack'})
+    assert response.mimetype == 'application/msgpack'
+    packed = msgpack.unpackb(response.get_data(), raw=False)['responses'][path]
+    assert packed['body'] == entry['body']
+    assert packed['etag'] != entry['etag']  # the encoding is part of the tag
+
+
+def test_invalid_body():
+    """Malformed or oversized batches are rejected"""
+    client = create_app('testing').test_client()
+    assert batch(client, []).status_code == 400
+    assert batch(client, '/api/services/list').status_code == 400
+    assert client.post('/api/batch', data='nonsense').status_code == 400
+    assert batch(client, [f'/api/services/list?n={i}' for i in range(17)]).status_code == 400
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Batch Endpoint Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Combined Response", test_combined_response),
+        ("Per-path Errors", test_per_path_errors),
+        ("Query String / Duplicates", test_query_string_and_duplicates),
+        ("Forwarded Accept / ETags", test_forwarded_accept_and_etags),
+        ("Invalid Body", test_invalid_body),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the collector TTL cache
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.cache import TTLCache, cached, get_cache  # noqa: E402
+
+
+class Counter:
+    """Loader that counts its calls and returns the call number"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.calls
+
+
+def test_hits_and_misses():
+    """Fresh values are served without calling the loader"""
+    cache = TTLCache()
+    loader = Counter()
+    assert cache.get('k', loader, ttl=10) == 1
+    assert cache.get('k', loader, ttl=10) == 1
+    assert loader.calls == 1
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_stale_while_revalidate():
+    """A stale value is returned at once and refreshed in the background"""
+    cache = TTLCache()
+    loader = Counter(delay=0.2)
+    cache.get('k', loader, ttl=0.05, stale_ttl=10)
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    assert cache.get('k', loader, ttl=0.05, stale_ttl=10) == 1
+    assert cache.get('k', loader, ttl=0.05, stale_ttl=10) == 1
+    assert time.monotonic() - started < 0.1
+
+    time.sleep(0.3)
+    assert loader.calls == 2  # only one refresh for both stale hits
+    assert cache.get('k', loader, ttl=10) == 2
+
+
+def test_failed_load_keeps_last_good_value():
+    """A loader returning None does not replace the cached value"""
+    cache = TTLCache()
+    cache.get('k', lambda: 'good', ttl=0)
+    assert cache.get('k', lambda: None, ttl=0, stale_ttl=0) is None  # expired
+    cache.get('k', lambda: 'good', ttl=0, stale_ttl=10)
+    time.sleep(0.3)
+    assert cache.get('k', lambda: None, ttl=0, stale_ttl=10) == 'good'
+    assert cache.stats()['errors'] >= 1
+
+
+def test_concurrent_misses_load_once():
+    """Callers missing at the same time share one load"""
+    cache = TTLCache()
+    loader = Counter(delay=0.1)
+    threads = [threading.Thread(target=cache.get, args=('k', loader, 10)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loader.calls == 1
+
+
+def test_eviction_and_invalidation():
+    """Entries are capped and can be invalidated"""
+    cache = TTLCache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.get(key, lambda: key, ttl=10)
+    assert set(cache.stats()['keys']) == {'b', 'c'}
+    assert cache.stats()['evictions'] == 1
+    assert cache.invalidate('b') == 1
+    assert cache.invalidate() == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_decorator():
+    """@cached wraps a collector in the global cache"""
+    loader = Counter()
+
+    @cached(ttl=10, key='test_decorator')
+    def collector():
+        return loader()
+
+    assert collector() == 1 and collector() == 1
+    collector.invalidate()
+    assert collector() == 2
+    assert 'test_decorator' in get_cache().stats()['keys']
+    get_cache().invalidate('test_decorator')
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Collector Cache Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Hits and Misses", test_hits_and_misses),
+        ("Stale While Revalidate", test_stale_while_revalidate),
+        ("Failed Load", test_failed_load_keeps_last_good_value),
+        ("Concurrent Misses", test_concurrent_misses_load_once),
+        ("Eviction and Invalidation", test_eviction_and_invalidation),
+        ("Decorator", test_decorator),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the cgroup v2 per-service accounting
+Uses a fake cgroup hierarchy so deltas are deterministic
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.cgroup_accounting import CgroupAccounting, parse_io_stat  # noqa: E402
+from app.modules.metric_history import MetricHistory  # noqa: E402
+from app.modules.metrics_sampler import Snapshot  # noqa: E402
+
+
+def _write(root, unit, usage=0, user=0, system=0, memory=1048576, pids=3, rbytes=0, wbytes=0):
+    path = Path(root) / 'system.slice' / f'{unit}.service'
+    path.mkdir(parents=True, exist_ok=True)
+    (Path(root) / 'cgroup.controllers').write_text("cpu io memory pids\n")
+    (path / 'cpu.stat').write_text(
+        f"usage_usec {usage}\nuser_usec {user}\nsystem_usec {system}\n"
+        "nr_periods 0\nnr_throttled 0\nthrottled_usec 0\n")
+    (path / 'memory.current').write_text(f"{memory}\n")
+    (path / 'pids.current').write_text(f"{pids}\n")
+    (path / 'io.stat').write_text(
+        f"179:0 rbytes={rbytes} wbytes={wbytes} rios=0 wios=0 dbytes=0 dios=0\n"
+        "8:0 rbytes=0 wbytes=0 rios=0 wios=0 dbytes=0 dios=0\n")
+
+
+def test_parse_io_stat():
+    """Byte and request counts are summed over devices"""
+    totals = parse_io_stat("179:0 rbytes=100 wbytes=40 rios=2 wios=1 dbytes=0 dios=0\n"
+                           "8:0 rbytes=50 wbytes=0 rios=1 wios=0 dbytes=0 dios=0\n")
+    assert totals == {'rbytes': 150, 'wbytes': 40, 'rios': 3, 'wios': 1}
+
+
+def test_rates_from_deltas():
+    """CPU percent of one core and I/O rates between two samples"""
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'nginx')
+        accounting = CgroupAccounting(['nginx.service', 'raspotify'], cgroup_path=root)
+        first = accounting.sample(now=0.0)
+        assert first['nginx'] == {'active': True, 'cpu_seconds': 0.0,
+                                  'memory_bytes': 1048576, 'pids': 3}
+        assert first['raspotify'] == {'active': False}
+
+        # 2 seconds: 0.5s of CPU (0.4 user, 0.1 system), 8KB read, 4KB written
+        _write(root, 'nginx', usage=500000, user=400000, system=100000,
+               memory=2097152, pids=4, rbytes=8192, wbytes=4096)
+        stats = accounting.sample(now=2.0)['nginx']
+        assert stats['cpu_percent'] == 25.0
+        assert stats['user_percent'] == 20.0 and stats['system_percent'] == 5.0
+        assert stats['read_bytes_per_sec'] == 4096.0
+        assert stats['write_bytes_per_sec'] == 2048.0
+        assert stats['memory_bytes'] == 2097152 and stats['pids'] == 4
+
+
+def test_restart_and_stop():
+    """A restarted unit has no rates for one interval; a stopped one is inactive"""
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'raspotify', usage=9000000)
+        accounting = CgroupAccounting(['raspotify'], cgroup_path=root)
+        accounting.sample(now=0.0)
+        _write(root, 'raspotify', usage=1000)  # new cgroup after a restart
+        assert 'cpu_percent' not in accounting.sample(now=1.0)['raspotify']
+        _write(root, 'raspotify', usage=101000)
+        assert accounting.sample(now=2.0)['raspotify']['cpu_percent'] == 10.0
+        shutil.rmtree(Path(root) / 'system.slice' / 'raspotify.service')
+        assert accounting.sample(now=3.0)['raspotify'] == {'active': False}
+
+
+def test_out_of_order_sample_is_skipped():
+    """A sample older than the last one reports the newer usage, never negative rates"""
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'nginx')
+        accounting = CgroupAccounting(['nginx'], cgroup_path=root)
+        accounting.sample(now=10.0)
+        _write(root, 'nginx', usage=200000)
+        results = accounting.sample(now=12.0)
+
+        # A snapshot taken at 11.0 whose callback runs after a request sampled at 12.0
+        _write(root, 'nginx', usage=250000)
+        assert accounting.sample(now=11.0) == results
+        assert accounting.sampled_at == 12.0
+        _write(root, 'nginx', usage=300000)
+        assert accounting.sample(now=13.0)['nginx']['cpu_percent'] == 10.0
+
+
+def test_without_cgroup_v2():
+    """No cgroup.controllers file: unavailable, every unit inactive"""
+    with tempfile.TemporaryDirectory() as root:
+        accounting = CgroupAccounting(['nginx'], cgroup_path=root)
+        assert not accounting.available
+        assert accounting.stats() == {'nginx': {'active': False}}
+
+
+def test_records_into_history():
+    """The sampler callback records usage per unit"""
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'shairport-sync')
+        accounting = CgroupAccounting(['shairport-sync'], cgroup_path=root)
+        accounting.history = MetricHistory(retention=60, resolution=1.0)
+        accounting.record_snapshot(Snapshot({}, 1000.0, 10.0, 0.0))
+        _write(root, 'shairport-sync', usage=300000, wbytes=1024)
+        accounting.record_snapshot(Snapshot({}, 1001.0, 11.0, 0.0))
+        accounting.record_snapshot(Snapshot({}, 1010.0, 20.0, 0.0))  # closes the 10s slot
+
+        prefix = 'service.shairport-sync.'
+        assert set(accounting.history.metrics()) == {
+            prefix + name for name in ('memory', 'pids', 'cpu_percent', 'read_rate', 'write_rate')
+        }
+        assert accounting.history.query(prefix + 'cpu_percent', 3600)['values'][-1] == 30.0
+        assert accounting.history.query(prefix + 'write_rate', 3600)['values'][-1] == 1024.0
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Cgroup Accounting Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse io.stat", test_parse_io_stat),
+        ("Rates from Deltas", test_rates_from_deltas),
+        ("Restart and Stop", test_restart_and_stop),
+        ("Out-of-order Sample", test_out_of_order_sample_is_skipped),
+        ("Without cgroup v2", test_without_cgroup_v2),
+        ("History Recording", test_records_into_history),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
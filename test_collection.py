@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel, deadline-bounded collection
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.collection import ParallelCollector  # noqa: E402
+
+
+def test_collectors_run_concurrently():
+    """Total time is bounded by the slowest collector, not the sum"""
+    pool = ParallelCollector(max_workers=4)
+    collectors = {f'c{i}': (lambda i=i: (time.sleep(0.2), i)[1], 1.0) for i in range(4)}
+
+    started = time.monotonic()
+    results, status = pool.run(collectors, deadline=2.0)
+    assert time.monotonic() - started < 0.6
+    assert results == {'c0': 0, 'c1': 1, 'c2': 2, 'c3': 3}
+    assert not any(s['timed_out'] or s['stale'] for s in status.values())
+
+
+def test_timeout_returns_last_good_value():
+    """A slow collector is marked timed_out and falls back to its last good value"""
+    pool = ParallelCollector()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return 'value'
+
+    results, status = pool.run({'slow': (slow, 1.0)}, deadline=1.0)
+    assert results['slow'] == 'value'
+
+    started = time.monotonic()
+    results, status = pool.run({'slow': (slow, 0.1), 'fast': (lambda: 1, 1.0)}, deadline=1.0)
+    assert time.monotonic() - started < 0.5
+    assert results == {'slow': 'value', 'fast': 1}
+    assert status['slow']['timed_out'] and status['slow']['stale']
+    assert not status['fast']['timed_out']
+
+    # The hung call is reused rather than started again
+    pool.run({'slow': (slow, 0.05)}, deadline=0.05)
+    assert len(calls) == 2
+    release.set()
+
+
+def test_overall_deadline():
+    """The overall deadline caps collectors with longer individual timeouts"""
+    pool = ParallelCollector()
+    started = time.monotonic()
+    results, status = pool.run({'hung': (lambda: time.sleep(1), 5.0)}, deadline=0.1)
+    assert time.monotonic() - started < 0.5
+    assert results['hung'] is None
+    assert status['hung']['timed_out'] and not status['hung']['stale']
+
+
+def test_errors_are_reported():
+    """A failing collector reports its error without affecting the others"""
+    pool = ParallelCollector()
+    results, status = pool.run({'bad': (lambda: 1 / 0, 1.0), 'good': (lambda: 2, 1.0)}, deadline=1.0)
+    assert results == {'bad': None, 'good': 2}
+    assert 'division' in status['bad']['error']
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Parallel Collection Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Concurrent Collectors", test_collectors_run_concurrently),
+        ("Timeout Fallback", test_timeout_returns_last_good_value),
+        ("Overall Deadline", test_overall_deadline),
+        ("Collector Errors", test_errors_are_reported),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
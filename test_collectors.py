@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for the collector registry and its cadence schedule
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules.collectors import CollectorRegistry  # noqa: E402
+from app.modules import system_monitor  # noqa: E402
+
+
+def counter():
+    """Collector returning how often it has been called"""
+    calls = []
+
+    def collect():
+        calls.append(1)
+        return len(calls)
+    return collect
+
+
+def test_runs_only_when_due():
+    """Each collector keeps its own cadence; None runs once"""
+    registry = CollectorRegistry()
+    fast, slow, once = counter(), counter(), counter()
+    registry.register('fast', fast, 0.1, key='fast', groups=('stats',))
+    registry.register('slow', slow, 60, key='slow', groups=('stats',))
+    registry.register('once', once, None, key='once', groups=('stats',))
+
+    assert registry.collect('stats') == {'fast': 1, 'slow': 1, 'once': 1}
+    assert registry.collect('stats') == {'fast': 1, 'slow': 1, 'once': 1}
+    time.sleep(0.12)
+    assert registry.collect('stats') == {'fast': 2, 'slow': 1, 'once': 1}
+
+
+def test_groups_and_nested_keys():
+    """Groups select collectors; dotted keys nest and dict values merge"""
+    registry = CollectorRegistry()
+    registry.register('percent', lambda: 5.0, 1, key='cpu.percent', groups=('stats', 'detailed'))
+    registry.register('freq', lambda: {'frequency': 1500}, 1, key='cpu')
+    registry.register('other', lambda: 'x', 1, key='other')
+    assert registry.collect('stats') == {'cpu': {'percent': 5.0}}
+    assert registry.collect('detailed') == {'cpu': {'percent': 5.0, 'frequency': 1500}, 'other': 'x'}
+
+
+def test_dependencies():
+    """Dependency values are passed in; internal collectors stay out of the output"""
+    registry = CollectorRegistry()
+    raw = counter()
+    registry.register('raw', raw, 1, groups=())
+    registry.register('double', lambda raw: raw * 2, 1, key='double', depends=['raw'],
+                      groups=('stats',))
+    registry.register('triple', lambda raw: raw * 3, 1, key='triple', depends=['raw'],
+                      groups=('stats',))
+    assert registry.collect('stats') == {'double': 2, 'triple': 3}
+    assert registry.collectors['raw'].runs == 1  # shared, read once
+
+
+def test_invalid_registrations():
+    """Unknown cost classes, missing or non-cheap dependencies and duplicates are rejected"""
+    registry = CollectorRegistry()
+    registry.register('slow', lambda: 1, 1, cost='io')
+    for kwargs in ({'cost': 'free'}, {'depends': ['missing']}, {'depends': ['slow']}):
+        try:
+            registry.register('bad', lambda **kw: 1, 1, **kwargs)
+            assert False, f"accepted {kwargs}"
+        except ValueError:
+            pass
+    try:
+        registry.register('slow', lambda: 1, 1)
+        assert False, 'accepted a duplicate'
+    except ValueError:
+        pass
+
+
+def test_pooled_timeout_and_errors():
+    """io collectors run under their timeout; failures keep the last value"""
+    registry = CollectorRegistry()
+    state = {'fail': False}
+
+    def flaky():
+        if state['fail']:
+            raise RuntimeError('boom')
+        return 'ok'
+
+    registry.register('hung', lambda: time.sleep(1), 1, key='hung', cost='io', timeout=0.1)
+    registry.register('flaky', flaky, 0.05, key='flaky', cost='io')
+    started = time.monotonic()
+    assert registry.collect('detailed') == {'hung': None, 'flaky': 'ok'}
+    assert time.monotonic() - started < 0.5
+    assert registry.collection_status('detailed')['hung']['timed_out']
+
+    state['fail'] = True
+    time.sleep(0.06)
+    assert registry.collect('detailed')['flaky'] == 'ok'
+    status = registry.collection_status('detailed')['flaky']
+    assert status['stale'] and 'boom' in status['error']
+
+
+def test_system_stats_shape():
+    """The registered system collectors still produce the dashboard dicts"""
+    stats = system_monitor.get_all_stats()
+    assert set(stats) == {'cpu', 'memory', 'disk', 'system'}
+    assert set(stats['memory']) == {'total', 'used', 'percent'}
+    assert 'uptime' in stats['system']
+
+
+def test_status_endpoint():
+    """The endpoint lists collectors with their cadence"""
+    client = create_app('testing').test_client()
+    data = client.get('/api/system/collectors').get_json()
+    by_name = {c['name']: c for c in data['collectors']}
+    assert by_name['weather']['interval'] == 600 and by_name['weather']['cost'] == 'network'
+    assert 'raspotify' in by_name  # service modules plug in on import
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Collector Registry Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Cadence", test_runs_only_when_due),
+        ("Groups / Keys", test_groups_and_nested_keys),
+        ("Dependencies", test_dependencies),
+        ("Invalid Registrations", test_invalid_registrations),
+        ("Pooled Timeout / Errors", test_pooled_timeout_and_errors),
+        ("System Stats Shape", test_system_stats_shape),
+        ("Status Endpoint", test_status_endpoint),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for ETag / conditional GET support
+"""
+
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+
+
+def test_not_modified():
+    """A matching If-None-Match is answered with an empty 304"""
+    client = create_app('testing').test_client()
+    first = client.get('/api/logs/services')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    second = client.get('/api/logs/services', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+
+
+def test_weak_match():
+    """Tags weakened by a proxy (W/"...") still match"""
+    client = create_app('testing').test_client()
+    etag = client.get('/api/services/list').headers['ETag']
+    response = client.get('/api/services/list', headers={'If-None-Match': f'W/{etag}'})
+    assert response.status_code == 304
+
+
+def test_query_string_changes_tag():
+    """Different query parameters never share a tag"""
+    client = create_app('testing').test_client()
+    plain = client.get('/api/gpio/pins').headers['ETag']
+    with_since = client.get('/api/gpio/pins?since=1').headers['ETag']
+    assert plain != with_since
+
+
+def test_gpio_state_change_invalidates():
+    """Toggling a pin changes the pins ETag"""
+    client = create_app('testing').test_client()
+    before = client.get('/api/gpio/pins').headers['ETag']
+    assert client.post('/api/gpio/pin/gpio_17/toggle').status_code == 200
+    after = client.get('/api/gpio/pins', headers={'If-None-Match': before})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != before
+
+
+def test_new_instance_changes_tag():
+    """A re-created controller or a new process never reuses an old tag"""
+    from app import conditional
+    from app.modules import gpio_control
+
+    client = create_app('testing').test_client()
+    before = client.get('/api/gpio/pins').headers['ETag']
+    controller = gpio_control._gpio_controller
+    try:
+        gpio_control._gpio_controller = gpio_control.GPIOController()  # version back at 0
+        after = client.get('/api/gpio/pins', headers={'If-None-Match': before})
+        assert after.status_code == 200
+        assert after.headers['ETag'] != before
+    finally:
+        gpio_control._gpio_controller = controller
+
+    process_version = conditional.PROCESS_VERSION
+    try:
+        conditional.PROCESS_VERSION = 'restarted'
+        after = client.get('/api/gpio/pins', headers={'If-None-Match': before})
+        assert after.status_code == 200
+        static = client.get('/api/logs/services').headers['ETag']
+        assert 'restarted' in static
+    finally:
+        conditional.PROCESS_VERSION = process_version
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Conditional GET Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Not Modified", test_not_modified),
+        ("Weak Match", test_weak_match),
+        ("Query String", test_query_string_changes_tag),
+        ("GPIO Invalidation", test_gpio_state_change_invalidates),
+        ("New Instance", test_new_instance_changes_tag),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
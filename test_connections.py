@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the /proc/net connection stats
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.connections import ConnectionStats, parse_snmp, parse_sockstat  # noqa: E402
+
+TCP = """  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000:075B 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0 100 0 0 10 0
+   1: 0100007F:075B 0100007F:A1B2 01 00000000:00000000 00:00000000 00000000     0        0 1002 1 0 20 4 30 10 -1
+   2: 0100007F:A1B2 0100007F:075B 01 00000000:00000000 00:00000000 00000000     0        0 1003 1 0 20 4 30 10 -1
+   3: 0100007F:0050 0100007F:B3C4 06 00000000:00000000 03:00000F3A 00000000     0        0 0 3 0
+"""
+
+TCP6 = """  sl  local_address                         remote_address                        st tx_queue rx_queue
+   0: 00000000000000000000000000000000:0050 00000000000000000000000000000000:0000 0A 00000000:00000000
+"""
+
+UDP = """   sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode ref pointer drops
+  100: 00000000:0044 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 2001 2 0 0
+"""
+
+SOCKSTAT = """sockets: used 180
+TCP: inuse 3 orphan 0 tw 1 alloc 4 mem 1
+UDP: inuse 1 mem 2
+"""
+
+SNMP = """Ip: Forwarding DefaultTTL
+Ip: 1 64
+Tcp: RtoAlgorithm RtoMin RtoMax MaxConn ActiveOpens PassiveOpens AttemptFails EstabResets CurrEstab InSegs OutSegs RetransSegs InErrs OutRsts InCsumErrors
+Tcp: 1 200 120000 -1 15 30 1 2 2 900 850 7 0 4 0
+Udp: InDatagrams NoPorts InErrors OutDatagrams RcvbufErrors SndbufErrors InCsumErrors IgnoredMulti MemErrors
+Udp: 220 3 0 210 0 0 0 0 0
+"""
+
+
+def fake_proc(tmp):
+    net = Path(tmp) / 'net'
+    net.mkdir()
+    (net / 'tcp').write_text(TCP)
+    (net / 'tcp6').write_text(TCP6)
+    (net / 'udp').write_text(UDP)
+    (net / 'sockstat').write_text(SOCKSTAT)
+    (net / 'sockstat6').write_text("TCP6: inuse 1\nUDP6: inuse 0\n")
+    (net / 'snmp').write_text(SNMP)
+    return tmp
+
+
+def test_parse_sockstat_snmp():
+    """Key/value pairs per protocol; only the listed snmp counters are kept"""
+    sockstat = parse_sockstat(SOCKSTAT)
+    assert sockstat['sockets'] == {'used': 180}
+    assert sockstat['tcp'] == {'inuse': 3, 'orphan': 0, 'tw': 1, 'alloc': 4, 'mem': 1}
+    snmp = parse_snmp(SNMP)
+    assert set(snmp) == {'tcp', 'udp'}
+    assert snmp['tcp']['CurrEstab'] == 2
+    assert snmp['tcp']['RetransSegs'] == 7
+    assert 'RtoMin' not in snmp['tcp']
+    assert snmp['udp']['OutDatagrams'] == 210
+
+
+def test_counts_and_states():
+    """Every table line is a socket; TCP states are named"""
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = ConnectionStats(fake_proc(tmp)).stats()
+    assert stats['tables'] == {'tcp': 4, 'tcp6': 1, 'udp': 1}  # udp6 missing
+    assert stats['total'] == 6
+    assert stats['tcp_states'] == {'ESTABLISHED': 2, 'LISTEN': 2, 'TIME_WAIT': 1}
+    assert stats['sockstat']['tcp6'] == {'inuse': 1}
+    assert stats['sockstat']['tcp']['tw'] == 1
+
+
+def test_max_age():
+    """Results are reused until they are max_age old"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = ConnectionStats(fake_proc(tmp), max_age=60)
+        first = engine.stats()
+        (Path(tmp) / 'net' / 'udp').write_text(UDP.splitlines()[0] + '\n')
+        assert engine.stats() is first
+        engine.max_age = 0
+        assert engine.stats()['total'] == 5
+
+
+def test_empty_proc():
+    """No /proc/net gives zero counts rather than an error"""
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = ConnectionStats(tmp).stats()
+    assert stats['total'] == 0
+    assert stats['tcp_states'] == {} and stats['snmp'] == {}
+
+
+def test_real_proc():
+    """On the real /proc the TCP states add up to the TCP table sizes"""
+    stats = ConnectionStats().stats()
+    tcp = stats['tables'].get('tcp', 0) + stats['tables'].get('tcp6', 0)
+    assert sum(stats['tcp_states'].values()) == tcp
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Connection Stats Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse sockstat/snmp", test_parse_sockstat_snmp),
+        ("Counts and States", test_counts_and_states),
+        ("Max Age", test_max_age),
+        ("Empty /proc", test_empty_proc),
+        ("Real /proc", test_real_proc),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for delta-encoded payloads
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules.delta import DeltaTracker, flatten, resolve  # noqa: E402
+
+
+def apply(state, changes):
+    """Reference patch applier (same rules as applyDelta in dashboard.js)"""
+    state = copy.deepcopy(state)
+    for change in changes:
+        keys = [k.replace('~1', '/').replace('~0', '~') for k in change['path'].split('/')[1:]]
+        target = state
+        for key in keys[:-1]:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+        last = keys[-1]
+        if change['op'] == 'remove':
+            if isinstance(target, list):
+                del target[int(last)]
+            else:
+                del target[last]
+        elif isinstance(target, list):
+            target[int(last)] = change['value']
+        else:
+            target[last] = change['value']
+    return state
+
+
+def test_only_changed_leaves():
+    """A changed leaf produces a single replace operation"""
+    tracker = DeltaTracker()
+    base = tracker.update({'cpu': {'percent': 5.0, 'temperature': 48.1}, 'uptime': '1 day'})
+    version = tracker.update({'cpu': {'percent': 7.5, 'temperature': 48.1}, 'uptime': '1 day'})
+    assert version == base + 1
+    assert tracker.changes_since(base) == [{'op': 'replace', 'path': '/cpu/percent', 'value': 7.5}]
+    assert tracker.changes_since(version) == []
+
+
+def test_unchanged_payload_keeps_version():
+    """Identical payloads, or a repeated key, do not create a version"""
+    tracker = DeltaTracker()
+    version = tracker.update({'a': 1}, key=1.0)
+    assert tracker.update({'a': 2}, key=1.0) == version  # same snapshot key skips the comparison
+    assert tracker.update({'a': 1}) == version
+
+
+def test_patches_round_trip():
+    """Applying the changes to the base payload reproduces the new payload"""
+    old = {'pins': [{'id': 'a', 'state': 0}, {'id': 'b', 'state': 1}],
+           'meta': {'count': 2, 'gone': {'x': 1}}, 'odd/key': 1}
+    new = {'pins': [{'id': 'a', 'state': 1}, {'id': 'b', 'state': 1}, {'id': 'c', 'state': 0}],
+           'meta': {'count': 3}, 'odd/key': 2, 'added': [1]}
+    tracker = DeltaTracker()
+    base = tracker.update(old)
+    tracker.update({'pins': [], 'meta': {}})  # an intermediate version
+    tracker.update(new)
+    changes = tracker.changes_since(base)
+    assert apply(old, changes) == new
+    # The pins list changed length, so it is sent whole
+    assert {'op': 'replace', 'path': '/pins', 'value': new['pins']} in changes
+    assert {'op': 'remove', 'path': '/meta/gone'} in changes
+
+
+def test_unknown_version_gets_full_payload():
+    """Too-old or foreign versions fall back to the full payload"""
+    tracker = DeltaTracker(window=2)
+    first = tracker.update({'n': 1})
+    tracker.update({'n': 2})
+    tracker.update({'n': 3})
+    body = tracker.respond({'n': 3}, since=first)
+    assert body == {'n': 3, 'version': first + 2, 'delta': False}
+    assert tracker.respond({'n': 3}, since=12345)['delta'] is False
+    assert tracker.respond({'n': 3}, since=first + 1)['changes'] == [
+        {'op': 'replace', 'path': '/n', 'value': 3}
+    ]
+
+
+def test_flatten_and_resolve():
+    """JSON pointers escape "/" and "~" and resolve list indices"""
+    leaves, lists = flatten({'a/b': {'c~d': [10, {'e': None}]}, 'empty': {}})
+    assert leaves == {'/a~1b/c~0d/0': 10, '/a~1b/c~0d/1/e': None, '/empty': {}}
+    assert lists == {'/a~1b/c~0d': 2}
+    assert resolve({'a/b': {'c~d': [10, 20]}}, '/a~1b/c~0d/1') == 20
+
+
+def test_stats_endpoint_delta():
+    """/api/system/stats returns a version, then deltas for ?since="""
+    app = create_app('testing')
+    client = app.test_client()
+    full = client.get('/api/system/stats').get_json()
+    assert full['delta'] is False and 'cpu' in full
+
+    delta = client.get(f"/api/system/stats?since={full['version']}").get_json()
+    assert delta['delta'] is True and delta['base'] == full['version']
+    assert 'cpu' not in delta and 'sampled_at' in delta
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Delta Payload Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Changed Leaves", test_only_changed_leaves),
+        ("Unchanged Payload", test_unchanged_payload_keeps_version),
+        ("Patch Round Trip", test_patches_round_trip),
+        ("Full Resync", test_unknown_version_gets_full_payload),
+        ("JSON Pointers", test_flatten_and_resolve),
+        ("Stats Endpoint", test_stats_endpoint_delta),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
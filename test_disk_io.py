@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the /proc/diskstats I/O collector
+Uses a fake diskstats file so deltas are deterministic
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.disk_io import DiskIOCollector, parse_diskstats  # noqa: E402
+from app.modules.metric_history import MetricHistory  # noqa: E402
+from app.modules.metrics_sampler import Snapshot  # noqa: E402
+
+
+def _line(name, reads=0, sectors_read=0, ms_reading=0, writes=0, sectors_written=0,
+          ms_writing=0, in_flight=0, io_ms=0, weighted_ms=0, major=179, minor=0):
+    return (f"{major:4d} {minor:7d} {name} {reads} 0 {sectors_read} {ms_reading} "
+            f"{writes} 0 {sectors_written} {ms_writing} {in_flight} {io_ms} {weighted_ms} 0 0 0 0\n")
+
+
+def _write(proc, *lines):
+    with open(os.path.join(proc, 'diskstats'), 'w') as f:
+        f.writelines(lines)
+
+
+def test_parse_skips_partitions_and_loop_devices():
+    """Only whole disks are collected"""
+    text = (_line('loop0', major=7) + _line('mmcblk0', reads=5) + _line('mmcblk0p1', reads=3, minor=1)
+            + _line('sda', reads=7, major=8) + _line('sda1', major=8, minor=1))
+    devices = parse_diskstats(text)
+    assert set(devices) == {'mmcblk0', 'sda'}
+    assert devices['mmcblk0'][0] == 5
+
+
+def test_rates_and_latency():
+    """Throughput, IOPS, utilization, queue depth and await from deltas"""
+    with tempfile.TemporaryDirectory() as proc:
+        _write(proc, _line('mmcblk0'))
+        collector = DiskIOCollector(proc_path=proc)
+        assert collector.sample(now=0.0) == {}
+
+        # 2 seconds: 20 reads (2048 sectors, 100ms), 10 writes (800 sectors, 300ms)
+        _write(proc, _line('mmcblk0', reads=20, sectors_read=2048, ms_reading=100, writes=10,
+                           sectors_written=800, ms_writing=300, in_flight=1, io_ms=500, weighted_ms=800))
+        stats = collector.sample(now=2.0)['mmcblk0']
+        assert stats['read_bytes_per_sec'] == 2048 * 512 / 2
+        assert stats['write_bytes_per_sec'] == 800 * 512 / 2
+        assert stats['read_iops'] == 10.0 and stats['write_iops'] == 5.0
+        assert stats['utilization'] == 25.0
+        assert stats['queue_depth'] == 0.4
+        assert stats['read_await_ms'] == 5.0 and stats['write_await_ms'] == 30.0
+        assert stats['await_ms'] == round(400 / 30, 2)
+        assert stats['in_flight'] == 1
+
+
+def test_counter_reset_is_skipped():
+    """A device whose counters went backwards reports nothing for that interval"""
+    with tempfile.TemporaryDirectory() as proc:
+        _write(proc, _line('sda', reads=100, major=8))
+        collector = DiskIOCollector(proc_path=proc)
+        collector.sample(now=0.0)
+        _write(proc, _line('sda', reads=5, major=8))
+        assert collector.sample(now=1.0) == {}
+        _write(proc, _line('sda', reads=15, major=8))
+        assert collector.sample(now=2.0)['sda']['read_iops'] == 10.0
+
+
+def test_out_of_order_sample_is_skipped():
+    """A sample older than the last one reports the newer stats, never negative rates"""
+    with tempfile.TemporaryDirectory() as proc:
+        _write(proc, _line('sda', reads=0, major=8))
+        collector = DiskIOCollector(proc_path=proc)
+        collector.sample(now=10.0)
+        _write(proc, _line('sda', reads=20, major=8))
+        results = collector.sample(now=12.0)
+
+        # A snapshot taken at 11.0 whose callback runs after a request sampled at 12.0
+        _write(proc, _line('sda', reads=25, major=8))
+        assert collector.sample(now=11.0) == results
+        assert collector.sampled_at == 12.0 and collector.counters['sda'][0] == 20
+        _write(proc, _line('sda', reads=30, major=8))
+        assert collector.sample(now=13.0)['sda']['read_iops'] == 10.0
+
+
+def test_records_into_history():
+    """The sampler callback records throughput and utilization, averaged per 10s"""
+    with tempfile.TemporaryDirectory() as proc:
+        _write(proc, _line('mmcblk0'))
+        collector = DiskIOCollector(proc_path=proc)
+        collector.history = MetricHistory(retention=60, resolution=1.0)
+        collector.record_snapshot(Snapshot({}, 1000.0, 10.0, 0.0))
+        _write(proc, _line('mmcblk0', writes=4, sectors_written=8, io_ms=100))
+        collector.record_snapshot(Snapshot({}, 1001.0, 11.0, 0.0))  # 4096 B/s
+        _write(proc, _line('mmcblk0', writes=8, sectors_written=24, io_ms=200))
+        collector.record_snapshot(Snapshot({}, 1002.0, 12.0, 0.0))  # 8192 B/s
+        assert collector.history.query('disk.mmcblk0.write_rate', 3600)['count'] == 0
+        collector.record_snapshot(Snapshot({}, 1010.0, 20.0, 0.0))  # next slot
+
+        assert set(collector.history.metrics()) == {
+            'disk.mmcblk0.read_rate', 'disk.mmcblk0.write_rate', 'disk.mmcblk0.utilization'
+        }
+        result = collector.history.query('disk.mmcblk0.write_rate', 3600)
+        assert result['values'] == [6144.0]
+        assert result['resolution'] == 10.0
+        buffer = collector.history.buffers['disk.mmcblk0.write_rate']
+        assert buffer.capacity == 6  # 60s retention / 10s, not 60 slots
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Disk I/O Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse diskstats", test_parse_skips_partitions_and_loop_devices),
+        ("Rates and Latency", test_rates_and_latency),
+        ("Counter Reset", test_counter_reset_is_skipped),
+        ("Out-of-order Sample", test_out_of_order_sample_is_skipped),
+        ("History Recording", test_records_into_history),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
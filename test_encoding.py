@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for Accept-negotiated response encoding
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.encoding import MSGPACK_AVAILABLE, negotiate  # noqa: E402
+
+PAYLOAD = {'success': True, 'values': [1.5, 2.25], 'name': 'cpu.temperature', 'count': 2}
+
+
+def encode(accept=None):
+    app = create_app('testing')
+    headers = {'Accept': accept} if accept else {}
+    with app.test_request_context('/', headers=headers):
+        return negotiate(PAYLOAD)
+
+
+def test_json_by_default():
+    """Browsers (*/*) and clients without Accept get JSON"""
+    for accept in (None, '*/*', 'text/html,application/xhtml+xml,*/*;q=0.8'):
+        response = encode(accept)
+        assert response.mimetype == 'application/json', accept
+        assert json.loads(response.get_data()) == PAYLOAD
+        assert 'Accept' in response.vary
+
+
+def test_msgpack_when_requested():
+    """Accept: application/msgpack gets MessagePack (JSON if msgpack is missing)"""
+    response = encode('application/msgpack')
+    if not MSGPACK_AVAILABLE:
+        assert response.mimetype == 'application/json'
+        return
+    import msgpack
+    assert response.mimetype == 'application/msgpack'
+    assert msgpack.unpackb(response.get_data(), raw=False) == PAYLOAD
+    assert encode('application/x-msgpack').mimetype == 'application/msgpack'
+
+
+def test_json_preferred_by_quality():
+    """A client preferring JSON keeps JSON even if it also accepts msgpack"""
+    response = encode('application/json, application/msgpack;q=0.5')
+    assert response.mimetype == 'application/json'
+
+
+def test_status_preserved():
+    """The status code is passed through for both encodings"""
+    app = create_app('testing')
+    for accept in ('application/json', 'application/msgpack'):
+        with app.test_request_context('/', headers={'Accept': accept}):
+            assert negotiate(PAYLOAD, 202).status_code == 202
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Response Encoding Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("JSON Default", test_json_by_default),
+        ("MessagePack", test_msgpack_when_requested),
+        ("Quality Preference", test_json_preferred_by_quality),
+        ("Status Code", test_status_preserved),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the OpenMetrics /metrics exporter
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules import procfs  # noqa: E402
+from app.modules.exporter import MetricFamily, render  # noqa: E402
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{.*\})? (-?[0-9.e+]+|NaN|[+-]Inf)$')
+
+
+def test_family_rendering():
+    """Counters get _total samples, units and escaped labels"""
+    family = MetricFamily('pi_disk_read_bytes', 'counter', 'Bytes read', 'bytes')
+    family.add(1024, device='mmcblk0').add(None, device='sda')
+    text = render([family, MetricFamily('pi_empty', 'gauge', 'Nothing')])
+    assert text == (
+        '# TYPE pi_disk_read_bytes counter\n'
+        '# UNIT pi_disk_read_bytes bytes\n'
+        '# HELP pi_disk_read_bytes Bytes read\n'
+        'pi_disk_read_bytes_total{device="mmcblk0"} 1024\n'
+        '# EOF\n'
+    ), text
+
+    gauge = MetricFamily('pi_mqtt_device_online', 'gauge', 'Online').add(True, device='Desk "lamp"\\1')
+    assert 'pi_mqtt_device_online{device="Desk \\"lamp\\"\\\\1"} 1' in render([gauge])
+
+
+def test_metrics_endpoint():
+    """/metrics serves well-formed OpenMetrics with the core families"""
+    client = create_app('testing').test_client()
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('application/openmetrics-text')
+    text = response.get_data(as_text=True)
+    assert text.endswith('# EOF\n')
+    for line in text.splitlines():
+        assert line.startswith('#') or SAMPLE_LINE.match(line), line
+    for name in ('pi_cpu_seconds_total', 'pi_memory_total_bytes', 'pi_filesystem_size_bytes',
+                 'pi_gpio_pin_state', 'pi_exporter_source_up'):
+        assert name in text, name
+    assert 'pi_exporter_source_up{source="system"} 1' in text
+    total = re.search(r'^pi_memory_total_bytes (\d+)$', text, re.M)
+    assert int(total.group(1)) == procfs.sample(track_cpu=False).mem_total
+
+
+def test_gpio_state_exported():
+    """Pin levels follow GPIO changes"""
+    client = create_app('testing').test_client()
+    before = client.get('/metrics').get_data(as_text=True)
+    level = int(re.search(r'pi_gpio_pin_state\{pin="gpio_17"[^}]*\} (\d)', before).group(1))
+    client.post('/api/gpio/pin/gpio_17/toggle')
+    after = client.get('/metrics').get_data(as_text=True)
+    assert re.search(rf'pi_gpio_pin_state\{{pin="gpio_17"[^}}]*\}} {1 - level}', after)
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Metrics Exporter Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Family Rendering", test_family_rendering),
+        ("Metrics Endpoint", test_metrics_endpoint),
+        ("GPIO State", test_gpio_state_exported),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled outbound HTTP client
+Runs against a local stub HTTP server - no internet access needed
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.http_client import HttpClient  # noqa: E402
+from app.modules.system_monitor import _parse_weather  # noqa: E402
+
+
+class StubServer:
+    """Local HTTP/1.1 server answering JSON and recording client ports"""
+
+    def __init__(self):
+        self.payload = {'ip': '203.0.113.42'}
+        self.status = 200
+        self.client_ports = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, so pooling is observable
+
+            def do_GET(self):
+                stub.client_ports.append(self.client_address[1])
+                body = json.dumps(stub.payload).encode()
+                self.send_response(stub.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_connections_are_reused():
+    """Repeated requests share one pooled connection"""
+    stub = StubServer()
+    try:
+        client = HttpClient(retries=0)
+        for _ in range(5):
+            assert client.get(stub.url).json()['ip'] == '203.0.113.42'
+        assert len(stub.client_ports) == 5
+        assert len(set(stub.client_ports)) == 1
+        client.stop()
+    finally:
+        stub.close()
+
+
+def test_value_persists_across_restarts():
+    """The last good value is loaded from disk while the server is down"""
+    stub = StubServer()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = HttpClient(cache_dir=cache_dir, retries=0)
+        resource = client.register('public_ip', stub.url, lambda d: d['ip'], interval=300)
+        assert resource.get() == '203.0.113.42'
+        client.stop()
+        stub.close()
+
+        # "Restart" with the network down
+        client = HttpClient(cache_dir=cache_dir, retries=0)
+        resource = client.register('public_ip', stub.url, lambda d: d['ip'], interval=300)
+        started = time.monotonic()
+        assert resource.get() == '203.0.113.42'
+        assert time.monotonic() - started < 0.1
+        assert resource.status()['stale'] is False
+        client.stop()
+
+
+def test_failed_refresh_keeps_last_good_value():
+    """Errors are reported without dropping the value, and retries back off"""
+    stub = StubServer()
+    try:
+        client = HttpClient(retries=0)
+        resource = client.register('public_ip', stub.url, lambda d: d['ip'], interval=600)
+        assert resource.get() == '203.0.113.42'
+
+        stub.status = 404
+        assert resource.refresh() is False
+        assert resource.get() == '203.0.113.42'
+        assert '404' in resource.status()['error']
+        assert not resource.is_due()  # waits RETRY_BACKOFF before trying again
+        client.stop()
+    finally:
+        stub.close()
+
+
+def test_background_refresh():
+    """The refresher thread fetches due resources without a caller"""
+    stub = StubServer()
+    try:
+        stub.payload = {
+            'current_condition': [{
+                'temp_C': '21', 'FeelsLikeC': '20', 'weatherDesc': [{'value': 'Sunny'}],
+                'humidity': '40', 'windspeedKmph': '7'
+            }]
+        }
+        client = HttpClient(retries=0)
+        resource = client.register('weather', stub.url, _parse_weather, interval=600)
+        client.start()
+        for _ in range(50):
+            if resource.value is not None:
+                break
+            time.sleep(0.05)
+        client.stop()
+        assert resource.value['temperature'] == 21
+        assert resource.value['condition'] == 'Sunny'
+    finally:
+        stub.close()
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("HTTP Client Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Connection Reuse", test_connections_are_reused),
+        ("Persisted Value", test_value_persists_across_restarts),
+        ("Failed Refresh", test_failed_refresh_keeps_last_good_value),
+        ("Background Refresh", test_background_refresh),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped round-robin metric archive
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.metric_archive import MAGIC, MetricArchive  # noqa: E402
+
+TIERS = ((1, 10), (5, 4))  # 1s for 10s, 5s for 20s
+
+
+def _archive(tmp, **kwargs):
+    options = dict(tiers=TIERS, max_metrics=4, flush_interval=3600)
+    options.update(kwargs)
+    return MetricArchive(os.path.join(tmp, 'metrics.rrd'), **options)
+
+
+def test_fixed_file_size():
+    """The file is sized for every slot up front and never grows"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp)
+        size = os.path.getsize(archive.path)
+        assert size == archive.file_size
+        for ts in range(1000, 1100):
+            archive.record({'a': 1.0, 'b': 2.0, 'c': 3.0, 'd': 4.0}, ts)
+        archive.flush()
+        assert os.path.getsize(archive.path) == size
+        archive.close()
+
+
+def test_tier_consolidation():
+    """Closed 1s rows roll into 5s rows as (avg, min, max)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp)
+        for ts in range(1000, 1017):
+            archive.record({'cpu.percent': float(ts - 1000)}, ts)
+        archive.flush()
+
+        fine = archive.fetch('cpu.percent', 1000, 1016, tier=0)
+        assert fine['step'] == 1
+        assert fine['timestamps'] == list(range(1006, 1016))  # last 10 closed rows
+        assert fine['avg'][-1] == 15.0
+
+        coarse = archive.fetch('cpu.percent', 1000, 1016, tier=1)
+        assert coarse['timestamps'] == [1000, 1005, 1010]  # 1015 is still open
+        assert coarse['avg'] == [2.0, 7.0, 12.0]
+        assert coarse['min'] == [0.0, 5.0, 10.0] and coarse['max'] == [4.0, 9.0, 14.0]
+        assert archive.pick_tier(10) == 0 and archive.pick_tier(15) == 1
+        archive.close()
+
+
+def test_gaps_are_skipped():
+    """Buckets with nothing recorded are blanked and not returned"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp)
+        for ts in (1000, 1001, 1005, 1006):
+            archive.record({'temp': 50.0}, ts)
+        archive.record({'temp': None}, 1007)
+        archive.record({'temp': 50.0}, 1008)
+        archive.flush()
+        rows = archive.fetch('temp', 1000, 1008, tier=0)
+        assert rows['timestamps'] == [1000, 1001, 1005, 1006]
+        archive.close()
+
+
+def test_restart_persistence():
+    """Rows and metric names survive closing and reopening the file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp)
+        for ts in range(1000, 1008):
+            archive.record({'memory.percent': 40.0 + ts - 1000}, ts)
+        archive.close()  # also writes the open buckets
+
+        reopened = _archive(tmp)
+        assert reopened.metrics() == ['memory.percent']
+        rows = reopened.fetch('memory.percent', 1000, 1007, tier=0)
+        assert rows['timestamps'] == list(range(1000, 1008))
+        assert rows['avg'][-1] == 47.0
+        reopened.record({'memory.percent': 48.0}, 1008)
+        reopened.record({'memory.percent': 49.0}, 1009)
+        reopened.flush()
+        rows = reopened.fetch('memory.percent', 1000, 1009, tier=0)
+        assert rows['timestamps'][-1] == 1008 and rows['avg'][-1] == 48.0
+        reopened.close()
+
+
+def test_corrupt_or_resized_header():
+    """A bad magic, a resized file or a new tier layout recreates the archive"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp)
+        archive.record({'a': 1.0}, 1000)
+        archive.close()
+        path = archive.path
+
+        with open(path, 'r+b') as f:
+            f.write(b'GARBAGE!')
+        reopened = _archive(tmp)
+        assert reopened.metrics() == []
+        with open(path, 'rb') as f:
+            assert f.read(len(MAGIC)) == MAGIC
+        reopened.record({'a': 1.0}, 1000)
+        reopened.close()
+
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) // 2)
+        reopened = _archive(tmp)
+        assert reopened.metrics() == []
+        assert os.path.getsize(path) == reopened.file_size
+        reopened.record({'a': 1.0}, 1000)
+        reopened.close()
+
+        resized = _archive(tmp, tiers=((1, 20), (5, 4)))
+        assert resized.metrics() == []
+        assert os.path.getsize(path) == resized.file_size
+        resized.close()
+
+
+def test_full_archive_and_lock():
+    """Metrics beyond max_metrics are dropped; a second writer is refused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp, max_metrics=2)
+        archive.record({'a': 1.0, 'b': 2.0, 'c': 3.0}, 1000)
+        assert archive.metrics() == ['a', 'b']
+        try:
+            _archive(tmp, max_metrics=2)
+            assert False, 'second writer opened the archive'
+        except RuntimeError:
+            pass
+        archive.close()
+
+
+def test_query_downsampling():
+    """query() merges rows into at most max_points buckets with min/max"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = _archive(tmp, tiers=((1, 120),))
+        now = int(time.time())
+        for i in range(61):
+            archive.record({'cpu.percent': float(i % 10)}, now - 60 + i)
+        result = archive.query('cpu.percent', 60, max_points=6)
+        assert 1 <= result['count'] <= 7
+        assert result['resolution'] == 10.0
+        assert min(result['min']) == 0.0 and max(result['max']) == 9.0
+        assert archive.query('unknown', 60) is None
+        archive.close()
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Metric Archive Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Fixed File Size", test_fixed_file_size),
+        ("Tier Consolidation", test_tier_consolidation),
+        ("Gaps Skipped", test_gaps_are_skipped),
+        ("Restart Persistence", test_restart_persistence),
+        ("Corrupt/Resized Header", test_corrupt_or_resized_header),
+        ("Full Archive and Lock", test_full_archive_and_lock),
+        ("Query Downsampling", test_query_downsampling),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory metric history ring buffers
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules.metric_history import (  # noqa: E402
+    MetricHistory, RingBuffer, flatten_stats, get_history, parse_duration
+)
+
+
+def test_parse_duration():
+    """Plain seconds and s/m/h/d suffixes; zero and garbage are rejected"""
+    assert parse_duration('90') == 90
+    assert parse_duration('15m') == 900
+    assert parse_duration('1.5h') == 5400
+    assert parse_duration('7d') == 7 * 86400
+    for bad in ('0', '-1h', '1w', 'abc'):
+        try:
+            parse_duration(bad)
+            assert False, f'accepted {bad}'
+        except ValueError:
+            pass
+
+
+def test_flatten_stats():
+    """Only numeric leaves are kept (booleans and strings are not metrics)"""
+    flat = flatten_stats({'cpu': {'percent': 12.5, 'throttle': {'active': True}},
+                          'system': {'hostname': 'pi', 'uptime': {'seconds': 60}}})
+    assert flat == {'cpu.percent': 12.5, 'system.uptime.seconds': 60}
+
+
+def test_ring_buffer_wraps():
+    """A full buffer overwrites its oldest samples and stays chronological"""
+    buffer = RingBuffer(4, base_time=1000.0)
+    for i in range(6):
+        buffer.append(1000.0 + i, float(i))
+    assert len(buffer) == 4
+    assert buffer.oldest_time() == 1002.0
+    ticks, values = buffer.since(1003.0)
+    assert list(values) == [3.0, 4.0, 5.0]
+    assert list(ticks) == [30, 40, 50]  # deciseconds since base_time
+
+
+def test_query_window_and_missing_values():
+    """Only samples inside the window are returned; None is stored as a gap"""
+    history = MetricHistory(retention=600, resolution=1.0)
+    now = time.time()
+    history.base_time = now - 3600  # samples before base_time would be clamped to it
+    for i in range(300):
+        history.record({'cpu.percent': None if i == 299 else float(i)}, now - 299 + i)
+    result = history.query('cpu.percent', 60)
+    assert 59 <= result['count'] <= 61
+    assert result['values'][-1] is None
+    assert result['values'][-2] == 298.0
+    assert history.query('unknown', 60) is None
+
+
+def test_query_downsampling():
+    """max_points averages samples into equal time buckets"""
+    history = MetricHistory(retention=600, resolution=1.0)
+    now = time.time()
+    history.base_time = now - 3600  # samples before base_time would be clamped to it
+    for i in range(600):
+        history.record({'memory.percent': 10.0 if i % 2 else 20.0}, now - 599.5 + i)
+    result = history.query('memory.percent', 600, max_points=60)
+    assert result['count'] <= 61
+    assert result['resolution'] == 10.0
+    assert all(abs(v - 15.0) < 1e-6 for v in result['values'] if v is not None)
+
+
+def test_coarse_resolution_averages():
+    """Metrics registered coarser than the history keep one mean per slot"""
+    history = MetricHistory(retention=600, resolution=1.0)
+    buffer = history.register('disk.sda.read_rate', resolution=10.0)
+    assert buffer.capacity == 60
+    for i, value in enumerate((1.0, 2.0, None, 3.0)):
+        history.record({'disk.sda.read_rate': value}, 1000.0 + i)
+    assert len(buffer) == 0  # slot still open
+    history.record({'disk.sda.read_rate': 9.0}, 1010.0)
+    _, values = buffer.since(0)
+    assert list(values) == [2.0]
+    assert buffer.memory_bytes() == 60 * 8
+
+
+def test_history_points_clamped():
+    """?points=0 and negative values are clamped instead of breaking the buckets"""
+    client = create_app('testing').test_client()
+    get_history().record({'cpu.percent': 5.0})
+    for points in ('0', '-5'):
+        response = client.get(f'/api/system/history?metric=cpu.percent&window=1h&points={points}')
+        assert response.status_code == 200, response.get_json()
+        result = response.get_json()
+        assert result['count'] == 1
+        assert result['resolution'] > 0
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Metric History Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse Duration", test_parse_duration),
+        ("Flatten Stats", test_flatten_stats),
+        ("Ring Buffer Wraps", test_ring_buffer_wraps),
+        ("Query Window", test_query_window_and_missing_values),
+        ("Query Downsampling", test_query_downsampling),
+        ("Coarse Resolution", test_coarse_resolution_averages),
+        ("Points Clamped", test_history_points_clamped),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
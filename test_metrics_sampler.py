@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the background metrics sampler
+Uses stub collectors so no system stats are read
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.metrics_sampler import MetricsSampler, SamplerJob, Snapshot  # noqa: E402
+
+
+def _sampler(stats, detailed=None, interval=0.02, idle_timeout=300.0):
+    sampler = MetricsSampler(interval=interval, detailed_interval=interval)
+    sampler.jobs = {
+        'stats': SamplerJob('stats', stats, interval),
+        'detailed': SamplerJob('detailed', detailed or (lambda: {}), interval,
+                               on_demand=True, idle_timeout=idle_timeout),
+    }
+    return sampler
+
+
+def test_snapshot_age():
+    """Snapshots are immutable and know their age"""
+    snapshot = Snapshot({'a': 1}, time.time(), time.monotonic() - 5, 0.01)
+    assert 5 <= snapshot.age() < 6
+    try:
+        snapshot.data = {}
+        assert False, 'snapshot is mutable'
+    except AttributeError:
+        pass
+
+
+def test_publishes_and_calls_back():
+    """Each run publishes a snapshot and feeds the callbacks"""
+    calls = []
+    sampler = _sampler(lambda: {'n': len(calls)})
+    sampler.add_callback('stats', calls.append)
+    sampler.start()
+    try:
+        snapshot = sampler.get_snapshot('stats', wait=2)
+        assert snapshot is not None and 'n' in snapshot.data
+        time.sleep(0.1)
+        assert len(calls) >= 2
+        assert all(isinstance(c, Snapshot) for c in calls)
+    finally:
+        sampler.stop()
+    assert sampler.get_snapshot('unknown') is None
+
+
+def test_failures_keep_last_snapshot():
+    """A failing collector or callback does not stop the sampler"""
+    runs = []
+
+    def flaky():
+        runs.append(1)
+        if len(runs) > 1:
+            raise RuntimeError('boom')
+        return {'ok': True}
+
+    sampler = _sampler(flaky)
+    sampler.add_callback('stats', lambda snapshot: 1 / 0)
+    sampler.start()
+    try:
+        sampler.get_snapshot('stats', wait=2)
+        time.sleep(0.1)
+        assert len(runs) >= 3
+        assert sampler.get_snapshot('stats').data == {'ok': True}
+    finally:
+        sampler.stop()
+
+
+def test_on_demand_job_pauses():
+    """An on-demand job stops running when nobody asks and resumes on request"""
+    runs = []
+    sampler = _sampler(lambda: {}, detailed=lambda: runs.append(1) or {}, idle_timeout=0.05)
+    sampler.start()
+    try:
+        sampler.get_snapshot('detailed', wait=2)
+        time.sleep(0.2)  # idle: the job goes to sleep
+        paused = len(runs)
+        time.sleep(0.1)
+        assert len(runs) == paused
+        assert sampler.get_snapshot('detailed', wait=2) is not None
+        time.sleep(0.05)
+        assert len(runs) > paused
+    finally:
+        sampler.stop()
+
+
+def test_stop_joins_threads():
+    """stop() ends every sampling thread"""
+    sampler = _sampler(lambda: {})
+    sampler.start()
+    threads = [job.thread for job in sampler.jobs.values()]
+    sampler.stop()
+    assert not sampler.running
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Metrics Sampler Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Snapshot Age", test_snapshot_age),
+        ("Publish and Callbacks", test_publishes_and_calls_back),
+        ("Failures Keep Snapshot", test_failures_keep_last_snapshot),
+        ("On-Demand Pause", test_on_demand_job_pauses),
+        ("Stop Joins Threads", test_stop_joins_threads),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
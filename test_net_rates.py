@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for per-interface network rates
+Uses a fake /sys/class/net tree so counter deltas are deterministic
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.net_rates import NetRateEngine, COUNTERS  # noqa: E402
+from app.modules.metric_history import MetricHistory  # noqa: E402
+from app.modules.metrics_sampler import Snapshot  # noqa: E402
+
+
+def _set_counters(root, iface, **values):
+    stats = os.path.join(root, iface, 'statistics')
+    os.makedirs(stats, exist_ok=True)
+    for counter in COUNTERS:
+        path = os.path.join(stats, counter)
+        if counter in values or not os.path.exists(path):
+            # Rewrite in place so cached descriptors see the new value
+            with open(path, 'w') as f:
+                f.write(f'{values.get(counter, 0)}\n')
+
+
+def test_raw_rates():
+    """Without smoothing the rate is the counter delta per second"""
+    with tempfile.TemporaryDirectory() as root:
+        _set_counters(root, 'wlan0', rx_bytes=1000, tx_packets=10)
+        engine = NetRateEngine(sysfs_path=root, smoothing=0)
+        assert engine.sample(now=0.0) == {}
+
+        _set_counters(root, 'wlan0', rx_bytes=3000, tx_packets=30)
+        rates = engine.sample(now=2.0)['wlan0']
+        assert rates['rx_bytes_per_sec'] == 1000.0
+        assert rates['tx_packets_per_sec'] == 10.0
+        assert rates['rx_errors_per_sec'] == 0.0
+
+
+def test_ewma_smoothing():
+    """A burst is damped by the EWMA and decays afterwards"""
+    with tempfile.TemporaryDirectory() as root:
+        _set_counters(root, 'eth0', rx_bytes=0)
+        engine = NetRateEngine(sysfs_path=root, smoothing=5.0)
+        engine.sample(now=0.0)
+        _set_counters(root, 'eth0', rx_bytes=0)
+        engine.sample(now=1.0)  # steady 0 B/s
+
+        _set_counters(root, 'eth0', rx_bytes=10000)
+        burst = engine.sample(now=2.0)['eth0']['rx_bytes_per_sec']
+        assert 0 < burst < 10000
+
+        after = engine.sample(now=3.0)['eth0']['rx_bytes_per_sec']
+        assert after < burst
+
+
+def test_counter_reset_and_removed_interface():
+    """Counter resets are skipped and removed interfaces are forgotten"""
+    with tempfile.TemporaryDirectory() as root:
+        _set_counters(root, 'wlan0', rx_bytes=5000)
+        _set_counters(root, 'lo', rx_bytes=5000)
+        engine = NetRateEngine(sysfs_path=root, smoothing=0)
+        engine.sample(now=0.0)
+        assert engine.interfaces() == ['wlan0']
+
+        _set_counters(root, 'wlan0', rx_bytes=100)  # driver reload
+        rates = engine.sample(now=1.0)['wlan0']
+        assert 'rx_bytes_per_sec' not in rates
+        assert rates['tx_bytes_per_sec'] == 0.0
+
+        shutil.rmtree(os.path.join(root, 'wlan0'))
+        assert engine.sample(now=2.0) == {}
+        assert engine.counters == {} and engine._fds == {}
+
+
+def test_out_of_order_sample_is_skipped():
+    """A sample older than the last one leaves the rates and EWMA state alone"""
+    with tempfile.TemporaryDirectory() as root:
+        _set_counters(root, 'eth0', rx_bytes=0)
+        engine = NetRateEngine(sysfs_path=root, smoothing=5)
+        engine.sample(now=10.0)
+        _set_counters(root, 'eth0', rx_bytes=2000)
+        rates = engine.sample(now=12.0)
+
+        # A snapshot taken at 11.0 whose callback runs after a request sampled at 12.0
+        _set_counters(root, 'eth0', rx_bytes=2500)
+        assert engine.sample(now=11.0) == rates
+        assert engine.sample(now=12.0) == rates
+        assert engine.sampled_at == 12.0
+        _set_counters(root, 'eth0', rx_bytes=3000)
+        assert engine.sample(now=13.0)['eth0']['rx_bytes_per_sec'] > 0
+
+
+def test_records_into_history():
+    """The sampler callback records byte rates into metric history"""
+    with tempfile.TemporaryDirectory() as root:
+        _set_counters(root, 'wlan0', rx_bytes=0, tx_bytes=0)
+        engine = NetRateEngine(sysfs_path=root, smoothing=0)
+        engine.history = MetricHistory(retention=60, resolution=1.0)
+
+        engine.record_snapshot(Snapshot({}, 1000.0, 10.0, 0.0))
+        _set_counters(root, 'wlan0', rx_bytes=4096, tx_bytes=1024)
+        engine.record_snapshot(Snapshot({}, 1001.0, 11.0, 0.0))
+        engine.record_snapshot(Snapshot({}, 1010.0, 20.0, 0.0))  # closes the 10s slot
+
+        assert set(engine.history.metrics()) == {'network.wlan0.rx_rate', 'network.wlan0.tx_rate'}
+        result = engine.history.query('network.wlan0.rx_rate', 3600)
+        assert result['values'][-1] == 4096.0
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Network Rates Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Raw Rates", test_raw_rates),
+        ("EWMA Smoothing", test_ewma_smoothing),
+        ("Counter Reset and Removal", test_counter_reset_and_removed_interface),
+        ("Out-of-order Sample", test_out_of_order_sample_is_skipped),
+        ("History Recording", test_records_into_history),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
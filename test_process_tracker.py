@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental process tracker
+Uses a fake /proc tree so CPU deltas are deterministic
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.process_tracker import (  # noqa: E402
+    ProcessTracker, parse_stat, CLOCK_TICKS, PAGE_SIZE
+)
+
+
+def _write_stat(proc, pid, name, ticks, started=100, rss_pages=256):
+    """Write a /proc/[pid]/stat line with utime=ticks and stime=0"""
+    fields = ['S'] + ['0'] * 10 + [str(ticks), '0'] + ['0'] * 6 + [str(started), '0', str(rss_pages)]
+    os.makedirs(os.path.join(proc, str(pid)), exist_ok=True)
+    with open(os.path.join(proc, str(pid), 'stat'), 'w') as f:
+        f.write(f"{pid} ({name}) {' '.join(fields)}\n")
+
+
+def _fake_proc(root):
+    with open(os.path.join(root, 'meminfo'), 'w') as f:
+        f.write('MemTotal:        1024000 kB\n')
+    return root
+
+
+def test_parse_stat_with_odd_names():
+    """Process names containing spaces and parentheses are parsed"""
+    with tempfile.TemporaryDirectory() as proc:
+        _write_stat(proc, 7, 'tmux: server (1)', ticks=42, started=9, rss_pages=3)
+        with open(os.path.join(proc, '7', 'stat'), 'rb') as f:
+            assert parse_stat(f.read()) == ('tmux: server (1)', 42, 9, 3)
+
+
+def test_cpu_percent_from_deltas():
+    """CPU % comes from tick deltas between two samples"""
+    with tempfile.TemporaryDirectory() as proc:
+        _fake_proc(proc)
+        _write_stat(proc, 1, 'busy', ticks=0)
+        _write_stat(proc, 2, 'idle', ticks=0)
+        tracker = ProcessTracker(proc_path=proc)
+
+        tracker.sample(now=10.0)
+        _write_stat(proc, 1, 'busy', ticks=CLOCK_TICKS // 2)  # half a second of CPU
+        table = {p.pid: p for p in tracker.sample(now=11.0)}
+        assert table[1].cpu_percent == 50.0
+        assert table[2].cpu_percent == 0.0
+
+
+def test_pid_reuse_and_exit():
+    """A reused PID starts from zero and exited PIDs are dropped"""
+    with tempfile.TemporaryDirectory() as proc:
+        _fake_proc(proc)
+        _write_stat(proc, 5, 'old', ticks=1000, started=100)
+        tracker = ProcessTracker(proc_path=proc)
+        tracker.sample(now=0.0)
+
+        _write_stat(proc, 5, 'new', ticks=5000, started=200)
+        table = tracker.sample(now=1.0)
+        assert table[0].cpu_percent == 0.0
+
+        os.remove(os.path.join(proc, '5', 'stat'))
+        assert tracker.sample(now=2.0) == []
+        assert tracker.state == {}
+
+
+def test_top_by_cpu_and_memory():
+    """top() ranks with a heap by CPU or memory"""
+    with tempfile.TemporaryDirectory() as proc:
+        _fake_proc(proc)
+        for pid in range(1, 21):
+            _write_stat(proc, pid, f'p{pid}', ticks=0, rss_pages=pid * 10)
+        tracker = ProcessTracker(proc_path=proc, max_age=3600)
+        # top() checks max_age against the real monotonic clock
+        now = time.monotonic()
+        tracker.sample(now=now - 1.0)
+        _write_stat(proc, 3, 'p3', ticks=CLOCK_TICKS, rss_pages=30)
+        tracker.sample(now=now)
+
+        top_cpu = tracker.top(sort='cpu', limit=1)
+        assert top_cpu[0]['pid'] == 3 and top_cpu[0]['cpu_percent'] == 100.0
+
+        top_memory = tracker.top(sort='memory', limit=3)
+        assert [p['pid'] for p in top_memory] == [20, 19, 18]
+        assert top_memory[0]['memory_mb'] == round(200 * PAGE_SIZE / 1024**2, 1)
+        assert tracker.count() == 20
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Process Tracker Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse stat", test_parse_stat_with_odd_names),
+        ("CPU Deltas", test_cpu_percent_from_deltas),
+        ("PID Reuse and Exit", test_pid_reuse_and_exit),
+        ("Top N", test_top_by_cpu_and_memory),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
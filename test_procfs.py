@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the pread procfs reader
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import psutil
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.procfs import (  # noqa: E402
+    CLOCK_TICKS, ProcReader, parse_cpu_line, parse_meminfo, parse_percpu_lines
+)
+
+STAT = ("cpu  {user} 0 {system} {idle} 50 0 10 0 0 0\n"
+        "cpu0 100 0 50 1000 10 0 2 0 0 0\n"
+        "intr 123456 0 0 0 0\n")
+
+MEMINFO = """MemTotal:         948304 kB
+MemFree:          310216 kB
+MemAvailable:     612540 kB
+Buffers:           40960 kB
+Cached:           280100 kB
+SwapCached:            0 kB
+SwapTotal:        102396 kB
+SwapFree:          51198 kB
+SReclaimable:      20480 kB
+"""
+
+
+def fake_proc(tmp, user=1000, system=500, idle=8000):
+    root = Path(tmp)
+    (root / 'stat').write_text(STAT.format(user=user, system=system, idle=idle))
+    (root / 'meminfo').write_text(MEMINFO)
+    (root / 'loadavg').write_text("0.52 0.38 0.21 2/180 4242\n")
+    (root / 'uptime').write_text("12345.67 45000.12\n")
+    return str(root)
+
+
+def test_parse_fields():
+    """Only the aggregate cpu line and the listed meminfo keys are used"""
+    busy, total = parse_cpu_line(STAT.format(user=1000, system=500, idle=8000).encode())
+    assert (busy, total) == (1510, 9560)  # idle and iowait excluded from busy
+    memory = parse_meminfo(MEMINFO.encode())
+    assert memory['mem_total'] == 948304 * 1024
+    assert memory['reclaimable'] == 20480 * 1024
+    assert 'SwapCached' not in memory
+
+
+def test_percpu_lines():
+    """Per-core lines stop at the first non-cpu line; guest time is not added twice"""
+    stat = ("cpu  500 0 100 2000 20 0 0 0 300 0\n"
+            "cpu0 200 0 50 1000 10 0 0 0 300 0\n"
+            "cpu1 300 0 50 1000 10 0 0 0 0 0\n"
+            "intr 123456 0 0 0 0\n")
+    assert parse_percpu_lines(stat.encode()) == [(250, 1260), (350, 1360)]
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = ProcReader(fake_proc(tmp))
+        assert reader.percpu_times() == [(152, 1162)]
+        reader.close()
+
+
+def test_sample_values():
+    """Memory figures follow the definitions of the pinned psutil 5.9.6"""
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = ProcReader(fake_proc(tmp))
+        sample = reader.sample()
+        reader.close()
+    assert sample.cpu_percent == 0.0  # no previous sample
+    assert sample.mem_used == (948304 - 310216 - 40960 - 280100 - 20480) * 1024
+    assert sample.cached == (280100 + 20480) * 1024
+    assert round(sample.mem_percent, 1) == 35.4
+    assert sample.swap_total - sample.swap_free == 51198 * 1024
+    assert (sample.load1, sample.load5, sample.load15) == (0.52, 0.38, 0.21)
+    assert sample.uptime == 12345.67
+
+
+def test_cpu_percent_from_delta():
+    """Re-reading through the same descriptor sees new contents"""
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = ProcReader(fake_proc(tmp))
+        reader.sample()
+        fake_proc(tmp, user=1300, system=600, idle=8600)  # +400 busy, +1000 total
+        sample = reader.sample()
+        reader.close()
+    assert abs(sample.cpu_percent - 40.0) < 1e-9
+
+
+def test_side_reads_keep_cpu_interval():
+    """track_cpu=False and cpu_times() do not restart the CPU percent interval"""
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = ProcReader(fake_proc(tmp))
+        reader.sample()
+        fake_proc(tmp, user=1100, system=500, idle=8400)
+        reader.sample(track_cpu=False)
+        times = reader.cpu_times()
+        fake_proc(tmp, user=1300, system=600, idle=8600)
+        sample = reader.sample()
+        reader.close()
+    assert abs(sample.cpu_percent - 40.0) < 1e-9
+    assert times['user'] == 1100 / CLOCK_TICKS and times['idle'] == 8400 / CLOCK_TICKS
+    assert times['iowait'] == 50 / CLOCK_TICKS and len(times) == 10
+
+
+def test_missing_proc():
+    """A missing file raises OSError so callers can fall back to psutil"""
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            ProcReader(tmp)
+            assert False, 'opened an empty directory'
+        except OSError:
+            pass
+
+
+def test_matches_psutil():
+    """On the real /proc the reader agrees with psutil"""
+    reader = ProcReader()
+    sample = reader.sample()
+    reader.close()
+    memory = psutil.virtual_memory()
+    assert sample.mem_total == memory.total
+    assert abs(sample.mem_percent - memory.percent) < 2.0
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Procfs Reader Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse Fields", test_parse_fields),
+        ("Per-core Lines", test_percpu_lines),
+        ("Sample Values", test_sample_values),
+        ("CPU Percent", test_cpu_percent_from_delta),
+        ("Side Reads", test_side_reads_keep_cpu_interval),
+        ("Missing /proc", test_missing_proc),
+        ("Matches psutil", test_matches_psutil),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the live stats stream hub
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules.stream_hub import StreamHub, format_event  # noqa: E402
+from app.modules.metrics_sampler import Snapshot  # noqa: E402
+
+
+def test_format_event():
+    """Events are encoded as SSE messages"""
+    message = format_event('stats', {'cpu': 1}, event_id='7')
+    assert message == 'event: stats\nid: 7\ndata: {"cpu":1}\n\n'
+
+
+def test_broadcast_to_all_clients():
+    """Every subscriber receives each published event"""
+    hub = StreamHub(max_clients=3)
+    clients = [hub.subscribe() for _ in range(3)]
+    hub.publish_snapshot(Snapshot({'cpu': {'percent': 5.0}}, 1000.0, 1.0, 0.01))
+
+    for client in clients:
+        message = client.queue.get_nowait()
+        data = json.loads(message.split('data: ')[1])
+        assert data['cpu']['percent'] == 5.0 and data['sampled_at'] == 1000.0
+    assert hub.stats()['published'] == 1
+
+
+def test_client_cap():
+    """Subscriptions beyond max_clients are refused until one leaves"""
+    hub = StreamHub(max_clients=1)
+    first = hub.subscribe()
+    assert hub.subscribe() is None
+    hub.unsubscribe(first)
+    assert hub.subscribe() is not None
+
+
+def test_slow_client_is_dropped():
+    """A client whose queue fills up is disconnected; others keep receiving"""
+    hub = StreamHub(max_clients=2, queue_size=2)
+    slow, fast = hub.subscribe(), hub.subscribe()
+    for i in range(3):
+        hub.publish('tick', i)
+        fast.queue.get_nowait()
+
+    assert slow.dropped and slow.queue.get_nowait() is None
+    assert not fast.dropped
+    assert hub.stats() == {'clients': 1, 'max_clients': 2, 'published': 3, 'dropped': 1}
+
+
+def test_stream_disabled_without_sampler():
+    """The endpoint tells clients to poll when the sampler is not running"""
+    app = create_app('testing')
+    response = app.test_client().get('/api/system/stream')
+    assert response.status_code == 503
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Stream Hub Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Event Format", test_format_event),
+        ("Broadcast", test_broadcast_to_all_clients),
+        ("Client Cap", test_client_cap),
+        ("Slow Client Dropped", test_slow_client_is_dropped),
+        ("Stream Disabled", test_stream_disabled_without_sampler),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the throttle/under-voltage watcher
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app  # noqa: E402
+from app.modules.throttle_watcher import ThrottleWatcher  # noqa: E402
+from app.modules.videocore import VideoCoreTelemetry, FakeVcio  # noqa: E402
+
+
+def make_watcher(kmsg_path=None):
+    device = FakeVcio()
+    watcher = ThrottleWatcher(VideoCoreTelemetry(device=device), kmsg_path=kmsg_path)
+    watcher._open_kmsg()
+    return watcher, device
+
+
+def test_only_edges_recorded():
+    """Repeated identical readings add nothing; set and clear are logged"""
+    watcher, device = make_watcher()
+    watcher.poll(100.0)
+    device.throttled = 0x50001  # under-voltage now (+ sticky bits)
+    watcher.poll(100.2)
+    watcher.poll(100.4)
+    device.throttled = 0x50000
+    watcher.poll(100.6)
+    events = watcher.events()
+    assert [(e['flag'], e['state'], e['timestamp']) for e in events] == [
+        ('under_voltage', 'cleared', 100.6),
+        ('under_voltage', 'set', 100.2)
+    ]
+    assert watcher.status()['samples'] == 4
+    assert watcher.status()['current']['under_voltage'] is False
+
+
+def test_since_and_limit():
+    """since filters older edges and limit caps the result"""
+    watcher, device = make_watcher()
+    watcher.poll(0.0)
+    for i in range(1, 11):
+        device.throttled = 0x4 if i % 2 else 0
+        watcher.poll(float(i))
+    assert len(watcher.events(limit=3)) == 3
+    assert [e['timestamp'] for e in watcher.events(since=8.0)] == [10.0, 9.0]
+
+
+def test_kernel_cross_reference():
+    """Kernel under-voltage messages are attached to nearby edges"""
+    with tempfile.NamedTemporaryFile('w', suffix='.kmsg', delete=False) as f:
+        boot = time.time() - time.monotonic()
+        at = time.monotonic()
+        f.write(f"6,100,{int((at - 50) * 1e6)},-;usb 1-1: new device\n")
+        f.write(f"4,101,{int(at * 1e6)},-;hwmon hwmon1: Undervoltage detected!\n")
+        f.write(" SUBSYSTEM=hwmon\n")
+        path = f.name
+    watcher, device = make_watcher(path)
+    watcher.poll(boot + at - 0.5)
+    device.throttled = 0x1
+    watcher.poll(boot + at + 0.1)
+    device.throttled = 0
+    watcher.poll(boot + at + 10)
+
+    messages = watcher.kernel_messages()
+    assert len(messages) == 1 and 'Undervoltage' in messages[0]['message']
+    cleared, set_event = watcher.events()
+    assert set_event['kernel'] == 'hwmon hwmon1: Undervoltage detected!'
+    assert 'kernel' not in cleared
+    watcher.stop()
+    Path(path).unlink()
+
+
+def test_unavailable_source():
+    """Without throttle bits poll() reports False so the thread can stop"""
+    with tempfile.TemporaryDirectory() as tmp:
+        watcher = ThrottleWatcher(VideoCoreTelemetry(sysfs_root=tmp, use_mailbox=False),
+                                  kmsg_path=None)
+        assert watcher.poll() is False
+
+
+def test_endpoint_disabled_in_testing():
+    """The endpoint reports 503 when the watcher is off"""
+    client = create_app('testing').test_client()
+    assert client.get('/api/system/throttle/events').status_code == 503
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Throttle Watcher Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Edges Only", test_only_edges_recorded),
+        ("Since / Limit", test_since_and_limit),
+        ("Kernel Cross-reference", test_kernel_cross_reference),
+        ("Unavailable Source", test_unavailable_source),
+        ("Endpoint Disabled", test_endpoint_disabled_in_testing),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
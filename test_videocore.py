@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the VideoCore telemetry module
+Runs off-Pi using the FakeVcio mailbox and a fake sysfs tree
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.videocore import (  # noqa: E402
+    VideoCoreTelemetry, FakeVcio, SYSFS_TEMPERATURE, SYSFS_THROTTLED, SYSFS_ARM_FREQ
+)
+
+
+def _write(root, relative_path, text):
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_mailbox_readings():
+    """Mailbox messages are encoded and decoded correctly"""
+    fake = FakeVcio(temperature=51.5, throttled=0x50005)
+    telemetry = VideoCoreTelemetry(device=fake)
+
+    assert telemetry.source == 'mailbox'
+    assert telemetry.temperature() == 51.5
+    assert telemetry.throttled() == 0x50005
+    assert telemetry.clock('arm') == 1200000000
+    assert abs(telemetry.voltage('core') - 1.2875) < 1e-6
+    assert fake.calls == 4
+
+
+def test_mailbox_read_all():
+    """read_all() covers temperature, throttle bits, clocks and voltages"""
+    telemetry = VideoCoreTelemetry(device=FakeVcio())
+    data = telemetry.read_all()
+
+    assert set(data) == {'source', 'temperature', 'throttled', 'clocks', 'voltages'}
+    assert data['clocks']['sdram'] == 450000000
+    assert set(data['voltages']) == {'core', 'sdram_c', 'sdram_p', 'sdram_i'}
+
+
+def test_sysfs_fallback_rereads_cached_fd():
+    """Without a mailbox, sysfs attributes are re-read through one open descriptor"""
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, SYSFS_TEMPERATURE, '48312\n')
+        _write(root, SYSFS_THROTTLED, '50000\n')
+        _write(root, SYSFS_ARM_FREQ, '600000\n')
+
+        telemetry = VideoCoreTelemetry(sysfs_root=root, use_mailbox=False)
+        assert telemetry.source == 'sysfs'
+        assert telemetry.temperature() == 48.312
+        assert telemetry.throttled() == 0x50000
+        assert telemetry.clock('arm') == 600000000
+        assert telemetry.voltage('core') is None
+
+        # Value changes are picked up by pread on the cached descriptor
+        fd_count = len(telemetry._fds)
+        with open(os.path.join(root, SYSFS_TEMPERATURE), 'r+') as f:
+            f.write('61000\n')
+        assert telemetry.temperature() == 61.0
+        assert len(telemetry._fds) == fd_count
+        telemetry.close()
+
+
+def test_missing_sources():
+    """Missing mailbox and sysfs attributes return None instead of raising"""
+    with tempfile.TemporaryDirectory() as root:
+        telemetry = VideoCoreTelemetry(sysfs_root=root, use_mailbox=False)
+        assert telemetry.temperature() is None
+        assert telemetry.throttled() is None
+        assert telemetry.clock('core') is None
+
+
+class SlowVcio(FakeVcio):
+    """FakeVcio that yields inside the ioctl so other threads run meanwhile"""
+
+    def ioctl(self, buffer):
+        time.sleep(0.0005)
+        super().ioctl(buffer)
+
+
+def test_concurrent_requests():
+    """Concurrent callers never see each other's tag or response"""
+    telemetry = VideoCoreTelemetry(device=SlowVcio(temperature=51.5, throttled=0x50005))
+    wrong = []
+
+    def read(func, expected):
+        for _ in range(50):
+            value = func()
+            if value != expected:
+                wrong.append(value)
+
+    threads = [threading.Thread(target=read, args=(telemetry.temperature, 51.5)),
+               threading.Thread(target=read, args=(telemetry.throttled, 0x50005)),
+               threading.Thread(target=read, args=(lambda: telemetry.clock('arm'), 1200000000))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not wrong, f"{len(wrong)} mixed-up readings"
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("VideoCore Telemetry Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Mailbox Readings", test_mailbox_readings),
+        ("Mailbox read_all", test_mailbox_read_all),
+        ("Sysfs Fallback", test_sysfs_fallback_rereads_cached_fd),
+        ("Missing Sources", test_missing_sources),
+        ("Concurrent Requests", test_concurrent_requests),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
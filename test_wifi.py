@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-process WiFi collector
+Feeds /proc/net/wireless text and encoded nl80211 replies to the parsers
+"""
+
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.modules.wifi import (  # noqa: E402
+    NL80211_ATTR_IFINDEX, NL80211_ATTR_SSID, NL80211_ATTR_STA_INFO, NL80211_ATTR_WIPHY_FREQ,
+    NL80211_ATTR_WIPHY_TX_POWER_LEVEL, NL80211_RATE_INFO_BITRATE, NL80211_RATE_INFO_BITRATE32,
+    NL80211_STA_INFO_RX_BITRATE, NL80211_STA_INFO_SIGNAL, NL80211_STA_INFO_TX_BITRATE,
+    Nl80211, WifiCollector, _attr, _attributes, _bitrate_mbps, band_for_frequency,
+    parse_proc_net_wireless, signal_quality_percent
+)
+
+PROC_NET_WIRELESS = """Inter-| sta-|   Quality        |   Discarded packets               | Missed | WE
+ face | tus | link level noise |  nwid  crypt   frag  retry   misc | beacon | 22
+ wlan0: 0000   54.  -56.  -256        0      0      0      0     12        0
+ wlan1: 0000   30   -80   -95         0      0      0      0      0        0
+"""
+
+
+class FakeNl80211(Nl80211):
+    """Nl80211 answering from canned reply payloads instead of a socket"""
+
+    def __init__(self, replies):
+        self.family_id = 0x1c
+        self.replies = replies
+        self.requests = []
+
+    def _request(self, msg_type, cmd, attrs, flags=0):
+        self.requests.append((cmd, dict(_attributes(attrs))))
+        return self.replies[cmd]
+
+
+def test_parse_proc_net_wireless():
+    """Header lines are skipped and trailing dots stripped"""
+    result = parse_proc_net_wireless(PROC_NET_WIRELESS)
+    assert result == {'wlan0': (54, -56, -256), 'wlan1': (30, -80, -95)}
+    assert parse_proc_net_wireless(PROC_NET_WIRELESS.split('\n', 2)[0]) == {}
+
+
+def test_band_and_quality():
+    """Frequency bands and the dBm to percent mapping"""
+    assert band_for_frequency(2437) == '2.4 GHz'
+    assert band_for_frequency(5180) == '5 GHz'
+    assert band_for_frequency(5955) == '6 GHz (WiFi 6E)'
+    assert band_for_frequency(None) is None
+    assert signal_quality_percent(-56) == 88
+    assert signal_quality_percent(-40) == 100 and signal_quality_percent(-120) == 0
+
+
+def test_attribute_round_trip():
+    """Encoded attributes are padded to 4 bytes and decode back in order"""
+    data = _attr(NL80211_ATTR_SSID, b'home') + _attr(NL80211_ATTR_IFINDEX, struct.pack('=I', 3)) \
+        + _attr(NL80211_ATTR_SSID, b'abcde')
+    assert len(data) % 4 == 0
+    assert list(_attributes(data)) == [
+        (NL80211_ATTR_SSID, b'home'), (NL80211_ATTR_IFINDEX, struct.pack('=I', 3)),
+        (NL80211_ATTR_SSID, b'abcde')
+    ]
+    # A truncated attribute ends the iteration instead of raising
+    assert list(_attributes(data[:6])) == []
+
+
+def test_bitrates():
+    """32-bit bitrate wins over the legacy 16-bit one (units of 100 kbit/s)"""
+    assert _bitrate_mbps(_attr(NL80211_RATE_INFO_BITRATE, struct.pack('=H', 650))) == 65.0
+    both = (_attr(NL80211_RATE_INFO_BITRATE, struct.pack('=H', 650))
+            + _attr(NL80211_RATE_INFO_BITRATE32, struct.pack('=I', 8667)))
+    assert _bitrate_mbps(both) == 866.7
+    assert _bitrate_mbps(b'') is None
+
+
+def test_nl80211_replies():
+    """Interface and station replies are decoded from nested attributes"""
+    interface = (_attr(NL80211_ATTR_SSID, 'Café'.encode())
+                 + _attr(NL80211_ATTR_WIPHY_FREQ, struct.pack('=I', 5180))
+                 + _attr(NL80211_ATTR_WIPHY_TX_POWER_LEVEL, struct.pack('=I', 3100)))
+    sta_info = (_attr(NL80211_STA_INFO_SIGNAL, struct.pack('=b', -61))
+                + _attr(NL80211_STA_INFO_TX_BITRATE,
+                        _attr(NL80211_RATE_INFO_BITRATE32, struct.pack('=I', 4333)))
+                + _attr(NL80211_STA_INFO_RX_BITRATE,
+                        _attr(NL80211_RATE_INFO_BITRATE, struct.pack('=H', 540))))
+    station = _attr(NL80211_ATTR_IFINDEX, struct.pack('=I', 3)) + _attr(NL80211_ATTR_STA_INFO, sta_info)
+    nl = FakeNl80211({5: [interface], 17: [station, station]})
+
+    assert nl.interface(3) == {'ssid': 'Café', 'frequency_mhz': 5180, 'tx_power_dbm': 31}
+    assert nl.station(3) == {'signal_dbm': -61, 'tx_bitrate_mbps': 433.3, 'rx_bitrate_mbps': 54.0}
+    assert nl.requests[0][1] == {NL80211_ATTR_IFINDEX: struct.pack('=I', 3)}
+
+
+def test_collector_proc_only():
+    """Without the interface or nl80211 the reading comes from /proc/net/wireless"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'wireless'
+        path.write_text(PROC_NET_WIRELESS.replace('wlan0', 'wtest0'))
+        collector = WifiCollector('wtest0', max_age=60, proc_path=str(path))
+        reading = collector.read()
+        assert reading.connected and reading.ssid is None
+        assert reading.signal_dbm == -56
+        assert reading.noise_dbm is None  # -256 = not reported
+        assert reading.link_quality == (54, 70)
+        assert collector.read() is reading  # shared while younger than max_age
+
+        missing = WifiCollector('wtest9', proc_path=str(path)).read()
+        assert not missing.connected and missing.signal_dbm is None
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("WiFi Collector Test Suite")
+    print("=" * 60)
+
+    tests = [
+        ("Parse /proc/net/wireless", test_parse_proc_net_wireless),
+        ("Band and Quality", test_band_and_quality),
+        ("Attribute Round Trip", test_attribute_round_trip),
+        ("Bitrates", test_bitrates),
+        ("nl80211 Replies", test_nl80211_replies),
+        ("Collector /proc Only", test_collector_proc_only),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"✓ PASS - {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL - {name}: {e}")
+
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())